@@ -0,0 +1,145 @@
+"""Per-frame collision cost: the game's broad-phase vs brute force.
+
+Burgers go through the SpatialHash, printers through PrinterColumns and
+enemies through EnemyBands, the same way GameSimulation does it.
+
+Two layouts per entity count: 'pileup' puts everything on one 1280x720
+screen, so density rises with the count (burgers piling up in a long run);
+'spread' grows the field with the count so density stays that of a normal
+game. The grid total is expiring printers and enemies plus the queries,
+which is what a frame pays. Brute force is arcade's CPU scan (method=3), so no
+window or GL context is needed. Run from anywhere:
+
+    python benchmarks/collision_benchmark.py
+"""
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import arcade
+from main import (SpatialHash, PrinterColumns, EnemyBands, Collectable, Enemy, Printer, SPRITE_SCALING,
+                  BURGER_BOUNCE_HEIGHT, get_player_hitbox_texture)
+
+ENTITY_COUNTS = [10, 100, 1000, 10000]
+LAYOUTS = ['pileup', 'spread']
+FRAMES = 200
+DELTA_TIME = 1 / 60
+SCREEN_WIDTH = 1280
+SCREEN_HEIGHT = 720
+# Entities per 1280x720 screen in the 'spread' layout
+ENTITIES_PER_SCREEN = 60
+
+
+def field_size(layout, count):
+    if layout == 'pileup':
+        return SCREEN_WIDTH, SCREEN_HEIGHT
+    screens = max(1.0, count / ENTITIES_PER_SCREEN)
+    return SCREEN_WIDTH * screens ** 0.5, SCREEN_HEIGHT * screens ** 0.5
+
+
+def build_world(layout, count, seed=1):
+    """Random mix of burgers, printers and enemies plus a player"""
+    rng = random.Random(seed)
+    width, height = field_size(layout, count)
+
+    grid = SpatialHash()
+    columns = PrinterColumns()
+    bands = EnemyBands()
+    lists = {'burger': arcade.SpriteList(lazy=True), 'printer': arcade.SpriteList(lazy=True),
+             'enemy': arcade.SpriteList(lazy=True)}
+    for i in range(count):
+        kind = rng.choice(('burger', 'burger', 'printer', 'enemy'))
+        if kind == 'burger':
+            sprite = Collectable(SPRITE_SCALING)
+        elif kind == 'printer':
+            sprite = Printer()
+            # Same sizes as GameSimulation.spawn_printers: 64 to 192 px
+            sprite.scale = 64 / max(sprite.texture.width, sprite.texture.height) * rng.uniform(1.0, 3.0)
+            sprite.change_y = -120
+        else:
+            sprite = Enemy(rng.uniform(1.0, 2.0), rng.choice((-1, 1)), window_width=width)
+        sprite.center_x = rng.uniform(0, width)
+        sprite.center_y = rng.uniform(0, height)
+        sprite.original_y = sprite.center_y
+        lists[kind].append(sprite)
+        if kind == 'enemy':
+            bands.add(sprite, 0.0)
+        elif kind == 'printer':
+            columns.add(sprite, 0.0)
+        else:
+            grid.add(sprite, kind, margin=BURGER_BOUNCE_HEIGHT)
+
+    player = arcade.Sprite(get_player_hitbox_texture(), scale=2.0)  # Same hit box as in a run
+    player.center_x = width / 2
+    player.center_y = height / 2
+    return grid, columns, bands, lists, player, width, height
+
+
+def respawn(enemies, bands, width, now):
+    """Send enemies that left the field back in from their starting edge"""
+    for enemy in enemies:
+        enemy.center_x = -30 if enemy.direction > 0 else width + 30
+        bands.add(enemy, now)
+
+
+def respawn_printers(printers, columns, height, now):
+    """Drop printers that fell off the field again from the top"""
+    for printer in printers:
+        printer.center_y = height + 100
+        columns.add(printer, now)
+
+
+def run(layout, count):
+    grid, columns, bands, lists, player, width, height = build_world(layout, count)
+    clock = time.perf_counter
+    brute = maintain = query = 0.0
+    now = 0.0
+    for _ in range(FRAMES):
+        now += DELTA_TIME
+
+        # Broad-phase upkeep: nothing moves, printers and enemies just expire
+        start = clock()
+        fallen = columns.expire(now)
+        expired = bands.expire(now)
+        maintain += clock() - start
+        respawn_printers(fallen, columns, height, now)
+        respawn(expired, bands, width, now)
+
+        # Brute force needs everything where its path puts it (not timed)
+        for printer in lists['printer']:
+            printer.place(now)
+        for enemy in lists['enemy']:
+            enemy.place(now)
+
+        # Brute force: three full list scans (CPU, like for like)
+        start = clock()
+        for kind in ('burger', 'printer', 'enemy'):
+            arcade.check_for_collision_with_list(player, lists[kind], method=3)
+        brute += clock() - start
+
+        # Broad-phase: the queries GameSimulation.update_collisions makes
+        start = clock()
+        grid.check_for_collision(player, 'burger')
+        columns.check_for_collision(player, now)
+        bands.check_for_collision(player, now)
+        query += clock() - start
+    return brute / FRAMES, maintain / FRAMES, query / FRAMES
+
+
+def main():
+    print(f"{'layout':>7} {'entities':>9} {'brute ms':>10} {'grid update ms':>15} "
+          f"{'grid query ms':>14} {'grid total ms':>14}")
+    for layout in LAYOUTS:
+        for count in ENTITY_COUNTS:
+            brute, maintain, query = run(layout, count)
+            print(f"{layout:>7} {count:>9} {brute * 1000:>10.3f} {maintain * 1000:>15.3f} "
+                  f"{query * 1000:>14.3f} {(maintain + query) * 1000:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+"""Per-phase frame cost of the game loop in a few scripted scenarios.
+
+Every scenario builds a seeded GameSimulation, puts it into a known state,
+runs some warm-up steps and then times the spawn, update (player and
+movement), collision and draw phases of each fixed simulation step
+separately. Each scenario is repeated and the median of the
+per-repetition means is used.
+
+    python benchmarks/game_benchmark.py                   # run, compare to baseline
+    python benchmarks/game_benchmark.py --save-baseline   # store this run as the baseline
+    python benchmarks/game_benchmark.py --no-draw --output results.json
+
+Results go to stdout (or --output) as JSON, a summary table to stderr. With
+a baseline file present, any phase that got slower by more than --threshold
+is reported as a regression and the exit code is 1.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import arcade
+import main
+from main import GameSimulation, GameView, WINDOW_WIDTH, WINDOW_HEIGHT
+
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+DELTA_TIME = main.SIMULATION_STEP
+PHASES = ['spawn', 'update', 'collision', 'draw']
+# Phases faster than this are too noisy to call a regression
+NOISE_FLOOR_MS = 0.02
+
+
+def scenario_early_game(sim):
+    """Fresh run: five burgers, the first enemy waves, no printers yet"""
+
+
+def scenario_printers_raining(sim):
+    """Score 50: printers fall fast and often, enemies at full rate"""
+    sim.score = 50  # the printer wave starts on the first step
+
+
+def scenario_burger_backlog(sim):
+    """1,000 uncollected burgers bouncing on the field"""
+    sim.spawn_coins(1000)
+
+
+def scenario_max_enemies(sim):
+    """Largest enemy waves at the shortest interval, nothing else falling"""
+    sim.score = 30  # score // 5 bonus reaches the 8-enemy cap
+    sim.spawner.disable('printers')  # enemies only
+    for i in range(3):
+        sim.spawn_enemies()
+
+
+SCENARIOS = {
+    'early_game': scenario_early_game,
+    'printers_raining': scenario_printers_raining,
+    'burger_backlog': scenario_burger_backlog,
+    'max_enemies': scenario_max_enemies,
+}
+
+
+class PhaseTimer:
+    """Stands in for the game's FrameProfiler in GameSimulation.update().
+
+    update() calls begin() and then mark(phase) after each of its phases;
+    the time of every phase is added to the benchmark's phase it belongs to.
+    """
+
+    PHASES = {'player': 'update', 'spawn': 'spawn', 'movement': 'update', 'collision': 'collision'}
+
+    def __init__(self):
+        self.timings = {'spawn': 0.0, 'update': 0.0, 'collision': 0.0}
+        self.last = 0.0
+
+    def begin(self):
+        self.last = time.perf_counter()
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.timings[self.PHASES[phase]] += now - self.last
+        self.last = now
+
+
+def step(sim, timer=None):
+    """One GameSimulation.update(), timed phase by phase when a timer is given.
+
+    The run never ends here (a hit does not stop the loop), so every
+    repetition times the same number of steps of the same state.
+    """
+    sim.is_over = False
+    sim.profiler = timer
+    sim.update(DELTA_TIME)
+
+
+def entity_counts(sim):
+    return {kind: len(sprite_list) for kind, sprite_list in sim.entity_lists.items()}
+
+
+def run_simulation(scenario, seed, warmup, frames):
+    """Time the spawn, update and collision phases for one repetition"""
+    sim = GameSimulation(WINDOW_WIDTH, WINDOW_HEIGHT, seed)
+    sim.setup()
+    try:
+        scenario(sim)
+        for i in range(warmup):
+            step(sim)
+        timer = PhaseTimer()
+        for i in range(frames):
+            step(sim, timer)
+        return {phase: total / frames * 1000 for phase, total in timer.timings.items()}, entity_counts(sim)
+    finally:
+        sim.release_entities()
+
+
+def run_draw(window, scenario, seed, warmup, frames):
+    """Time GameView.on_draw for one repetition, waiting for the GPU each frame"""
+    view = GameView()
+    view.setup(seed)  # same field and seed as the simulation-only repetitions
+    sim = view.sim
+    try:
+        scenario(sim)
+        total = 0.0
+        for i in range(warmup + frames):
+            step(sim)
+            view.background_timer += DELTA_TIME
+            view.place_sprites(1.0)
+            view.sync_player_sprite()
+            start = time.perf_counter()
+            view.on_draw()
+            window.ctx.finish()
+            if i >= warmup:
+                total += time.perf_counter() - start
+        return total / frames * 1000
+    finally:
+        view.on_hide_view()
+
+
+def summarize(samples):
+    return {
+        'median_ms': statistics.median(samples),
+        'min_ms': min(samples),
+        'max_ms': max(samples),
+        'samples_ms': samples,
+    }
+
+
+def run_benchmarks(names, seed, warmup, frames, repeat, draw):
+    window = None
+    if draw:
+        try:
+            window = arcade.Window(WINDOW_WIDTH, WINDOW_HEIGHT, "benchmark", visible=False)
+        except Exception as error:
+            print(f"draw phase skipped, no window: {error}", file=sys.stderr)
+
+    results = {}
+    for name in names:
+        scenario = SCENARIOS[name]
+        samples = {'spawn': [], 'update': [], 'collision': []}
+        counts = None
+        for rep in range(repeat):
+            timings, counts = run_simulation(scenario, seed, warmup, frames)
+            for phase, value in timings.items():
+                samples[phase].append(value)
+        if window is not None:
+            samples['draw'] = [run_draw(window, scenario, seed, warmup, frames) for rep in range(repeat)]
+        phases = {phase: summarize(values) for phase, values in samples.items()}
+        results[name] = {'entities': counts, 'phases': phases}
+        print(f"  {name}: " + "  ".join(
+            f"{phase} {phases[phase]['median_ms']:.3f}ms" for phase in PHASES if phase in phases
+        ), file=sys.stderr)
+
+    if window is not None:
+        window.close()
+    return results
+
+
+def compare(results, baseline, threshold):
+    """List every phase whose median got slower than the baseline allows"""
+    regressions = []
+    for name, result in results.items():
+        old = baseline.get('scenarios', {}).get(name)
+        if old is None:
+            continue
+        for phase, stats in result['phases'].items():
+            old_stats = old['phases'].get(phase)
+            if old_stats is None:
+                continue
+            before = old_stats['median_ms']
+            after = stats['median_ms']
+            stats['baseline_ms'] = before
+            stats['change'] = (after - before) / before if before > 0 else 0.0
+            if after > before * (1 + threshold) and after - before > NOISE_FLOOR_MS:
+                regressions.append({'scenario': name, 'phase': phase,
+                                    'baseline_ms': before, 'current_ms': after,
+                                    'change': stats['change']})
+    return regressions
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Per-phase game loop benchmarks")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="scenario to run (repeatable, default: all)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--warmup", type=int, default=600, help="untimed steps before measuring")
+    parser.add_argument("--frames", type=int, default=1200, help="timed steps per repetition")
+    parser.add_argument("--repeat", type=int, default=5, help="repetitions per scenario")
+    parser.add_argument("--no-draw", action="store_true", help="skip the draw phase (no window needed)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="write this run to --baseline")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="allowed slowdown against the baseline (0.10 = 10%%)")
+    parser.add_argument("--output", help="write the JSON results here instead of stdout")
+    return parser.parse_args()
+
+
+def main_cli():
+    args = parse_args()
+    names = args.scenario or list(SCENARIOS)
+    print(f"running {len(names)} scenarios x {args.repeat} repetitions "
+          f"({args.warmup} warm-up + {args.frames} frames)", file=sys.stderr)
+    scenarios = run_benchmarks(names, args.seed, args.warmup, args.frames, args.repeat, not args.no_draw)
+
+    report = {
+        'created': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'config': {'seed': args.seed, 'warmup': args.warmup, 'frames': args.frames,
+                   'repeat': args.repeat, 'delta_time': DELTA_TIME,
+                   'numpy_kinematics': main.USE_NUMPY_KINEMATICS and main.np is not None},
+        'platform': {'python': platform.python_version(), 'arcade': arcade.__version__,
+                     'machine': platform.machine(), 'system': platform.system()},
+        'scenarios': scenarios,
+    }
+
+    regressions = []
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"baseline written to {args.baseline}", file=sys.stderr)
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        regressions = compare(scenarios, baseline, args.threshold)
+        report['threshold'] = args.threshold
+        report['regressions'] = regressions
+        for item in regressions:
+            print(f"REGRESSION {item['scenario']}/{item['phase']}: "
+                  f"{item['baseline_ms']:.3f}ms -> {item['current_ms']:.3f}ms "
+                  f"({item['change']:+.0%})", file=sys.stderr)
+        if not regressions:
+            print(f"no regressions against {args.baseline}", file=sys.stderr)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
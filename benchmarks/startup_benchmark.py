@@ -0,0 +1,99 @@
+"""Cold-start asset loading: loose files against the baked bundle.
+
+Every sample is a fresh interpreter that imports the game and loads every
+asset the start screen preloads (main.PRELOAD_PATHS), once from the loose
+PNG/MP3 files and once from the bundle written by `python main.py --bake`.
+Sounds that cannot be decoded on this machine fail the same way in both
+modes and are counted, not timed separately.
+
+    python main.py --bake                        # build assets/assets.bundle first
+    python benchmarks/startup_benchmark.py
+    python benchmarks/startup_benchmark.py --repeat 10 --output startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODES = ['loose', 'bundle']
+
+
+def child(mode):
+    """Runs in the fresh interpreter: time the import and the asset loads"""
+    start = time.perf_counter()
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+    import main
+    imported = time.perf_counter()
+
+    main.USE_ASSET_BUNDLE = mode == 'bundle'
+    bundle = main.get_asset_bundle()
+    loaded = failed = 0
+    for path in main.PRELOAD_PATHS:
+        try:
+            main.assets.load(path)
+            loaded += 1
+        except:
+            failed += 1
+    done = time.perf_counter()
+    print(json.dumps({
+        'import_s': imported - start,
+        'load_s': done - imported,
+        'total_s': done - start,
+        'loaded': loaded,
+        'failed': failed,
+        'bundle': bundle is not None,
+    }))
+
+
+def sample(mode):
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", mode],
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Cold-start asset loading benchmark")
+    parser.add_argument("--repeat", type=int, default=5, help="fresh processes per mode")
+    parser.add_argument("--output", help="write the JSON results here instead of stdout")
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.child)
+        return 0
+
+    results = {}
+    for mode in MODES:
+        samples = [sample(mode) for i in range(args.repeat)]
+        if mode == 'bundle' and not samples[0]['bundle']:
+            print("no bundle found, run `python main.py --bake` first", file=sys.stderr)
+            return 1
+        results[mode] = {
+            'load_ms': statistics.median(s['load_s'] for s in samples) * 1000,
+            'total_ms': statistics.median(s['total_s'] for s in samples) * 1000,
+            'loaded': samples[0]['loaded'],
+            'failed': samples[0]['failed'],
+        }
+        print(f"  {mode}: assets {results[mode]['load_ms']:.1f}ms  "
+              f"import+assets {results[mode]['total_ms']:.1f}ms  "
+              f"({results[mode]['loaded']} loaded, {results[mode]['failed']} failed)", file=sys.stderr)
+    speedup = results['loose']['load_ms'] / max(results['bundle']['load_ms'], 1e-9)
+    print(f"  bundle loads assets {speedup:.1f}x faster", file=sys.stderr)
+
+    report = {'created': time.strftime("%Y-%m-%dT%H:%M:%S"), 'repeat': args.repeat,
+              'modes': results, 'speedup': speedup}
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -3,98 +3,2399 @@ import arcade
 import math 
 import json
 import os
+import time
+import threading
+import atexit
+import argparse
+import hashlib
+import heapq
+import mmap
+import struct
+import io
+import PIL.Image
+import importlib
+import multiprocessing
+import statistics
+import sys
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from queue import Queue, Empty
+from arcade.gl import geometry
+from arcade.texture import ImageData
+from pyglet import media
+from arcade.texture_atlas import DefaultTextureAtlas
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # The vectorized kinematics engine is optional
 
 SPRITE_SCALING = 1.2
-PLAYER_MOVEMENT_SPEED = 5
+BURGER_BOUNCE_HEIGHT = 10
+
+# Advance enemies, printers and burgers in bulk with NumPy when available
+USE_NUMPY_KINEMATICS = True
+PLAYER_MOVEMENT_SPEED = 300  # Pixels per second
+
+# The simulation always advances in fixed steps; rendering interpolates between them
+SIMULATION_RATE = 120  # Steps per second
+SIMULATION_STEP = 1 / SIMULATION_RATE
+MAX_STEPS_PER_FRAME = 8  # Beyond this the game slows down instead of spiralling
+
+WINDOW_WIDTH = 1280
+WINDOW_HEIGHT = 720
+WINDOW_TITLE = "Sprite Change Coins"
+
+# Legacy highscore file (profile version 1), only read for migration
+HIGHSCORE_FILE = "data/saves/highscore.json"
+
+# Gameplay asset paths
+FOOD_TEXTURE_PATHS = [
+    f"assets/images/sprites/food/{name}" for name in (
+        "01_Cherry_Red.png", "02_Cherry_Black.png", "03_Cranberry.png",
+        "04_Cucumber.png", "05_CustardApple.png", "06_Plum.png",
+        "07_Dragonfruit.png", "10_Grapes_Black.png", "11_Grapes_Green.png",
+        "12_Grapefruit.png", "13_Guava.png", "14_Kiwi.png", "15_Lemon.png",
+        "16_Apple.png", "19_Peach.png", "20_Passionfruit.png", "21_Apricot.png",
+        "22_Strawberry.png", "23_Watermelon.png", "24_Melon.png"
+    )
+]
+FALLBACK_ENEMY_TEXTURE_PATH = "assets/images/sprites/wario/normal/Run1Wario.png"
+BURGER_TEXTURE_PATH = "assets/images/sprites/wario/normal/burger.png"
+PRINTER_TEXTURE_PATH = "assets/images/sprites/objects/printer.png"
+TITLESCREEN_PATH = "assets/images/titlescreen/titlescreen.png"
+COLLECT_SOUND_PATH = "assets/sounds/eating.mp3"
+DIE_SOUND_PATH = "assets/sounds/die.mp3"
+
+# Everything GameView needs during a run, pinned for the lifetime of the view
+GAMEPLAY_ASSET_PATHS = FOOD_TEXTURE_PATHS + [
+    BURGER_TEXTURE_PATH, PRINTER_TEXTURE_PATH, COLLECT_SOUND_PATH, DIE_SOUND_PATH
+]
+
+# Memory budget for cached assets that nobody holds a reference to
+ASSET_CACHE_BUDGET = 64 * 1024 * 1024
+SOUND_EXTENSIONS = (".mp3", ".wav", ".ogg")
+
+# Pre-decoded assets baked by `python main.py --bake` (loose files are the fallback)
+USE_ASSET_BUNDLE = True
+ASSET_BUNDLE_PATH = "assets/assets.bundle"
+BUNDLE_MAGIC = b"GJAB"
+BUNDLE_VERSION = 1
+BUNDLE_HEADER = struct.Struct("<4sIQQ")  # magic, version, index offset, index size
+BUNDLE_ALIGNMENT = 64
+
+
+def loose_file_stamp(path):
+    """(size, mtime_ns) of an asset's loose file, or None if it is missing"""
+    try:
+        stat = os.stat(arcade.resources.resolve(path))
+    except:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+class AssetBundle:
+    """Read-only, memory-mapped file of pre-decoded textures and sounds.
+
+    Layout: a header, then every asset's raw data (RGBA pixels, PCM
+    samples) at 64-byte aligned offsets, then a JSON index with each
+    asset's offset, format, hit box and the size and mtime of the loose
+    file it was baked from. Textures wrap the mapped pixels directly; an
+    entry whose loose file has changed since the bake is ignored so edited
+    assets show up without re-baking.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, index_offset, index_size = BUNDLE_HEADER.unpack_from(self.map, 0)
+        if magic != BUNDLE_MAGIC or version != BUNDLE_VERSION:
+            raise ValueError(f"{path} is not a version {BUNDLE_VERSION} asset bundle")
+        self.index = json.loads(self.map[index_offset:index_offset + index_size])
+        self.view = memoryview(self.map)
+
+    def lookup(self, path):
+        """Index entry for path, or None if it is not baked or the loose file changed"""
+        entry = self.index.get(path)
+        if entry is None:
+            return None
+        stamp = loose_file_stamp(path)
+        if stamp is not None and stamp != entry['source']:
+            return None
+        return entry
+
+    def load(self, path, entry):
+        """Build (asset, size) from an index entry; sounds are stored as PCM, so nothing is decoded"""
+        data = self.view[entry['offset']:entry['offset'] + entry['size']]
+        if entry['kind'] == 'sound':
+            # arcade.Sound only loads from files, so fill one in by hand; the
+            # PCM gets a WAV header so pyglet's own decoder can load it
+            sound = arcade.Sound.__new__(arcade.Sound)
+            sound.file_name = path
+            sound.source = media.load(path + ".wav", file=pcm_to_wav(data, *entry['format']), streaming=False)
+            sound.min_distance = 100000000
+            return sound, entry['size']
+        width, height = entry['width'], entry['height']
+        image = PIL.Image.frombuffer('RGBA', (width, height), data, 'raw', 'RGBA', 0, 1)
+        texture = arcade.Texture(ImageData(image, hash=entry['hash']),
+                                 hit_box_points=[tuple(point) for point in entry['hit_box']])
+        texture.file_path = path
+        return texture, entry['size']
+
+    @staticmethod
+    def bake(paths, out_path):
+        """Decode every asset in paths and write them into a bundle; returns the index"""
+        index = {}
+        blobs = []
+        offset = BUNDLE_HEADER.size
+        for path in paths:
+            stamp = loose_file_stamp(path)
+            if stamp is None:
+                continue
+            try:
+                if path.lower().endswith(SOUND_EXTENSIONS):
+                    data, entry = decode_sound_pcm(path)
+                else:
+                    texture = arcade.load_texture(path)
+                    data = texture.image.tobytes()
+                    entry = {
+                        'kind': 'texture',
+                        'width': texture.width,
+                        'height': texture.height,
+                        'hash': texture.image_data.hash,
+                        'hit_box': [list(point) for point in texture.hit_box_points],
+                    }
+            except Exception as error:
+                print(f"skipped {path}: {error}", file=sys.stderr)
+                continue
+            offset += -offset % BUNDLE_ALIGNMENT
+            entry.update(offset=offset, size=len(data), source=stamp)
+            index[path] = entry
+            blobs.append((offset, data))
+            offset += len(data)
+
+        index_bytes = json.dumps(index).encode('utf-8')
+        temp_path = out_path + ".tmp"
+        os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+        with open(temp_path, 'wb') as f:
+            f.write(BUNDLE_HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, offset, len(index_bytes)))
+            for blob_offset, data in blobs:
+                f.write(b"\0" * (blob_offset - f.tell()))
+                f.write(data)
+            f.write(index_bytes)
+        os.replace(temp_path, out_path)
+        return index
+
+
+def decode_sound_pcm(path):
+    """Fully decode a sound file to PCM bytes and its bundle index entry"""
+    from pyglet import media
+    source = media.load(arcade.resources.resolve(path), streaming=True)
+    chunks = []
+    while True:
+        packet = source.get_audio_data(1 << 16)
+        if packet is None:
+            break
+        chunks.append(bytes(packet.data))
+    audio = source.audio_format
+    return b"".join(chunks), {
+        'kind': 'sound',
+        'format': [audio.channels, audio.sample_size, audio.sample_rate],
+    }
+
+
+def pcm_to_wav(data, channels, sample_size, sample_rate):
+    """In-memory WAV file around raw PCM from decode_sound_pcm"""
+    import wave  # Local: 'wave' is also the spawn wave loop variable below
+    out = io.BytesIO()
+    with wave.open(out, 'wb') as f:
+        f.setnchannels(channels)
+        f.setsampwidth(sample_size // 8)
+        f.setframerate(sample_rate)
+        f.writeframes(data)
+    out.seek(0)
+    return out
+
+
+asset_bundle = None
+asset_bundle_checked = False
+
+
+def get_asset_bundle():
+    """Open the baked bundle on first use; None if there is none (or it is disabled)"""
+    global asset_bundle, asset_bundle_checked
+    if not asset_bundle_checked:
+        asset_bundle_checked = True
+        if USE_ASSET_BUNDLE and os.path.exists(ASSET_BUNDLE_PATH):
+            try:
+                asset_bundle = AssetBundle(ASSET_BUNDLE_PATH)
+            except Exception as error:
+                print(f"asset bundle ignored: {error}", file=sys.stderr)
+    return asset_bundle
+
+
+class AssetEntry:
+    """A cached asset with its estimated size and reference count"""
+
+    def __init__(self, asset, size):
+        self.asset = asset
+        self.size = size
+        self.refs = 0
+
+
+class AssetManager:
+    """Process-wide texture and sound cache keyed by file path.
+
+    Views acquire() what they need and release() it when they are hidden.
+    Unreferenced assets stay cached until the memory budget is exceeded,
+    then the least recently used ones are evicted first.
+    """
+
+    def __init__(self, budget=ASSET_CACHE_BUDGET):
+        self.budget = budget
+        self.entries = OrderedDict()  # path -> AssetEntry, least recently used first
+        self.total_size = 0
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.load_time = 0.0
+
+    def get(self, path):
+        """Return the cache entry for path, loading it on the first request"""
+        entry = self.entries.get(path)
+        if entry is not None:
+            self.hits += 1
+            self.entries.move_to_end(path)
+            return entry
+
+        self.misses += 1
+        start = time.perf_counter()
+        asset, size = self.load(path)
+        self.load_time += time.perf_counter() - start
+        return self.put(path, asset, size)
+
+    def load(self, path):
+        """Decode an asset from disk as (asset, size) without touching the cache.
+
+        Creates no GL objects, so worker threads can call it.
+        """
+        bundle = get_asset_bundle()
+        entry = bundle.lookup(path) if bundle is not None else None
+        if entry is not None:
+            return bundle.load(path, entry)
+        if path.lower().endswith(SOUND_EXTENSIONS):
+            asset = arcade.load_sound(path)
+            return asset, self.estimate_sound_size(path, asset)
+        asset = arcade.load_texture(path)
+        return asset, asset.width * asset.height * 4
+
+    def put(self, path, asset, size):
+        """Add a decoded asset to the cache (keeps the cached one if already there)"""
+        entry = self.entries.get(path)
+        if entry is not None:
+            return entry
+        entry = AssetEntry(asset, size)
+        self.entries[path] = entry
+        self.total_size += size
+        self.evict()
+        return entry
+
+    def texture(self, path):
+        """Cached arcade.load_texture"""
+        return self.get(path).asset
+
+    def sound(self, path):
+        """Cached arcade.load_sound"""
+        return self.get(path).asset
+
+    def acquire(self, path):
+        """Load (or reuse) an asset and keep it pinned until release()"""
+        entry = self.get(path)
+        entry.refs += 1
+        return entry.asset
+
+    def release(self, path):
+        """Drop one reference; the asset becomes evictable at zero"""
+        entry = self.entries.get(path)
+        if entry is not None and entry.refs > 0:
+            entry.refs -= 1
+        self.evict()
+
+    def evict(self):
+        """Evict least recently used, unreferenced assets until under budget"""
+        if self.total_size <= self.budget:
+            return
+        for path in list(self.entries):
+            if self.total_size <= self.budget:
+                break
+            entry = self.entries[path]
+            if entry.refs == 0:
+                del self.entries[path]
+                self.total_size -= entry.size
+                self.evictions += 1
+
+    def estimate_sound_size(self, path, sound):
+        """Rough decoded size of a sound (16-bit stereo at 44.1 kHz)"""
+        try:
+            return int(sound.get_length() * 44100 * 4)
+        except:
+            return os.path.getsize(path)
+
+    def stats(self):
+        """Snapshot of the cache counters"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'load_time': self.load_time,
+            'cached': len(self.entries),
+            'size': self.total_size,
+        }
+
+
+# Shared by every view so restarts and navigation never reload from disk
+assets = AssetManager()
+
+
+# Texture atlas holding every gameplay texture
+GAMEPLAY_ATLAS_SIZE = (2048, 2048)
+
+# Player skins: the idle image, one spritesheet per facing with the walk
+# frames along its top row, and the skin's entry in the item shop
+SKINS = {
+    'normal': {
+        'name': "Normal Wario",
+        'idle': "assets/images/sprites/wario/normal/SSWario.png",
+        'sheets': {
+            'right': "assets/images/sprites/wario/normal/WarioSpritesAll.png",
+            'left': "assets/images/sprites/wario/normal/WarioSpritesAllBackwards.png",
+        },
+        'frame_size': 32,
+        'walk_frames': 4,
+        'shop_id': "normal_wario",
+        'shop_name': "Normal Wario",
+        'price': 0,
+        'description': "Classic Wario appearance",
+        'always_owned': True,
+    },
+    'shiny': {
+        'name': "Shiny Wario",
+        'idle': "assets/images/sprites/wario/shiny/SSWarioShiny.png",
+        'sheets': {
+            'right': "assets/images/sprites/wario/shiny/WarioSpritesAllShiny.png",
+            'left': "assets/images/sprites/wario/shiny/WarioSpritesAllShinyBackwards.png",
+        },
+        'frame_size': 32,
+        'walk_frames': 4,
+        'shop_id': "shiny_wario",
+        'shop_name': "Shiny Wario Skin",
+        'price': 40,
+        'description': "Unlock the shiny appearance!",
+        'always_owned': False,
+    },
+}
+DEFAULT_SKIN = 'normal'
+PLAYER_SKIN_PATHS = [skin['idle'] for skin in SKINS.values()]
+# Physics stand-in for the player: the first frame of the default skin's spritesheet
+PLAYER_HITBOX_SHEET_PATH = SKINS[DEFAULT_SKIN]['sheets']['right']
+PLAYER_FRAME_TIME = 0.2  # Seconds per walk frame
+
+
+def skin_sheet_paths(skin):
+    return list(SKINS.get(skin, SKINS[DEFAULT_SKIN])['sheets'].values())
+
+
+class AnimationSet:
+    """Every texture of one skin's player animations, cropped once"""
+
+    def __init__(self, skin):
+        layout = SKINS[skin]
+        size = layout['frame_size']
+        self.skin = skin
+        self.still = assets.texture(layout['idle'])
+        self.walk = {}
+        for facing, path in layout['sheets'].items():
+            sheet = assets.texture(path)
+            self.walk[facing] = [sheet.crop(i * size, 0, size, size) for i in range(layout['walk_frames'])]
+        # Holding a key without moving shows the first walk frame
+        self.idle = {facing: frames[0] for facing, frames in self.walk.items()}
+
+    def textures(self):
+        return [self.still] + [frame for frames in self.walk.values() for frame in frames]
+
+
+animation_sets = {}
+
+
+def get_animation_set(skin):
+    """Animation set of a skin, built on first use (unknown skins get the default)"""
+    if skin not in SKINS:
+        skin = DEFAULT_SKIN
+    animations = animation_sets.get(skin)
+    if animations is None:
+        animations = animation_sets[skin] = AnimationSet(skin)
+    return animations
+
+
+class PlayerAnimator:
+    """Texture state machine of the player sprite.
+
+    States: 'still' (no key held, idle image), 'idle' (a key held but not
+    moving, first walk frame) and 'walk' (walk frames, PLAYER_FRAME_TIME
+    each). The sprite's texture is only assigned on a state change, a
+    facing change and a walk frame tick.
+    """
+
+    def __init__(self, sprite, animations, frame_time=PLAYER_FRAME_TIME):
+        self.sprite = sprite
+        self.animations = animations
+        self.frame_time = frame_time
+        self.state = 'still'
+        self.facing = 'right'
+        self.frame = 0
+        self.timer = 0.0
+        self.show()
+
+    def show(self):
+        if self.state == 'still':
+            self.sprite.texture = self.animations.still
+        elif self.state == 'idle':
+            self.sprite.texture = self.animations.idle[self.facing]
+        else:
+            self.sprite.texture = self.animations.walk[self.facing][self.frame]
+
+    def update(self, delta_time, keys_held, moving, facing):
+        state = 'walk' if keys_held and moving else 'idle' if keys_held else 'still'
+        if state != self.state:
+            self.state = state
+            self.facing = facing
+            self.frame = 0
+            self.timer = 0.0
+            self.show()
+        elif facing != self.facing and state != 'still':
+            self.facing = facing
+            self.show()
+        elif state == 'walk':
+            self.timer += delta_time
+            if self.timer >= self.frame_time:
+                self.timer = 0.0
+                self.frame = (self.frame + 1) % len(self.animations.walk[self.facing])
+                self.show()
+
+# Draw order of the play field (lower layers are drawn first)
+LAYER_COINS = 0
+LAYER_PLAYER = 1
+LAYER_PRINTERS = 2
+LAYER_ENEMIES = 3
+ENTITY_LAYERS = {
+    'burger': LAYER_COINS,
+    'printer': LAYER_PRINTERS,
+    'enemy': LAYER_ENEMIES,
+}
+
+gameplay_atlas = None
+
+
+gameplay_atlas_filled = False
+GAMEPLAY_ATLAS_PATHS = FOOD_TEXTURE_PATHS + [FALLBACK_ENEMY_TEXTURE_PATH, BURGER_TEXTURE_PATH,
+                                             PRINTER_TEXTURE_PATH] + PLAYER_SKIN_PATHS
+
+
+def get_gameplay_atlas(fill=True):
+    """Return the shared gameplay atlas, uploading every gameplay texture on first use.
+
+    With fill=False the atlas is only created; the preloader uses that to
+    upload textures a few at a time.
+    """
+    global gameplay_atlas, gameplay_atlas_filled
+    if gameplay_atlas is None:
+        gameplay_atlas = DefaultTextureAtlas(GAMEPLAY_ATLAS_SIZE)
+    if fill and not gameplay_atlas_filled:
+        for path in GAMEPLAY_ATLAS_PATHS:
+            try:
+                gameplay_atlas.add(assets.texture(path))  # Already uploaded textures are skipped
+            except:
+                pass  # Missing textures are skipped, sprites fall back on their own
+        gameplay_atlas_filled = True
+    return gameplay_atlas
+
+
+class FieldRenderer:
+    """Draws the whole play field as one sprite list on the gameplay atlas.
+
+    Sprites keep living in their per-type lists for game logic; this list
+    only decides draw order. It is kept sorted by layer, and a re-sort is
+    only needed when a sprite is added below the current top layer.
+    """
+
+    def __init__(self, atlas):
+        self.sprite_list = arcade.SpriteList(atlas=atlas)
+        self.top_layer = -1
+        self.needs_sort = False
+        self.draw_calls = 0
+
+    def add(self, sprite, layer):
+        """Add a sprite to the field on the given layer"""
+        sprite.render_layer = layer
+        self.sprite_list.append(sprite)
+        if layer < self.top_layer:
+            self.needs_sort = True
+        else:
+            self.top_layer = layer
+
+    def add_texture(self, texture):
+        """Make sure a texture is in the atlas before it is first drawn"""
+        self.sprite_list.atlas.add(texture)
+
+    def draw(self):
+        """Draw every field sprite in a single batch"""
+        if self.needs_sort:
+            # Stable sort keeps spawn order inside each layer
+            self.sprite_list.sort(key=lambda sprite: sprite.render_layer)
+            self.needs_sort = False
+        self.sprite_list.draw()
+        self.draw_calls = 1
+
+# How long the save writer waits to coalesce bursts of changes (seconds)
+SAVE_COALESCE_DELAY = 0.5
+
+
+def fsync_directory(directory):
+    """Make renames inside a directory durable (not supported on Windows)"""
+    try:
+        fd = os.open(directory or ".", os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class SaveWriter:
+    """Background thread that writes JSON save files behind the game loop.
+
+    submit() only records the latest serialized document per path; the
+    writer wakes up, waits briefly so bursts of changes coalesce, then
+    writes every pending file to a temp file, fsyncs it and renames it
+    over the original. A crash mid-write leaves the old file intact.
+    """
+
+    def __init__(self, coalesce_delay=SAVE_COALESCE_DELAY):
+        self.coalesce_delay = coalesce_delay
+        self.pending = {}  # path -> JSON text, latest wins
+        self.lock = threading.Lock()
+        self.write_lock = threading.Lock()
+        self.wake = threading.Event()
+        self.thread = None
+        self.closed = False
+
+        # Stats
+        self.submitted = 0
+        self.written = 0
+
+    def submit(self, path, data):
+        """Queue a document for writing; returns immediately"""
+        text = json.dumps(data)
+        with self.lock:
+            self.pending[path] = text
+            self.submitted += 1
+            if self.closed:
+                return
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name="save-writer", daemon=True)
+                self.thread.start()
+        self.wake.set()
+
+    def run(self):
+        while not self.closed:
+            self.wake.wait()
+            self.wake.clear()
+            time.sleep(self.coalesce_delay)
+            self.flush()
+
+    def flush(self):
+        """Write everything pending right now; on disk when this returns.
+
+        The write lock is taken before the batch is swapped out, so a flush
+        waits for one already running and batches land in submit order.
+        """
+        with self.write_lock:
+            with self.lock:
+                batch = self.pending
+                self.pending = {}
+            if not batch:
+                return
+
+            # Write and fsync all temp files first, then rename the whole batch
+            written = []
+            for path, text in batch.items():
+                temp_path = path + ".tmp"
+                try:
+                    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                    with open(temp_path, 'w') as f:
+                        f.write(text)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    written.append((temp_path, path))
+                except OSError as e:
+                    print(f"Could not save {path}: {e}")
+
+            directories = set()
+            for temp_path, path in written:
+                try:
+                    os.replace(temp_path, path)
+                    directories.add(os.path.dirname(path))
+                    self.written += 1
+                except OSError as e:
+                    print(f"Could not save {path}: {e}")
+            for directory in directories:
+                fsync_directory(directory)
+
+    def close(self):
+        """Stop the thread and flush whatever is still pending"""
+        with self.lock:
+            self.closed = True
+        self.wake.set()
+        if self.thread is not None:
+            self.thread.join(timeout=5)
+        self.flush()
+
+
+# Legacy shop file (profile version 1), only read for migration
+SHOP_DATA_FILE = "data/saves/shop_data.json"
+
+# Single versioned save file for everything about the player
+PROFILE_FILE = "data/saves/profile.json"
+PROFILE_VERSION = 2
+
+DEFAULT_COINS = 50
+
+
+def read_json(path, default):
+    """Read a JSON file, returning default if it is missing or broken"""
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except:
+        return default
+
+
+def migrate_profile_v1(data):
+    """Version 1 was highscore.json plus shop_data.json"""
+    shop = data.get('shop') or {}
+    return {
+        'version': 2,
+        'highscore': data.get('highscore', {}).get('highscore', 0),
+        'coins': shop.get('coins', DEFAULT_COINS),
+        'purchased_items': list(shop.get('purchased_items', [])),
+        'equipped_skin': shop.get('equipped_skin', 'normal'),
+        'stats': {},
+    }
+
+
+# version -> function upgrading a document from that version to the next
+PROFILE_MIGRATIONS = {
+    1: migrate_profile_v1,
+}
+
+
+def migrate_profile(data):
+    """Upgrade a profile document to PROFILE_VERSION one step at a time"""
+    version = data.get('version', 1)
+    while version < PROFILE_VERSION:
+        data = PROFILE_MIGRATIONS[version](data)
+        version = data['version']
+    return data
+
+
+class PlayerProfile:
+    """Highscore, coins, purchases, equipped skin and run stats.
+
+    Loaded once per process (see get_profile) and shared by every view;
+    changes are kept in memory and written behind by the SaveWriter.
+    """
+
+    def __init__(self, data=None, path=PROFILE_FILE):
+        data = migrate_profile(data or {'version': PROFILE_VERSION})
+        self.path = path
+        self.highscore = data.get('highscore', 0)
+        self.coins = data.get('coins', DEFAULT_COINS)
+        self.purchased_items = list(data.get('purchased_items', []))
+        self.equipped_skin = data.get('equipped_skin', 'normal')  # 'normal' or 'shiny'
+
+        stats = data.get('stats', {})
+        self.runs_played = stats.get('runs_played', 0)
+        self.burgers_collected = stats.get('burgers_collected', 0)
+        self.play_time = stats.get('play_time', 0.0)
+        self.last_score = stats.get('last_score', 0)
+
+    @classmethod
+    def load(cls, path=PROFILE_FILE):
+        """Read the profile, migrating the legacy save files if needed"""
+        data = read_json(path, None)
+        if data is None:
+            data = {
+                'version': 1,
+                'highscore': read_json(HIGHSCORE_FILE, {}),
+                'shop': read_json(SHOP_DATA_FILE, {}),
+            }
+        profile = cls(data, path)
+        if data.get('version', 1) < PROFILE_VERSION:
+            profile.save()  # Persist the migrated document
+        return profile
+
+    def to_dict(self):
+        return {
+            'version': PROFILE_VERSION,
+            'highscore': self.highscore,
+            'coins': self.coins,
+            'purchased_items': list(self.purchased_items),
+            'equipped_skin': self.equipped_skin,
+            'stats': {
+                'runs_played': self.runs_played,
+                'burgers_collected': self.burgers_collected,
+                'play_time': self.play_time,
+                'last_score': self.last_score,
+            },
+        }
+
+    def save(self):
+        """Queue the profile for writing; never blocks on the disk"""
+        save_writer.submit(self.path, self.to_dict())
+
+    def owns(self, item_id):
+        return item_id in self.purchased_items
+
+    def add_coins(self, amount):
+        self.coins += amount
+        self.save()
+
+    def purchase(self, item_id, price):
+        """Spend coins on an item; False if the player cannot afford it"""
+        if self.coins < price:
+            return False
+        self.coins -= price
+        self.purchased_items.append(item_id)
+        self.save()
+        return True
+
+    def equip(self, skin):
+        self.equipped_skin = skin
+        self.save()
+
+    def record_run(self, score, play_time):
+        """Add a finished run to the stats; True if it set a new highscore"""
+        self.runs_played += 1
+        self.burgers_collected += score
+        self.play_time += play_time
+        self.last_score = score
+        is_new_highscore = score > self.highscore
+        if is_new_highscore:
+            self.highscore = score
+        self.save()
+        return is_new_highscore
+
+
+save_writer = SaveWriter()
+atexit.register(save_writer.close)
+
+player_profile = None
+
+
+def get_profile():
+    """Load the player profile on first use and return the shared instance"""
+    global player_profile
+    if player_profile is None:
+        player_profile = PlayerProfile.load()
+    return player_profile
+
+
+BACKGROUND_VERTEX_SHADER = """
+#version 330
+in vec2 in_vert;
+in vec2 in_uv;
+out vec2 v_uv;
+
+void main() {
+    gl_Position = vec4(in_vert, 0.0, 1.0);
+    v_uv = in_uv;
+}
+"""
+
+# Same look as GameView.draw_background_immediate, evaluated per pixel
+BACKGROUND_FRAGMENT_SHADER = """
+#version 330
+uniform float time;
+uniform vec2 resolution;
+in vec2 v_uv;
+out vec4 out_color;
+
+// Blend a shape over the current color with anti-aliased coverage
+vec3 over(vec3 base, vec3 color, float alpha, float coverage) {
+    return mix(base, color, alpha * clamp(coverage, 0.0, 1.0));
+}
+
+float circle(vec2 p, vec2 center, float radius) {
+    return radius - length(p - center) + 0.5;
+}
+
+void main() {
+    vec2 p = v_uv * resolution;
+    float width = resolution.x;
+    float height = resolution.y;
+
+    // 8-step purple -> magenta gradient
+    float band = min(floor(p.y / (height / 8.0)), 7.0);
+    vec3 color = mix(vec3(30.0, 8.0, 60.0), vec3(140.0, 24.0, 180.0), band / 7.0) / 255.0;
+
+    // Pulsing gold emblem
+    float emblem_alpha = (30.0 + 15.0 * sin(time * 1.5)) / 255.0;
+    float emblem_radius = floor(min(width, height) * 0.45);
+    color = over(color, vec3(212.0, 175.0, 55.0) / 255.0, emblem_alpha,
+                 circle(p, vec2(floor(width / 2.0), floor(height / 2.0) + 40.0), emblem_radius));
+
+    // Drifting diagonal stripes
+    float stripe_half = max(12.0, floor(width / 60.0)) / 2.0;
+    float cos_a = cos(radians(20.0));
+    float sin_a = sin(radians(20.0));
+    for (int i = 0; i < 6; i++) {
+        vec2 c = vec2(float(i - 1) * floor(width / 5.0) + floor(sin(time * 0.6 + float(i)) * 40.0),
+                      floor(height / 2.0));
+        vec2 d = p - c;
+        float along = d.x * cos_a + d.y * sin_a;
+        float across = -d.x * sin_a + d.y * cos_a;
+        float coverage = min(width / 2.0 - abs(along), stripe_half - abs(across)) + 0.5;
+        color = over(color, vec3(210.0, 180.0, 0.0) / 255.0, 25.0 / 255.0, coverage);
+    }
+
+    // Floating coins with a highlight
+    for (int i = 0; i < 7; i++) {
+        float fi = float(i);
+        vec2 c = vec2(floor((width / 7.0) * fi + 40.0 + sin(time * 0.5 + fi) * 30.0),
+                      floor(height * 0.7 + cos(time * 0.4 + fi) * 30.0));
+        float r = 8.0 + float(i % 3) * 3.0;
+        color = over(color, vec3(212.0, 175.0, 55.0) / 255.0, 220.0 / 255.0, circle(p, c, r));
+        color = over(color, vec3(255.0, 235.0, 155.0) / 255.0, 160.0 / 255.0,
+                     circle(p, c + vec2(-floor(r / 3.0), floor(r / 3.0)), floor(r / 2.0)));
+    }
+
+    // Sparkles
+    for (int i = 0; i < 10; i++) {
+        float fi = float(i);
+        vec2 c = vec2(floor((width / 10.0) * fi + sin(time * 2.0 + fi) * 20.0),
+                      floor(height * 0.9 + cos(time * 3.0 + fi) * 10.0));
+        float alpha = floor(80.0 + 60.0 * (sin(time * 3.0 + fi) * 0.5 + 0.5)) / 255.0;
+        color = over(color, vec3(255.0, 255.0, 200.0) / 255.0, alpha, circle(p, c, 2.0));
+    }
+
+    out_color = vec4(color, 1.0);
+}
+"""
+
+
+class BackgroundShader:
+    """Animated game background drawn as one full-screen quad"""
+
+    def __init__(self, ctx):
+        self.program = ctx.program(
+            vertex_shader=BACKGROUND_VERTEX_SHADER,
+            fragment_shader=BACKGROUND_FRAGMENT_SHADER,
+        )
+        self.quad = geometry.quad_2d_fs()
+
+    def draw(self, time, width, height):
+        self.program['time'] = time
+        self.program['resolution'] = (width, height)
+        self.quad.render(self.program)
+
+
+background_shader = None
+
+
+def get_background_shader(ctx):
+    """Compile the background shader once; None if the GPU rejects it"""
+    global background_shader
+    if background_shader is None:
+        try:
+            background_shader = BackgroundShader(ctx)
+        except Exception as e:
+            print(f"Background shader unavailable, using immediate-mode fallback: {e}")
+            background_shader = False
+    return background_shader or None
+
+
+BLIT_FRAGMENT_SHADER = """
+#version 330
+uniform sampler2D source;
+in vec2 v_uv;
+out vec4 out_color;
+
+void main() {
+    out_color = texture(source, v_uv);
+}
+"""
+
+
+class TextureBlitter:
+    """Copies an offscreen texture onto the active framebuffer with one quad"""
+
+    def __init__(self, ctx):
+        self.ctx = ctx
+        self.program = ctx.program(
+            vertex_shader=BACKGROUND_VERTEX_SHADER,
+            fragment_shader=BLIT_FRAGMENT_SHADER,
+        )
+        self.program['source'] = 0
+        self.quad = geometry.quad_2d_fs()
+
+    def draw(self, texture, blend=False):
+        """Stretch texture over the whole viewport"""
+        texture.use(0)
+        if blend:
+            self.quad.render(self.program)
+        else:
+            self.ctx.disable(self.ctx.BLEND)
+            self.quad.render(self.program)
+            self.ctx.enable(self.ctx.BLEND)
+
+
+texture_blitter = None
+
+
+def get_texture_blitter(ctx):
+    """Compile the blit shader once per process"""
+    global texture_blitter
+    if texture_blitter is None:
+        texture_blitter = TextureBlitter(ctx)
+    return texture_blitter
+
+
+# Burger collection bursts
+PARTICLE_BURSTS = 512  # Bursts alive at once (ring buffer slots)
+PARTICLE_LIFETIME = 1.0  # Seconds a burst lasts
+BURST_CRUMBS = 11  # Crumbs flying off the burger in every burst
+PARTICLE_GRAVITY = (0.0, -600.0)
+CRUMB_COLORS = [
+    (0.85, 0.55, 0.20, 1.0),  # Bun
+    (0.45, 0.25, 0.10, 1.0),  # Patty
+    (0.35, 0.75, 0.20, 1.0),  # Lettuce
+    (0.90, 0.20, 0.15, 1.0),  # Tomato
+    (1.00, 0.80, 0.20, 1.0),  # Cheese
+]
+BURST_RECORD = struct.Struct("<4f")  # origin x, origin y, spawn time, scale
+
+PARTICLE_VERTEX_SHADER = """
+#version 330
+uniform float time;
+uniform vec2 gravity;
+
+// One particle of the burst template
+in vec2 in_velocity;
+in vec2 in_size;
+in float in_spin;
+in float in_kind;  // 0 = the collected burger, 1 = crumb
+in float in_life;
+in vec4 in_color;
+// The burst (per instance)
+in vec2 in_origin;
+in float in_start;
+in float in_scale;
+
+out vec2 v_position;
+out vec2 v_size;
+out float v_angle;
+out vec4 v_color;
+out float v_kind;
+
+void main() {
+    gl_Position = vec4(0.0);
+    float age = time - in_start;
+    v_kind = in_kind;
+    v_position = in_origin;
+    v_size = vec2(0.0);  // Nothing is emitted for dead particles
+    v_angle = 0.0;
+    v_color = vec4(1.0);
+    if (age < 0.0 || age >= in_life) {
+        return;
+    }
+    if (in_kind < 0.5) {
+        // The burger grows, spins and rises for half a second, then shrinks away
+        float grow = min(age, 0.5);
+        float scale = age < 0.5 ? 1.0 + age * 4.0 : max(0.1, 3.0 * (1.0 - (age - 0.5) / 0.5));
+        v_position = in_origin + vec2(0.0, 100.0 * grow + 50.0 * max(age - 0.5, 0.0));
+        v_size = in_size * in_scale * scale;
+        v_angle = 720.0 * grow;
+    } else {
+        // Crumbs fly off in a fan, turned a little differently for every burst
+        float turn = (fract(sin(float(gl_InstanceID) * 12.9898) * 43758.5453) - 0.5) * 0.8;
+        vec2 velocity = mat2(cos(turn), sin(turn), -sin(turn), cos(turn)) * in_velocity;
+        float fade = 1.0 - age / in_life;
+        v_position = in_origin + velocity * age + 0.5 * gravity * age * age;
+        v_size = in_size * in_scale * (0.5 + 0.5 * fade);
+        v_angle = in_spin * age;
+        v_color = vec4(in_color.rgb, in_color.a * fade);
+    }
+}
+"""
+
+PARTICLE_GEOMETRY_SHADER = """
+#version 330
+layout (points) in;
+layout (triangle_strip, max_vertices = 4) out;
+
+uniform WindowBlock {
+    mat4 projection;
+    mat4 view;
+} window;
+
+in vec2 v_position[];
+in vec2 v_size[];
+in float v_angle[];
+in vec4 v_color[];
+in float v_kind[];
+
+out vec2 g_uv;
+out vec4 g_color;
+out float g_kind;
+
+void main() {
+    if (v_size[0].x <= 0.0) {
+        return;
+    }
+    float angle = radians(v_angle[0]);
+    mat2 rot = mat2(cos(angle), -sin(angle), sin(angle), cos(angle));
+    mat4 mvp = window.projection * window.view;
+    vec2 half_size = v_size[0] / 2.0;
+    vec2 corners[4] = vec2[4](vec2(-1.0, -1.0), vec2(1.0, -1.0), vec2(-1.0, 1.0), vec2(1.0, 1.0));
+    for (int i = 0; i < 4; i++) {
+        vec2 offset = rot * (corners[i] * half_size);
+        gl_Position = mvp * vec4(v_position[0] + offset, 0.0, 1.0);
+        // Image rows are stored top first
+        g_uv = vec2(corners[i].x * 0.5 + 0.5, 0.5 - corners[i].y * 0.5);
+        g_color = v_color[0];
+        g_kind = v_kind[0];
+        EmitVertex();
+    }
+    EndPrimitive();
+}
+"""
+
+PARTICLE_FRAGMENT_SHADER = """
+#version 330
+uniform sampler2D burger_texture;
+in vec2 g_uv;
+in vec4 g_color;
+in float g_kind;
+out vec4 out_color;
+
+void main() {
+    if (g_kind < 0.5) {
+        out_color = texture(burger_texture, g_uv) * g_color;
+    } else {
+        // Round crumbs
+        if (length(g_uv - 0.5) > 0.5) {
+            discard;
+        }
+        out_color = g_color;
+    }
+    if (out_color.a <= 0.0) {
+        discard;
+    }
+}
+"""
+
+
+class ParticleEmitter:
+    """Burger collection bursts animated entirely on the GPU.
+
+    A burst is one 16-byte record (origin, spawn time, scale) in a ring of
+    PARTICLE_BURSTS slots. Its particles come from a shared template (the
+    burger plus BURST_CRUMBS crumbs) and the shader moves them from the
+    age of the burst, so there is no per-particle work on the CPU. draw()
+    writes the frame's new records and renders every slot with one
+    instanced call, or skips drawing when no burst is alive.
+    """
+
+    def __init__(self, ctx):
+        self.ctx = ctx
+        self.program = ctx.program(
+            vertex_shader=PARTICLE_VERTEX_SHADER,
+            geometry_shader=PARTICLE_GEOMETRY_SHADER,
+            fragment_shader=PARTICLE_FRAGMENT_SHADER,
+        )
+        self.program['burger_texture'] = 0
+        self.program['gravity'] = PARTICLE_GRAVITY
+
+        image = assets.texture(BURGER_TEXTURE_PATH).image.convert("RGBA")
+        self.texture = ctx.texture(image.size, components=4, data=image.tobytes())
+
+        values = [value for particle in self.build_template() for value in particle]
+        self.template = ctx.buffer(data=struct.pack(f"<{len(values)}f", *values))
+        self.bursts = ctx.buffer(reserve=BURST_RECORD.size * PARTICLE_BURSTS)
+        self.geometry = ctx.geometry(
+            [
+                arcade.gl.BufferDescription(
+                    self.template, "2f 2f 1f 1f 1f 4f",
+                    ["in_velocity", "in_size", "in_spin", "in_kind", "in_life", "in_color"],
+                ),
+                arcade.gl.BufferDescription(
+                    self.bursts, "2f 1f 1f", ["in_origin", "in_start", "in_scale"], instanced=True,
+                ),
+            ],
+            mode=ctx.POINTS,
+        )
+        self.draw_calls = 0
+        self.clear()
+
+    @staticmethod
+    def build_template():
+        """The particles of one burst: the burger itself, then the crumbs"""
+        width, height = assets.texture(BURGER_TEXTURE_PATH).size
+        particles = [(0.0, 0.0, width, height, 0.0, 0.0, PARTICLE_LIFETIME, 1.0, 1.0, 1.0, 1.0)]
+        rng = random.Random("crumbs")  # Same fan every run
+        for i in range(BURST_CRUMBS):
+            angle = math.pi * (0.1 + 0.8 * i / (BURST_CRUMBS - 1)) + rng.uniform(-0.15, 0.15)
+            speed = rng.uniform(120.0, 320.0)
+            size = rng.uniform(3.0, 7.0)
+            particles.append((
+                math.cos(angle) * speed, math.sin(angle) * speed, size, size,
+                rng.uniform(-720.0, 720.0), 1.0, rng.uniform(0.5, 0.9), *rng.choice(CRUMB_COLORS),
+            ))
+        return particles
+
+    def clear(self):
+        """Drop every burst, e.g. when a new run starts"""
+        self.time = 0.0
+        self.last_burst = -PARTICLE_LIFETIME
+        self.head = 0
+        self.pending = []
+        dead = BURST_RECORD.pack(0.0, 0.0, -2.0 * PARTICLE_LIFETIME, 1.0)
+        self.bursts.write(dead * PARTICLE_BURSTS)
+
+    def update(self, delta_time):
+        self.time += delta_time
+
+    def burst(self, x, y, scale=1.0):
+        """Queue a collection burst at (x, y); it starts now"""
+        self.pending.append((x, y, self.time, scale))
+        self.last_burst = self.time
+
+    def flush(self):
+        """Write the queued bursts into the ring with at most two buffer writes"""
+        pending = self.pending[-PARTICLE_BURSTS:]  # Older ones would be overwritten anyway
+        self.pending = []
+        data = b"".join(BURST_RECORD.pack(*record) for record in pending)
+        first = min(len(pending), PARTICLE_BURSTS - self.head)
+        self.bursts.write(data[:first * BURST_RECORD.size], offset=self.head * BURST_RECORD.size)
+        if len(pending) > first:
+            self.bursts.write(data[first * BURST_RECORD.size:])
+        self.head = (self.head + len(pending)) % PARTICLE_BURSTS
+
+    def draw(self):
+        if self.pending:
+            self.flush()
+        if self.time - self.last_burst >= PARTICLE_LIFETIME:
+            self.draw_calls = 0
+            return
+        self.program['time'] = self.time
+        self.texture.use(0)
+        self.geometry.render(self.program, instances=PARTICLE_BURSTS)
+        self.draw_calls = 1
+
+
+particle_emitter = None
+
+
+def get_particle_emitter(ctx):
+    """Create the particle emitter once; None if the GPU rejects its shaders"""
+    global particle_emitter
+    if particle_emitter is None:
+        try:
+            particle_emitter = ParticleEmitter(ctx)
+        except Exception as e:
+            print(f"Particle effects unavailable: {e}")
+            particle_emitter = False
+    return particle_emitter or None
+
+
+# Instanced enemies
+ENEMY_TEXTURE_PATHS = FOOD_TEXTURE_PATHS + [FALLBACK_ENEMY_TEXTURE_PATH]
+ENEMY_INSTANCE_CAPACITY = 256  # Doubled whenever more enemies are on the field
+# origin x/y, velocity x/y, spawn time, spin, width, height, texture index
+ENEMY_RECORD = struct.Struct("<9f")
+
+ENEMY_VERTEX_SHADER = """
+#version 330
+uniform WindowBlock {
+    mat4 projection;
+    mat4 view;
+} window;
+
+uniform float time;
+// Atlas UVs (left, top, right, bottom) of every enemy texture
+uniform vec4 regions[%d];
+
+// Corner of the quad, -1..1
+in vec2 in_corner;
+// The enemy (per instance)
+in vec2 in_origin;
+in vec2 in_velocity;
+in float in_start;
+in float in_spin;
+in vec2 in_size;
+in float in_region;
+
+out vec2 v_uv;
+
+void main() {
+    // Same path and rotation as Enemy.place()
+    float age = max(time - in_start, 0.0);
+    float angle = radians(in_spin * age);
+    mat2 rot = mat2(cos(angle), -sin(angle), sin(angle), cos(angle));
+    vec2 center = in_origin + in_velocity * age;
+    vec2 offset = rot * (in_corner * in_size / 2.0);
+    gl_Position = window.projection * window.view * vec4(center + offset, 0.0, 1.0);
+    vec4 region = regions[int(in_region)];
+    v_uv = vec2(mix(region.x, region.z, in_corner.x * 0.5 + 0.5),
+                mix(region.w, region.y, in_corner.y * 0.5 + 0.5));
+}
+""" % len(ENEMY_TEXTURE_PATHS)
+
+ENEMY_FRAGMENT_SHADER = """
+#version 330
+uniform sampler2D atlas;
+in vec2 v_uv;
+out vec4 out_color;
+
+void main() {
+    out_color = texture(atlas, v_uv);
+    if (out_color.a <= 0.0) {
+        discard;
+    }
+}
+"""
+
+
+class EnemyRenderer:
+    """Draws every enemy with one instanced call from per-enemy GPU records.
+
+    An enemy's record (spawn time, start, velocity, spin, size, texture)
+    is written once when it spawns and blanked when it despawns. The
+    vertex shader puts each instance where its path is at the time
+    uniform, so moving and spinning enemies never touch vertex data and
+    a frame costs the same with one enemy as with hundreds.
+    """
+
+    def __init__(self, ctx, atlas):
+        self.ctx = ctx
+        self.atlas = atlas
+        self.program = ctx.program(
+            vertex_shader=ENEMY_VERTEX_SHADER,
+            fragment_shader=ENEMY_FRAGMENT_SHADER,
+        )
+        self.program['atlas'] = 0
+        self.textures = []
+        for path in ENEMY_TEXTURE_PATHS:
+            try:
+                texture = assets.texture(path)
+                atlas.add(texture)  # Already uploaded textures are skipped
+            except:
+                texture = None  # Enemies use the fallback texture then
+            self.textures.append(texture)
+        self.corners = ctx.buffer(data=struct.pack("<8f", -1, -1, 1, -1, -1, 1, 1, 1))
+        self.records = None
+        self.capacity = 0
+        self.slots = []  # Enemy per instance slot, None for free slots
+        self.free = []   # Heap of free slot numbers
+        self.draw_calls = 0
+        self.allocate(ENEMY_INSTANCE_CAPACITY)
+
+    def allocate(self, capacity):
+        """(Re)create the record buffer, keeping the records written so far"""
+        records = self.ctx.buffer(reserve=ENEMY_RECORD.size * capacity)
+        if self.records is not None:
+            records.write(self.records.read())
+        self.records = records
+        self.capacity = capacity
+        self.geometry = self.ctx.geometry(
+            [
+                arcade.gl.BufferDescription(self.corners, "2f", ["in_corner"]),
+                arcade.gl.BufferDescription(
+                    self.records, "2f 2f 1f 1f 2f 1f",
+                    ["in_origin", "in_velocity", "in_start", "in_spin", "in_size", "in_region"],
+                    instanced=True,
+                ),
+            ],
+            mode=self.ctx.TRIANGLE_STRIP,
+        )
+
+    def clear(self):
+        """Forget every enemy, e.g. when a new run starts"""
+        for enemy in self.slots:
+            if enemy is not None:
+                enemy.renderer = None
+        self.slots = []
+        self.free = []
+        self.records.write(bytes(ENEMY_RECORD.size * self.capacity))
+
+    def add(self, enemy):
+        """Upload an enemy's path; it is drawn until remove()"""
+        slot = None
+        while self.free:
+            slot = heapq.heappop(self.free)
+            if slot < len(self.slots):
+                break
+            slot = None  # Trimmed off the end in the meantime
+        if slot is None:
+            slot = len(self.slots)
+            self.slots.append(None)
+            if slot >= self.capacity:
+                self.allocate(self.capacity * 2)
+        self.slots[slot] = enemy
+        enemy.renderer = self
+        enemy.render_slot = slot
+        self.records.write(ENEMY_RECORD.pack(
+            enemy.start_x, enemy.center_y, enemy.change_x, 0.0, enemy.spawn_time,
+            enemy.rotation_speed, enemy.width, enemy.height, enemy.texture_index,
+        ), offset=slot * ENEMY_RECORD.size)
+
+    def remove(self, enemy):
+        slot = enemy.render_slot
+        enemy.renderer = None
+        self.records.write(bytes(ENEMY_RECORD.size), offset=slot * ENEMY_RECORD.size)  # Zero size: not drawn
+        self.slots[slot] = None
+        heapq.heappush(self.free, slot)
+        # Only draw up to the last slot in use
+        while self.slots and self.slots[-1] is None:
+            self.slots.pop()
+
+    def regions(self):
+        """Atlas UVs of the enemy textures (they move when the atlas is rebuilt)"""
+        values = []
+        for texture in self.textures:
+            try:
+                uvs = self.atlas.get_texture_region_info(texture.atlas_name).texture_coordinates
+                values.extend((uvs[0], uvs[1], uvs[6], uvs[7]))
+            except:
+                values.extend((0.0, 0.0, 0.0, 0.0))
+        return values
+
+    def draw(self, time):
+        """Draw every enemy where its path is at run time `time`"""
+        if not self.slots:
+            self.draw_calls = 0
+            return
+        self.program['time'] = time
+        self.program['regions'] = self.regions()
+        self.atlas.texture.use(0)
+        self.geometry.render(self.program, instances=len(self.slots))
+        self.draw_calls = 1
+
+
+enemy_renderer = None
+
+
+def get_enemy_renderer(ctx, atlas):
+    """Create the enemy renderer once; None if the GPU rejects its shaders"""
+    global enemy_renderer
+    if enemy_renderer is None:
+        try:
+            enemy_renderer = EnemyRenderer(ctx, atlas)
+        except Exception as e:
+            print(f"Instanced enemies unavailable, drawing them as sprites: {e}")
+            enemy_renderer = False
+    return enemy_renderer or None
+
+
+class StaticLayer:
+    """Offscreen copy of everything in a view that does not animate.
+
+    The render callback runs only when the layer is invalidated (first
+    draw, resize, state change); every other frame is a single blit.
+    """
+
+    def __init__(self, window, background_color):
+        self.window = window
+        self.background_color = background_color
+        self.framebuffer = None
+        self.size = None
+        self.dirty = True
+
+    def invalidate(self):
+        self.dirty = True
+
+    def draw(self, render):
+        """Blit the cached layer, re-rendering it first if needed"""
+        ctx = self.window.ctx
+        size = ctx.active_framebuffer.size  # Same size as the frame it is drawn into
+        if self.framebuffer is None or size != self.size:
+            self.framebuffer = ctx.framebuffer(color_attachments=[ctx.texture(size)])
+            self.size = size
+            self.dirty = True
+
+        if self.dirty:
+            with self.framebuffer.activate():
+                self.framebuffer.clear(color=self.background_color)
+                render()
+            self.dirty = False
+
+        get_texture_blitter(ctx).draw(self.framebuffer.color_attachments[0])
+
+
+# Resolution the views render at before being scaled to the window: a
+# (width, height) pair, or a fraction of the window's pixels such as 0.5
+INTERNAL_RESOLUTION = (WINDOW_WIDTH, WINDOW_HEIGHT)
+
+
+def parse_resolution(text):
+    """'1280x720' -> (1280, 720), '0.5' -> 0.5 (a fraction of the window)"""
+    if 'x' in text.lower():
+        width, height = text.lower().split('x')
+        return int(width), int(height)
+    return float(text)
+
+
+class VirtualScreen:
+    """Offscreen frame the views draw into at the internal resolution.
+
+    Views lay out and draw in its width x height space; present() scales
+    the frame onto the window in one pass, letterboxed to keep the aspect
+    ratio. Fill-rate cost then depends on the internal resolution instead
+    of on the display the game runs on.
+    """
+
+    def __init__(self, window, resolution=INTERNAL_RESOLUTION):
+        self.window = window
+        self.resolution = resolution
+        self.framebuffer = None
+        self.camera = None
+
+    @property
+    def size(self):
+        if isinstance(self.resolution, tuple):
+            return self.resolution
+        width, height = self.window.get_framebuffer_size()
+        return max(1, round(width * self.resolution)), max(1, round(height * self.resolution))
+
+    @property
+    def width(self):
+        return self.size[0]
+
+    @property
+    def height(self):
+        return self.size[1]
+
+    def letterbox(self, target_width, target_height):
+        """(left, bottom, width, height) of the scaled frame inside a target"""
+        width, height = self.size
+        scale = min(target_width / width, target_height / height)
+        return ((target_width - width * scale) / 2, (target_height - height * scale) / 2,
+                width * scale, height * scale)
+
+    def activate(self):
+        """Context manager that sends all drawing to the offscreen frame"""
+        size = self.size
+        if self.framebuffer is None or self.framebuffer.size != size:
+            ctx = self.window.ctx
+            self.framebuffer = ctx.framebuffer(color_attachments=[ctx.texture(size)])
+            self.camera = arcade.Camera2D(render_target=self.framebuffer)
+        return self.camera.activate()
+
+    def present(self):
+        """Scale the frame onto the window"""
+        ctx = self.window.ctx
+        width, height = self.window.get_framebuffer_size()
+        viewport = tuple(int(round(value)) for value in self.letterbox(width, height))
+        if viewport != (0, 0, width, height):
+            ctx.screen.clear(color=arcade.color.BLACK)  # Bars around the frame
+        ctx.viewport = viewport
+        get_texture_blitter(ctx).draw(self.framebuffer.color_attachments[0])
+        ctx.viewport = (0, 0, width, height)
+
+    def to_virtual(self, x, y):
+        """Window (mouse) coordinates to internal coordinates"""
+        left, bottom, width, height = self.letterbox(self.window.width, self.window.height)
+        return (x - left) * self.width / width, (y - bottom) * self.height / height
+
+
+virtual_screen = None
+
+
+def get_virtual_screen(window=None):
+    """The shared offscreen frame, created for the window on first use"""
+    global virtual_screen
+    if virtual_screen is None:
+        virtual_screen = VirtualScreen(window or arcade.get_window())
+    return virtual_screen
+
+
+class ScreenView(arcade.View):
+    """View that lays out and draws at the internal resolution.
+
+    Subclasses implement draw() instead of on_draw(). width and height are
+    the internal size, clear() clears the offscreen frame, and mouse
+    handlers map their coordinates with self.screen.to_virtual().
+    """
+
+    @property
+    def screen(self):
+        return get_virtual_screen(self.window)
+
+    @property
+    def size(self):
+        return self.screen.size
+
+    @property
+    def width(self):
+        return self.screen.width
+
+    @property
+    def height(self):
+        return self.screen.height
+
+    def clear(self, color=None, color_normalized=None, viewport=None):
+        """Clear the offscreen frame with the view's background color"""
+        if color is None and color_normalized is None:
+            color = self.background_color
+        self.screen.framebuffer.clear(color=color, color_normalized=color_normalized, viewport=viewport)
+
+    def on_draw(self):
+        with self.screen.activate():
+            self.draw()
+        self.screen.present()
+
+    def draw(self):
+        pass
+
+
+# Same default font as arcade.draw_text
+DEFAULT_FONT = ("calibri", "arial")
+
+
+class TextCache:
+    """Retained arcade.Text labels keyed by content, font and style.
+
+    A label is laid out once when its string is first drawn and only moved
+    (never re-laid out) when its position changes. rebuilds counts new
+    layouts in the current frame; rebuilds_last_frame is what overlays show.
+    """
+
+    def __init__(self, max_labels=256):
+        self.labels = OrderedDict()  # key -> arcade.Text, least recently used first
+        self.max_labels = max_labels
+        self.rebuilds = 0
+        self.rebuilds_last_frame = 0
+        self.total_rebuilds = 0
+
+    def begin_frame(self):
+        """Start counting layout rebuilds for a new frame"""
+        self.rebuilds_last_frame = self.rebuilds
+        self.rebuilds = 0
+
+    def label(self, text, x, y, color, font_size=12, anchor_x="left",
+              font_name=DEFAULT_FONT, bold=False):
+        """Return a laid-out label for this text and style at (x, y)"""
+        key = (text, color, font_size, anchor_x, font_name, bold)
+        label = self.labels.get(key)
+        if label is None:
+            label = arcade.Text(text, x, y, color, font_size=font_size, anchor_x=anchor_x,
+                                font_name=font_name, bold=bold)
+            self.labels[key] = label
+            self.rebuilds += 1
+            self.total_rebuilds += 1
+            if len(self.labels) > self.max_labels:
+                self.labels.popitem(last=False)
+        else:
+            self.labels.move_to_end(key)
+            if label.x != x or label.y != y:
+                label.position = (x, y)
+        return label
+
+
+# One cache for every view, so menu labels survive navigation
+text_cache = TextCache()
+
+
+def draw_label(text, x, y, color, font_size=12, anchor_x="left",
+               font_name=DEFAULT_FONT, bold=False):
+    """Drop-in replacement for arcade.draw_text backed by the text cache"""
+    text_cache.label(text, x, y, color, font_size, anchor_x, font_name, bold).draw()
+
+
+# Frame profiler settings
+PROFILER_HISTORY = 600  # Frames kept in the ring buffer (10 s at 60 fps)
+PROFILER_REFRESH = 0.25  # Seconds between overlay statistics refreshes
+PROFILE_DUMP_DIR = "data/profiles"
+UPDATE_PHASES = ('player', 'spawn', 'movement', 'collision', 'rewards')
+DRAW_PHASES = ('background', 'field', 'hud')
+ENTITY_COUNTERS = ('burgers', 'printers', 'enemies')
+FRAME_BUDGET_MS = 1000 / 60
+
+
+class FrameProfiler:
+    """Per-phase frame timings in a fixed-size ring buffer.
+
+    Code being measured calls begin() and then mark(phase) after each
+    phase, which adds the time since the previous mark to that phase.
+    next_frame() closes the current frame. Nothing is recorded while
+    disabled, so callers only pay for an `if profiler.enabled` check.
+    """
+
+    def __init__(self, history=PROFILER_HISTORY):
+        self.history = history
+        self.columns = ('frame', 'update', 'draw') + UPDATE_PHASES + DRAW_PHASES + ENTITY_COUNTERS
+        self.buffer = {name: [0.0] * history for name in self.columns}
+        self.index = 0  # Next slot to write
+        self.count = 0  # Filled slots
+        self.current = dict.fromkeys(self.columns, 0.0)
+        self.last = 0.0
+        self.enabled = False
+
+    def clear(self):
+        self.index = 0
+        self.count = 0
+        self.current = dict.fromkeys(self.columns, 0.0)
+
+    def begin(self):
+        """Start timing from now"""
+        self.last = time.perf_counter()
+
+    def mark(self, phase):
+        """Charge the time since begin() or the last mark to a phase"""
+        now = time.perf_counter()
+        self.current[phase] += (now - self.last) * 1000
+        self.last = now
+
+    def set(self, name, value):
+        self.current[name] = value
+
+    def next_frame(self, delta_time):
+        """Store the frame collected so far and start a new one"""
+        current = self.current
+        current['update'] = sum(current[phase] for phase in UPDATE_PHASES)
+        current['draw'] = sum(current[phase] for phase in DRAW_PHASES)
+        if current['frame'] > 0:
+            for name, value in current.items():
+                self.buffer[name][self.index] = value
+            self.index = (self.index + 1) % self.history
+            self.count = min(self.count + 1, self.history)
+        self.current = dict.fromkeys(self.columns, 0.0)
+        self.current['frame'] = delta_time * 1000
+
+    def samples(self, name):
+        """Recorded values of one column, oldest first"""
+        column = self.buffer[name]
+        if self.count < self.history:
+            return column[:self.count]
+        return column[self.index:] + column[:self.index]
+
+    def percentiles(self, name):
+        values = sorted(self.samples(name))
+        if not values:
+            return {'p50': 0.0, 'p95': 0.0, 'p99': 0.0, 'max': 0.0}
+        last = len(values) - 1
+        return {
+            'p50': values[min(last, int(0.50 * len(values)))],
+            'p95': values[min(last, int(0.95 * len(values)))],
+            'p99': values[min(last, int(0.99 * len(values)))],
+            'max': values[last],
+        }
+
+    def summary(self):
+        return {name: self.percentiles(name) for name in self.columns
+                if name not in ENTITY_COUNTERS}
+
+    def dump(self, directory=PROFILE_DUMP_DIR):
+        """Write the buffer as CSV and the summary plus samples as JSON.
+
+        Returns the path of the CSV file. Runs on demand only, so it
+        writes directly instead of going through the save writer.
+        """
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, time.strftime("frames-%Y%m%d-%H%M%S"))
+        columns = {name: self.samples(name) for name in self.columns}
+        with open(base + ".csv", 'w') as f:
+            f.write(",".join(self.columns) + "\n")
+            for row in zip(*columns.values()):
+                f.write(",".join(f"{value:.4f}" for value in row) + "\n")
+        with open(base + ".json", 'w') as f:
+            json.dump({'frames': self.count, 'summary': self.summary(), 'samples': columns}, f)
+        return base + ".csv"
+
+
+class ProfilerOverlay:
+    """F3 overlay: frame-time graphs, phase percentiles and entity counts.
+
+    Statistics are only recomputed every PROFILER_REFRESH seconds so the
+    labels stay in the text cache between refreshes.
+    """
+
+    def __init__(self, profiler):
+        self.profiler = profiler
+        self.lines = []
+        self.last_refresh = 0.0
+        self.dump_message = ""
+
+    def update(self):
+        now = time.perf_counter()
+        if now - self.last_refresh < PROFILER_REFRESH:
+            return
+        self.last_refresh = now
+        self.lines = []
+        for name in ('frame', 'update', 'draw') + UPDATE_PHASES + DRAW_PHASES:
+            stats = self.profiler.percentiles(name)
+            self.lines.append(
+                f"{name:<10} p50 {stats['p50']:6.2f}  p95 {stats['p95']:6.2f}  "
+                f"p99 {stats['p99']:6.2f}  max {stats['max']:6.2f} ms"
+            )
+        self.lines.append("entities   " + "  ".join(
+            f"{name} {int(self.profiler.current[name])}" for name in ENTITY_COUNTERS
+        ))
+        if self.dump_message:
+            self.lines.append(self.dump_message)
+
+    def draw_graph(self, name, left, bottom, width, height, color, scale_ms=FRAME_BUDGET_MS * 2):
+        """One line strip of the recent samples, with the 60 fps budget marked"""
+        values = self.profiler.samples(name)[-int(width):]
+        arcade.draw_lrbt_rectangle_filled(left, left + width, bottom, bottom + height, (0, 0, 0, 150))
+        budget_y = bottom + height * FRAME_BUDGET_MS / scale_ms
+        arcade.draw_line(left, budget_y, left + width, budget_y, (255, 255, 255, 90))
+        if len(values) > 1:
+            points = [
+                (left + i, bottom + min(height, height * value / scale_ms))
+                for i, value in enumerate(values)
+            ]
+            arcade.draw_line_strip(points, color)
+        draw_label(name, left + 4, bottom + height - 14, color, font_size=10, font_name="Arial")
+
+    def draw(self, left, top):
+        graph_width = min(PROFILER_HISTORY, 300)
+        self.draw_graph('frame', left, top - 60, graph_width, 60, arcade.color.LIGHT_GREEN)
+        self.draw_graph('update', left, top - 125, graph_width, 60, arcade.color.ORANGE, scale_ms=FRAME_BUDGET_MS / 2)
+        self.draw_graph('draw', left, top - 190, graph_width, 60, arcade.color.SKY_BLUE, scale_ms=FRAME_BUDGET_MS / 2)
+        y = top - 210
+        for line in self.lines:
+            draw_label(line, left, y, arcade.color.WHITE, font_size=10, font_name=("Consolas", "Courier New", "monospace"))
+            y -= 14
+
+
+frame_profiler = FrameProfiler()
+
+
+# Broad-phase grid cell size in pixels (about two enemy widths)
+COLLISION_CELL_SIZE = 128
+
+
+class SpatialHash:
+    """Uniform grid broad-phase for burgers (printers and enemies use
+    PrinterColumns and EnemyBands).
+
+    Each sprite is stored in every cell its bounding box touches, together
+    with a kind such as 'burger'. The box is a rotation-proof square
+    around the sprite center; moving sprites only touch the dict when they
+    cross into a new cell. Queries return nearby candidates for the precise
+    test.
+    Cells are kept per kind, so a query never sorts through other kinds.
+    Each entry also keeps the range of centers its cells stay valid for,
+    so re-bucketing a mover that did not cross a cell edge is one compare.
+    A sprite's box size is taken when it is added; re-add it after scaling.
+    """
+
+    def __init__(self, cell_size=COLLISION_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}    # (kind, cell_x, cell_y) -> set of sprites
+        # sprite -> [x0, y0, x1, y1, kind, radius, left, right, bottom, top], where
+        # left <= center_x < right and bottom <= center_y < top keep the same cells
+        self.entries = {}
+        self.kinds = set()
+
+    @staticmethod
+    def radius(sprite, margin=0):
+        # Half the diagonal is at most 0.71 times the longest side
+        return max(sprite.width, sprite.height) * 0.71 + margin
+
+    def cell_range(self, x, y, radius):
+        """Cells covered by a box around (x, y), as (x0, y0, x1, y1) inclusive"""
+        size = self.cell_size
+        return (
+            int((x - radius) // size),
+            int((y - radius) // size),
+            int((x + radius) // size),
+            int((y + radius) // size),
+        )
+
+    def place(self, entry, x0, y0, x1, y1):
+        """Store a sprite's cells in its entry, with the centers they stay valid for"""
+        size = self.cell_size
+        radius = entry[5]
+        entry[0], entry[1], entry[2], entry[3] = x0, y0, x1, y1
+        entry[6] = max(x0 * size + radius, x1 * size - radius)
+        entry[7] = min((x0 + 1) * size + radius, (x1 + 1) * size - radius)
+        entry[8] = max(y0 * size + radius, y1 * size - radius)
+        entry[9] = min((y0 + 1) * size + radius, (y1 + 1) * size - radius)
+
+    def insert_cells(self, sprite, kind, x0, y0, x1, y1):
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = self.cells.get((kind, cx, cy))
+                if cell is None:
+                    cell = self.cells[(kind, cx, cy)] = set()
+                cell.add(sprite)
+
+    def remove_cells(self, sprite, kind, x0, y0, x1, y1):
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = self.cells.get((kind, cx, cy))
+                if cell is not None:
+                    cell.discard(sprite)
+                    if not cell:
+                        del self.cells[(kind, cx, cy)]
+
+    def add(self, sprite, kind, margin=0):
+        """Insert a sprite; margin widens its box (e.g. for bouncing burgers)"""
+        if sprite in self.entries:
+            self.remove(sprite)
+        radius = self.radius(sprite, margin)
+        x, y = sprite.position
+        x0, y0, x1, y1 = self.cell_range(x, y, radius)
+        self.insert_cells(sprite, kind, x0, y0, x1, y1)
+        entry = self.entries[sprite] = [0, 0, 0, 0, kind, radius, 0.0, 0.0, 0.0, 0.0]
+        self.place(entry, x0, y0, x1, y1)
+        self.kinds.add(kind)
+        sprite.grid = self
+
+    def remove(self, sprite):
+        """Remove a sprite from the grid (no-op if it is not in it)"""
+        entry = self.entries.pop(sprite, None)
+        if entry is not None:
+            self.remove_cells(sprite, entry[4], entry[0], entry[1], entry[2], entry[3])
+        sprite.grid = None
+
+    def update(self, sprite):
+        """Re-bucket a sprite after it moved; cheap when it stays in its cells"""
+        self.update_all((sprite,))
+
+    def update_all(self, sprites):
+        """Re-bucket a list of movers, touching the cells only of those that changed cells"""
+        entries = self.entries
+        for sprite in sprites:
+            entry = entries.get(sprite)
+            if entry is None:
+                continue
+            x, y = sprite.position
+            if entry[6] <= x < entry[7] and entry[8] <= y < entry[9]:
+                continue
+            x0, y0, x1, y1 = self.cell_range(x, y, entry[5])
+            self.remove_cells(sprite, entry[4], entry[0], entry[1], entry[2], entry[3])
+            self.insert_cells(sprite, entry[4], x0, y0, x1, y1)
+            self.place(entry, x0, y0, x1, y1)
+
+    def query(self, sprite, kind=None):
+        """Sprites of a kind (or of any kind) whose cells overlap the given sprite's cells"""
+        x, y = sprite.position
+        x0, y0, x1, y1 = self.cell_range(x, y, self.radius(sprite))
+        cells = self.cells
+        found = set()
+        for each in (self.kinds if kind is None else (kind,)):
+            for cx in range(x0, x1 + 1):
+                for cy in range(y0, y1 + 1):
+                    cell = cells.get((each, cx, cy))
+                    if cell:
+                        found.update(cell)
+        found.discard(sprite)
+        return found
+
+    def check_for_collision(self, sprite, kind):
+        """Grid-accelerated arcade.check_for_collision_with_list"""
+        return [
+            other for other in self.query(sprite, kind)
+            if arcade.check_for_collision(sprite, other)
+        ]
+
+    def __len__(self):
+        return len(self.entries)
+
+
+ENEMY_BAND_HEIGHT = 64
+
+
+class EnemyBands:
+    """Enemies on their analytic paths, bucketed by horizontal band.
+
+    Enemies only fly sideways at a constant speed and spin at a constant
+    rate, so they are never stepped: where an enemy is at run time t
+    follows from its spawn time, start and velocities (Enemy.place).
+    Each enemy sits in every band its rotation-proof box touches. A
+    collision check looks only at the bands the player overlaps, and
+    only places the candidates whose analytic x is close enough. Exit
+    times are known at spawn and kept in a heap.
+    """
+
+    def __init__(self, band_height=ENEMY_BAND_HEIGHT):
+        self.band_height = band_height
+        self.bands = {}    # band -> set of enemies
+        self.entries = {}  # enemy -> [first band, last band, radius, serial]
+        self.exits = []    # Heap of (exit time, serial, enemy)
+        self.serial = 0    # Tells a reused enemy's old heap entries apart
+
+    def band_range(self, y, radius):
+        size = self.band_height
+        return int((y - radius) // size), int((y + radius) // size)
+
+    def add(self, enemy, now):
+        """Start an enemy on its path from its current position at run time now"""
+        if enemy in self.entries:
+            self.remove(enemy)
+        enemy.spawn_time = now
+        enemy.start_x = enemy.center_x
+        radius = max(enemy.width, enemy.height) * 0.71
+        first, last = self.band_range(enemy.center_y, radius)
+        for band in range(first, last + 1):
+            cell = self.bands.get(band)
+            if cell is None:
+                cell = self.bands[band] = set()
+            cell.add(enemy)
+        self.serial += 1
+        self.entries[enemy] = [first, last, radius, self.serial]
+        heapq.heappush(self.exits, (enemy.exit_time(), self.serial, enemy))
+        enemy.bands = self
+
+    def remove(self, enemy):
+        """Take an enemy off its path (no-op if it is not on one)"""
+        entry = self.entries.pop(enemy, None)
+        if entry is not None:
+            for band in range(entry[0], entry[1] + 1):
+                cell = self.bands.get(band)
+                if cell is not None:
+                    cell.discard(enemy)
+                    if not cell:
+                        del self.bands[band]
+        enemy.bands = None
+
+    def expire(self, now):
+        """Enemies that are completely off the field at run time now"""
+        expired = []
+        exits = self.exits
+        while exits and exits[0][0] <= now:
+            exit_time, serial, enemy = heapq.heappop(exits)
+            entry = self.entries.get(enemy)
+            if entry is not None and entry[3] == serial:
+                expired.append(enemy)
+        return expired
+
+    def check_for_collision(self, sprite, now):
+        """Enemies touching sprite at run time now"""
+        radius = max(sprite.width, sprite.height) * 0.71
+        first, last = self.band_range(sprite.center_y, radius)
+        candidates = set()
+        for band in range(first, last + 1):
+            cell = self.bands.get(band)
+            if cell:
+                candidates.update(cell)
+        hits = []
+        for enemy in candidates:
+            x = enemy.start_x + enemy.change_x * (now - enemy.spawn_time)
+            if abs(x - sprite.center_x) > radius + self.entries[enemy][2]:
+                continue
+            # Close enough for the precise hit box test
+            enemy.place(now)
+            if arcade.check_for_collision(sprite, enemy):
+                hits.append(enemy)
+        return hits
+
+    def __len__(self):
+        return len(self.entries)
+
+
+PRINTER_COLUMN_WIDTH = 64
+
+
+class PrinterColumns:
+    """Printers on their analytic paths, bucketed by vertical column.
+
+    Printers fall straight down at a constant speed, so where a printer is
+    at run time t follows from its spawn time, start and speed
+    (Printer.place) and it never changes column: there is no per-step
+    upkeep at all. A collision check looks only at the columns the player
+    overlaps, and only places the candidates whose analytic y is close
+    enough. Exit times are known at spawn and kept in a heap.
+    """
+
+    def __init__(self, column_width=PRINTER_COLUMN_WIDTH):
+        self.column_width = column_width
+        self.columns = {}  # column -> set of printers
+        self.entries = {}  # printer -> [first column, last column, half height, serial]
+        self.exits = []    # Heap of (exit time, serial, printer)
+        self.serial = 0    # Tells a reused printer's old heap entries apart
+
+    def column_range(self, x, half_width):
+        size = self.column_width
+        return int((x - half_width) // size), int((x + half_width) // size)
+
+    def add(self, printer, now):
+        """Start a printer on its path from its current position at run time now"""
+        if printer in self.entries:
+            self.remove(printer)
+        printer.spawn_time = now
+        printer.start_y = printer.center_y
+        first, last = self.column_range(printer.center_x, printer.width / 2)
+        for column in range(first, last + 1):
+            cell = self.columns.get(column)
+            if cell is None:
+                cell = self.columns[column] = set()
+            cell.add(printer)
+        self.serial += 1
+        self.entries[printer] = [first, last, printer.height / 2, self.serial]
+        heapq.heappush(self.exits, (printer.exit_time(), self.serial, printer))
+        printer.columns = self
+
+    def remove(self, printer):
+        """Take a printer off its path (no-op if it is not on one)"""
+        entry = self.entries.pop(printer, None)
+        if entry is not None:
+            for column in range(entry[0], entry[1] + 1):
+                cell = self.columns.get(column)
+                if cell is not None:
+                    cell.discard(printer)
+                    if not cell:
+                        del self.columns[column]
+        printer.columns = None
+
+    def expire(self, now):
+        """Printers that have fallen off the field at run time now"""
+        expired = []
+        exits = self.exits
+        while exits and exits[0][0] <= now:
+            exit_time, serial, printer = heapq.heappop(exits)
+            entry = self.entries.get(printer)
+            if entry is not None and entry[3] == serial:
+                expired.append(printer)
+        return expired
+
+    def check_for_collision(self, sprite, now):
+        """Printers touching sprite at run time now"""
+        radius = max(sprite.width, sprite.height) * 0.71
+        first, last = self.column_range(sprite.center_x, radius)
+        candidates = set()
+        for column in range(first, last + 1):
+            cell = self.columns.get(column)
+            if cell:
+                candidates.update(cell)
+        hits = []
+        for printer in candidates:
+            y = printer.start_y + printer.change_y * (now - printer.spawn_time)
+            if abs(y - sprite.center_y) > radius + self.entries[printer][2]:
+                continue
+            # Close enough for the precise hit box test
+            printer.place(now)
+            if arcade.check_for_collision(sprite, printer):
+                hits.append(printer)
+        return hits
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class KinematicsBatch:
+    """Structure-of-arrays motion state for all entities of one type"""
+
+    COLUMNS = ('x', 'y', 'vx', 'vy', 'angle', 'omega', 'phase', 'origin_y',
+               'half_width', 'half_height', 'age', 'prev_x', 'prev_y', 'prev_angle')
+
+    def __init__(self, capacity=64):
+        self.sprites = []
+        self.capacity = capacity
+        for name in self.COLUMNS:
+            setattr(self, name, np.zeros(capacity))
+
+    def __len__(self):
+        return len(self.sprites)
+
+    def grow(self):
+        """Double the capacity of every column"""
+        self.capacity *= 2
+        for name in self.COLUMNS:
+            column = np.zeros(self.capacity)
+            old = getattr(self, name)
+            column[:len(old)] = old
+            setattr(self, name, column)
+
+    def add(self, sprite):
+        """Copy a sprite's motion state into the next free row"""
+        if len(self.sprites) == self.capacity:
+            self.grow()
+        row = len(self.sprites)
+        self.sprites.append(sprite)
+        self.x[row] = sprite.center_x
+        self.y[row] = sprite.center_y
+        self.vx[row] = sprite.change_x
+        self.vy[row] = sprite.change_y
+        self.angle[row] = sprite.angle
+        self.omega[row] = getattr(sprite, 'rotation_speed', 0.0)
+        self.phase[row] = getattr(sprite, 'bounce_timer', 0.0)
+        self.origin_y[row] = getattr(sprite, 'original_y', sprite.center_y)
+        self.half_width[row] = sprite.width / 2
+        self.half_height[row] = sprite.height / 2
+        self.age[row] = 0.0
+        self.prev_x[row] = self.x[row]
+        self.prev_y[row] = self.y[row]
+        self.prev_angle[row] = self.angle[row]
+        sprite.kinematics_row = row
+
+    def remove(self, sprite):
+        """Swap-remove a sprite's row"""
+        row = sprite.kinematics_row
+        last = len(self.sprites) - 1
+        if row != last:
+            moved = self.sprites[last]
+            self.sprites[row] = moved
+            moved.kinematics_row = row
+            for name in self.COLUMNS:
+                column = getattr(self, name)
+                column[row] = column[last]
+        self.sprites.pop()
 
-WINDOW_WIDTH = 1280
-WINDOW_HEIGHT = 720
-WINDOW_TITLE = "Sprite Change Coins"
+    def save_previous(self):
+        """Remember the current state as the start of the next step"""
+        n = len(self.sprites)
+        self.prev_x[:n] = self.x[:n]
+        self.prev_y[:n] = self.y[:n]
+        self.prev_angle[:n] = self.angle[:n]
 
-HIGHSCORE_FILE = "data/saves/highscore.json"
+    def place(self, sprites, near=None):
+        """Put some of the sprites exactly where the current step has them.
 
-def load_highscore():
-    """Load highscore from file, return 0 if file doesn't exist"""
-    
-    try:
-        if os.path.exists(HIGHSCORE_FILE):
-            with open(HIGHSCORE_FILE, 'r') as f:
-                data = json.load(f)
-                return data.get('highscore', 0)
-        return 0
-    except:
-        return 0
+        With near (a sprite), the ones too far away to touch it are skipped.
+        Returns the sprites placed, in the order given.
+        """
+        sprites = list(sprites)
+        if not sprites:
+            return sprites
+        rows = np.fromiter((sprite.kinematics_row for sprite in sprites), dtype=np.intp, count=len(sprites))
+        xs = self.x[rows]
+        ys = self.y[rows]
+        if near is not None:
+            # Same rotation-proof radius as the collision grid
+            reach = np.maximum(self.half_width[rows], self.half_height[rows]) * 1.42
+            reach += max(near.width, near.height) * 0.71
+            close = ((np.abs(xs - near.center_x) <= reach) &
+                     (np.abs(ys - near.center_y) <= reach))
+            keep = np.flatnonzero(close).tolist()
+            sprites = [sprites[i] for i in keep]
+            xs = xs[keep]
+            ys = ys[keep]
+        for sprite, x, y in zip(sprites, xs.tolist(), ys.tolist()):
+            sprite.position = (x, y)
+        return sprites
 
-def save_highscore(score):
-    """Save highscore to file"""
-    try:
-        data = {'highscore': score}
-        with open(HIGHSCORE_FILE, 'w') as f:
-            json.dump(data, f)
-    except:
-        pass  # Silently fail if we can't save
+    def push_positions(self, with_angle=False):
+        """Write the simulated state back to the sprites in one pass"""
+        n = len(self.sprites)
+        self.push(self.x[:n], self.y[:n], self.angle[:n] if with_angle else None)
 
-# Shop data file
-SHOP_DATA_FILE = "data/saves/shop_data.json"
+    def push(self, xs, ys, angles=None):
+        if angles is not None:
+            for sprite, x, y, angle in zip(self.sprites, xs.tolist(), ys.tolist(), angles.tolist()):
+                sprite.position = (x, y)
+                sprite.angle = angle
+        else:
+            for sprite, x, y in zip(self.sprites, xs.tolist(), ys.tolist()):
+                sprite.position = (x, y)
 
-def load_shop_data():
-    """Load shop data from file"""
-    try:
-        if os.path.exists(SHOP_DATA_FILE):
-            with open(SHOP_DATA_FILE, 'r') as f:
-                return json.load(f)
-        # Default shop data
-        return {
-            'coins': 50,
-            'purchased_items': [],
-            'equipped_skin': 'normal'  # 'normal' or 'shiny'
+    def interpolate(self, alpha, with_angle=False):
+        """Place the sprites alpha of the way from the previous step to the current one"""
+        n = len(self.sprites)
+        if not n:
+            return
+        x = self.prev_x[:n] + (self.x[:n] - self.prev_x[:n]) * alpha
+        y = self.prev_y[:n] + (self.y[:n] - self.prev_y[:n]) * alpha
+        angle = None
+        if with_angle:
+            angle = self.prev_angle[:n] + (self.angle[:n] - self.prev_angle[:n]) * alpha
+        self.push(x, y, angle)
+
+
+class KinematicsEngine:
+    """Vectorized replacement for Collectable.update.
+
+    Each entity type lives in its own KinematicsBatch; step() advances a
+    whole batch with a few NumPy operations. The sprites themselves are
+    only written by interpolate() once per drawn frame; collision places
+    just the candidates it tests (place()). Printers and enemies are not
+    stepped at all (see PrinterColumns and EnemyBands).
+    """
+
+    def __init__(self):
+        self.batches = {
+            'burger': KinematicsBatch(),
         }
-    except:
+
+    def add(self, sprite, kind):
+        self.batches[kind].add(sprite)
+        sprite.kinematics = self.batches[kind]
+
+    def remove(self, sprite):
+        if sprite.kinematics is not None:
+            sprite.kinematics.remove(sprite)
+            sprite.kinematics = None
+
+    def step(self, delta_time):
+        """Advance every batch by delta_time"""
+        for batch in self.batches.values():
+            batch.save_previous()
+
+        # Burgers: bounce around their spawn height
+        burgers = self.batches['burger']
+        n = len(burgers)
+        if n:
+            phase = burgers.phase[:n]
+            phase += delta_time
+            burgers.age[:n] += delta_time
+            burgers.y[:n] = burgers.origin_y[:n] + np.sin(phase * 3.0) * BURGER_BOUNCE_HEIGHT
+
+    def place(self, sprites, kind, near=None):
+        """Put the given sprites of one kind where the current step has them"""
+        return self.batches[kind].place(sprites, near)
+
+    def sync(self):
+        """Put every sprite exactly where the current step has it"""
+        for batch in self.batches.values():
+            batch.push_positions()
+
+    def interpolate(self, alpha):
+        """Move every sprite to its render position between the last two steps"""
+        self.batches['burger'].interpolate(alpha)
+
+
+class SpritePool:
+    """Fixed-capacity free list of reusable sprites of one class.
+
+    acquire() hands out a free sprite reset to fresh state (or creates one
+    when the pool is empty), release() takes it off every sprite list and
+    keeps it for the next spawn as long as the pool is below capacity.
+    """
+
+    def __init__(self, sprite_class, capacity):
+        self.sprite_class = sprite_class
+        self.capacity = capacity
+        self.free = []
+
+        # Stats
+        self.allocated = 0
+        self.in_use = 0
+        self.high_water = 0
+
+    def prefill(self, count=None):
+        """Allocate sprites up front so spawning never has to"""
+        count = self.capacity if count is None else min(count, self.capacity)
+        while len(self.free) + self.in_use < count:
+            self.free.append(self.create())
+
+    def create(self):
+        sprite = self.sprite_class()
+        sprite.pool = self
+        sprite.in_pool = True
+        self.allocated += 1
+        return sprite
+
+    def acquire(self, *args, **kwargs):
+        """Get a sprite, reset with the given constructor arguments"""
+        sprite = self.free.pop() if self.free else self.create()
+        sprite.reset(*args, **kwargs)
+        # Arcade only takes the hit box from a sprite's first texture, so a
+        # reused sprite whose reset picked another texture needs it resynced
+        sprite.sync_hit_box_to_texture()
+        sprite.in_pool = False
+        self.in_use += 1
+        self.high_water = max(self.high_water, self.in_use)
+        return sprite
+
+    def release(self, sprite):
+        """Take a sprite off the field and return it to the pool"""
+        if sprite.in_pool:
+            return  # Already released this frame
+        sprite.remove_from_sprite_lists()
+        sprite.in_pool = True
+        self.in_use -= 1
+        if len(self.free) < self.capacity:
+            self.free.append(sprite)
+
+    def stats(self):
+        """Snapshot of the pool counters"""
         return {
-            'coins': 50,
-            'purchased_items': [],
-            'equipped_skin': 'normal'
+            'allocated': self.allocated,
+            'in_use': self.in_use,
+            'free': len(self.free),
+            'high_water': self.high_water,
         }
 
-def save_shop_data(shop_data):
-    """Save shop data to file"""
-    try:
-        with open(SHOP_DATA_FILE, 'w') as f:
-            json.dump(shop_data, f)
-    except:
-        pass  # Silently fail if we can't save
+
+class PooledSprite(arcade.Sprite):
+    """Sprite that goes back to its pool instead of being thrown away"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool = None
+        self.in_pool = False
+        self.grid = None
+        self.kinematics = None
+
+    def despawn(self):
+        """Remove from the field, recycling the sprite when it is pooled"""
+        if self.grid is not None:
+            self.grid.remove(self)
+        if self.kinematics is not None:
+            self.kinematics.remove(self)
+            self.kinematics = None
+        if self.pool is not None:
+            self.pool.release(self)
+        else:
+            self.remove_from_sprite_lists()
 
 
-class Collectable(arcade.Sprite):
+class Collectable(PooledSprite):
     """ This class represents something the player collects. """
 
-    def __init__(self, scale):
+    def __init__(self, scale=SPRITE_SCALING, rng=random):
         super().__init__(scale=scale)
-        # Flip this once the coin has been collected.
-        self.changed = False
-        
         # Setup burger animation
         self.setup_burger_animation()
-        self.animation_timer = random.uniform(0, 0.4)  # Random start for variety
-        self.animation_speed = random.uniform(0.25, 0.35)  # Varied animation speed
+        self.reset(scale, rng)
+
+    def reset(self, scale=SPRITE_SCALING, rng=random):
+        """Reset per-instance state so the burger can be reused"""
+        self.angle = 0
+        self.scale = scale
+        self.change_x = 0
+        self.change_y = 0
+
+        self.animation_timer = rng.uniform(0, 0.4)  # Random start for variety
+        self.animation_speed = rng.uniform(0.25, 0.35)  # Varied animation speed
         self.current_frame = 0
         
         # Bounce animation
-        self.bounce_timer = random.uniform(0, 6.28)  # Random start phase
-        self.bounce_speed = random.uniform(2.5, 3.5)  # Bounce frequency
-        self.bounce_height = random.uniform(8, 15)  # Bounce amplitude
+        self.bounce_timer = rng.uniform(0, 6.28)  # Random start phase
+        self.bounce_speed = rng.uniform(2.5, 3.5)  # Bounce frequency
+        self.bounce_height = rng.uniform(8, 15)  # Bounce amplitude
         self.original_y = 0  # Will be set when positioned
+        self.slot = None  # SpawnPlacer slot it was placed in
         
         # Scale pulsing
-        self.pulse_timer = random.uniform(0, 6.28)
-        self.pulse_speed = random.uniform(4.0, 6.0)
+        self.pulse_timer = rng.uniform(0, 6.28)
+        self.pulse_speed = rng.uniform(4.0, 6.0)
         self.base_scale = scale
-        self.pulse_amount = random.uniform(0.1, 0.2)  # 10-20% size variation
+        self.pulse_amount = rng.uniform(0.1, 0.2)  # 10-20% size variation
         
     def setup_burger_animation(self):
         """Setup burger texture"""
-        # Load the single burger image
-        burger_texture = arcade.load_texture("assets/images/sprites/wario/normal/burger.png")
+        # Get the single burger image from the shared cache
+        burger_texture = assets.texture(BURGER_TEXTURE_PATH)
         
         # Create animation frames list with just one frame
         self.animation_frames = [burger_texture]
@@ -106,82 +2407,423 @@ class Collectable(arcade.Sprite):
         """Update burger animation with multiple effects"""
         super().update()
         
-        # Only animate if not collected yet - simplified for performance
-        if not self.changed:
-            # Simple bounce animation only (removed complex pulsing)
-            self.bounce_timer += delta_time
-            bounce_offset = math.sin(self.bounce_timer * 3.0) * 10  # Fixed values for better performance
-            self.center_y = self.original_y + bounce_offset
-        else:
-            # Simplified Collection Effect for better performance
-            self.collection_timer = getattr(self, 'collection_timer', 0.0) + delta_time
-            
-            # Single phase: Quick scale and spin effect
-            if self.collection_timer < 0.5:
-                # Simple scale burst
-                scale_factor = 1.0 + (self.collection_timer * 4.0)
-                self.scale = self.base_scale * scale_factor
-                
-                # Simple spinning
-                self.angle += delta_time * 720  # 2 rotations per second
-                
-                # Move upward
-                self.center_y += delta_time * 100
-            else:
-                # Final fade out phase
-                fade_factor = 1.0 - ((self.collection_timer - 0.5) / 0.5)
-                self.scale = self.base_scale * max(0.1, fade_factor)
-                self.center_y += delta_time * 50
+        # Simple bounce animation only (the collection effect is a particle burst)
+        self.bounce_timer += delta_time
+        bounce_offset = math.sin(self.bounce_timer * 3.0) * BURGER_BOUNCE_HEIGHT  # Fixed values for better performance
+        self.center_y = self.original_y + bounce_offset
 
 
-class Enemy(arcade.Sprite):
+class Enemy(PooledSprite):
     """Enemy sprite that moves horizontally across screen"""
     
-    def __init__(self, scale, direction, window_width=1280, speed_multiplier=1.0):
+    def __init__(self, scale=1.0, direction=1, window_width=1280, speed_multiplier=1.0, rng=random):
         super().__init__(scale=scale)
+        self.bands = None     # EnemyBands it is on
+        self.renderer = None  # EnemyRenderer drawing it
+        self.render_slot = 0
+        self.spawn_time = 0.0
+        self.start_x = 0.0
+        self.reset(scale, direction, window_width, speed_multiplier, rng)
+
+    def reset(self, scale=1.0, direction=1, window_width=1280, speed_multiplier=1.0, rng=random):
+        """Reset per-instance state so the enemy can be reused"""
         self.direction = direction  # 1 for right, -1 for left
         self.window_width = window_width  # Store window width for boundary checking
         self.speed_multiplier = speed_multiplier  # Difficulty scaling
         
-        # Load random food texture from food folder
-        food_files = [
-            "01_Cherry_Red.png", "02_Cherry_Black.png", "03_Cranberry.png",
-            "04_Cucumber.png", "05_CustardApple.png", "06_Plum.png", 
-            "07_Dragonfruit.png", "10_Grapes_Black.png", "11_Grapes_Green.png",
-            "12_Grapefruit.png", "13_Guava.png", "14_Kiwi.png", "15_Lemon.png",
-            "16_Apple.png", "19_Peach.png", "20_Passionfruit.png", "21_Apricot.png",
-            "22_Strawberry.png", "23_Watermelon.png", "24_Melon.png"
-        ]
-        
-        # Choose random food sprite
-        random_food = random.choice(food_files)
+        # Choose random food sprite (textures come from the shared cache)
+        random_food = rng.choice(FOOD_TEXTURE_PATHS)
         try:
-            self.texture = arcade.load_texture(f"assets/images/sprites/food/{random_food}")
+            self.texture = assets.texture(random_food)
+            self.texture_index = ENEMY_TEXTURE_PATHS.index(random_food)
         except:
             # Fallback to Wario sprite if food sprite fails to load
-            self.texture = arcade.load_texture("assets/images/sprites/wario/normal/Run1Wario.png")
+            self.texture = assets.texture(FALLBACK_ENEMY_TEXTURE_PATH)
+            self.texture_index = ENEMY_TEXTURE_PATHS.index(FALLBACK_ENEMY_TEXTURE_PATH)
+        self.scale = scale
+        self.angle = 0
         
-        # Set horizontal speed (original settings)
-        self.speed = random.uniform(3.0, 6.0) * self.speed_multiplier  # Original speed range
+        # Set horizontal speed in pixels per second (3-6 px per 60 Hz frame originally)
+        self.speed = rng.uniform(180.0, 360.0) * self.speed_multiplier
         self.change_x = self.speed * self.direction
+        self.change_y = 0
         
         # Set rotation speed (random spin speed)
-        self.rotation_speed = random.uniform(-5.0, 5.0)  # Random rotation between -5 and 5 degrees per frame
-        
-    def update(self, delta_time=1/60):
-        super().update()
+        self.rotation_speed = rng.uniform(-300.0, 300.0)  # Degrees per second
         
-        # Rotate the food sprite
-        self.angle += self.rotation_speed
-        
-        # Remove enemy when it goes completely off screen using stored window width
-        if self.direction > 0 and self.left > self.window_width + 50:  # Moving right, completely off right edge
-            self.remove_from_sprite_lists()
-        elif self.direction < 0 and self.right < -50:  # Moving left, completely off left edge
-            self.remove_from_sprite_lists()
+    def place(self, now):
+        """Move and turn the sprite to where its path puts it at run time now"""
+        age = now - self.spawn_time
+        self.position = (self.start_x + self.change_x * age, self.center_y)
+        self.angle = self.rotation_speed * age
+
+    def exit_time(self):
+        """Run time at which the enemy is completely past the far edge (50 px margin)"""
+        half_width = self.width / 2
+        if self.direction > 0:
+            distance = self.window_width + 50 + half_width - self.start_x
+        else:
+            distance = self.start_x + half_width + 50
+        return self.spawn_time + distance / self.speed
+
+    def despawn(self):
+        if self.bands is not None:
+            self.bands.remove(self)
+        if self.renderer is not None:
+            self.renderer.remove(self)
+        super().despawn()
+
+
+class Printer(PooledSprite):
+    """Printer that falls from the top of the screen"""
+
+    def __init__(self, scale=1.0, rng=random):
+        super().__init__(assets.texture(PRINTER_TEXTURE_PATH))
+        self.columns = None  # PrinterColumns it is on
+        self.spawn_time = 0.0
+        self.start_y = 0.0
+        self.reset(scale, rng)
+
+    def reset(self, scale=1.0, rng=random):
+        """Reset per-instance state so the printer can be reused"""
+        self.scale = scale
+        self.angle = 0
+        self.change_x = 0
+        self.change_y = 0
+
+    def place(self, now):
+        """Move the sprite to where its fall puts it at run time now"""
+        self.center_y = self.start_y + self.change_y * (now - self.spawn_time)
+
+    def exit_time(self):
+        """Run time at which the printer's bottom is 50 px below the field"""
+        if self.change_y >= 0:
+            return math.inf
+        return self.spawn_time + (self.start_y - self.height / 2 + 50) / -self.change_y
+
+    def despawn(self):
+        if self.columns is not None:
+            self.columns.remove(self)
+        super().despawn()
+
+
+# Entity pools shared across runs, sized for a busy late game
+collectable_pool = SpritePool(Collectable, capacity=256)
+enemy_pool = SpritePool(Enemy, capacity=96)
+printer_pool = SpritePool(Printer, capacity=32)
+ENTITY_POOLS = {
+    'burgers': collectable_pool,
+    'enemies': enemy_pool,
+    'printers': printer_pool,
+}
+
+
+# Background loading behind the start screen
+PRELOAD_WORKERS = 2
+PRELOAD_FRAME_BUDGET = 0.004  # Seconds of main-thread work (GL uploads, pool fills) per frame
+PRELOAD_POOL_CHUNK = 8        # Pooled sprites allocated per step
+BUMPER_TEXTURE_PATH = ":resources:images/pinball/bumper.png"
+# Title screen first so the start screen fills in as early as possible. Only
+# the equipped skin's spritesheets are added, so more skins cost nothing here.
+PRELOAD_PATHS = list(dict.fromkeys(
+    [TITLESCREEN_PATH] + GAMEPLAY_ASSET_PATHS + GAMEPLAY_ATLAS_PATHS
+    + [PLAYER_HITBOX_SHEET_PATH, BUMPER_TEXTURE_PATH]
+))
+# The bundle holds every skin
+BUNDLE_PATHS = list(dict.fromkeys(
+    PRELOAD_PATHS + [path for skin in SKINS for path in skin_sheet_paths(skin)]
+))
+
+
+class AssetPreloader:
+    """Warms the asset cache, gameplay atlas and sprite pools behind the start screen.
+
+    Worker threads decode the PNGs and sounds (AssetManager.load creates
+    no GL objects). Everything else runs on the main thread in update(),
+    a few milliseconds per frame: decoded assets go into the cache, their
+    textures and the player animation frames are uploaded to the gameplay
+    atlas, and finally the equipped skin's animation set is built and the
+    sprite pools are filled. finish() does whatever is left in one go.
+    """
+
+    def __init__(self, paths=PRELOAD_PATHS, workers=PRELOAD_WORKERS):
+        self.paths = paths
+        self.workers = workers
+        self.results = Queue()  # (path, asset or None, size) from the workers
+        self.executor = None
+        self.started = False
+        self.done = False
+        self.decode_total = 0
+        self.decoded = 0
+        self.steps = deque()    # Main-thread work; a step returns True when it is finished
+        self.tail_queued = False
+        self.failed = []
+
+        # Progress in units of work (one per decode, upload or pool chunk)
+        self.total_units = 1
+        self.done_units = 0
+
+    def start(self):
+        """Start decoding on the worker threads (once)"""
+        if self.started:
+            return
+        self.started = True
+        self.skin = get_profile().equipped_skin
+        paths = list(dict.fromkeys(self.paths + skin_sheet_paths(self.skin)))
+        pending = [path for path in paths if path not in assets.entries]
+        self.decode_total = len(pending)
+        self.total_units = self.decode_total + sum(self.upload_units(path) for path in pending) + 2
+        for pool in ENTITY_POOLS.values():
+            missing = max(pool.capacity - len(pool.free) - pool.in_use, 0)
+            self.total_units += -(-missing // PRELOAD_POOL_CHUNK)
+        if pending:
+            self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="preload")
+            for path in pending:
+                self.executor.submit(self.decode, path)
+
+    def decode(self, path):
+        """Worker thread: decode one file"""
+        try:
+            asset, size = assets.load(path)
+        except:
+            asset, size = None, 0  # Missing or undecodable, the game falls back at the point of use
+        self.results.put((path, asset, size))
+
+    def upload_units(self, path):
+        return 1 if path in GAMEPLAY_ATLAS_PATHS else 0
+
+    def collect(self, block=False):
+        """Move decoded assets into the cache and queue their uploads"""
+        while self.decoded < self.decode_total:
+            try:
+                path, asset, size = self.results.get(block=block)
+            except Empty:
+                return
+            block = False
+            self.decoded += 1
+            self.done_units += 1
+            if asset is None:
+                self.failed.append(path)
+                self.done_units += self.upload_units(path)
+                continue
+            assets.put(path, asset, size)
+            if path in GAMEPLAY_ATLAS_PATHS:
+                self.steps.append(lambda texture=asset: self.upload(texture))
+
+        if not self.tail_queued:
+            # Animations, pools and burger slots last: they want the cached textures
+            self.tail_queued = True
+            self.steps.append(self.build_animations)
+            for pool in ENTITY_POOLS.values():
+                self.steps.append(lambda pool=pool: self.fill_pool(pool))
+            self.steps.append(self.build_burger_slots)
+
+    def upload(self, texture):
+        try:
+            get_gameplay_atlas(fill=False).add(texture)
+        except:
+            pass  # A full or broken atlas only costs the later batching
+        return True
+
+    def build_animations(self):
+        """Crop the equipped skin's frames and upload them"""
+        for texture in get_animation_set(self.skin).textures():
+            self.upload(texture)
+        return True
+
+    def build_burger_slots(self):
+        """Lay out the burger slots for the field size"""
+        try:
+            width, height = get_virtual_screen().size
+            get_burger_slots(int(width), int(height))
+        except:
+            pass  # No window; the first run builds them instead
+        return True
+
+    def fill_pool(self, pool):
+        pool.prefill(len(pool.free) + pool.in_use + PRELOAD_POOL_CHUNK)
+        return len(pool.free) + pool.in_use >= pool.capacity
+
+    def run_steps(self, budget):
+        deadline = time.perf_counter() + budget
+        while self.steps:
+            if self.steps[0]():
+                self.steps.popleft()
+            self.done_units += 1
+            if time.perf_counter() >= deadline:
+                break
+        if self.tail_queued and not self.steps:
+            self.done = True
+            self.done_units = self.total_units
+            if self.executor is not None:
+                self.executor.shutdown(wait=False)
+
+    def update(self, budget=PRELOAD_FRAME_BUDGET):
+        """Main thread, once per frame: do up to `budget` seconds of work; True when all is ready"""
+        if not self.started or self.done:
+            return self.done
+        self.collect()
+        self.run_steps(budget)
+        return self.done
+
+    def finish(self):
+        """Load everything still missing right now (the game is starting)"""
+        self.start()
+        while not self.done:
+            self.collect(block=True)
+            self.run_steps(float('inf'))
+
+    @property
+    def progress(self):
+        """Fraction of the work done, 0.0 to 1.0"""
+        return min(self.done_units / max(self.total_units, 1), 1.0)
+
+
+asset_preloader = AssetPreloader()
+
+
+# Sound effects. max_voices caps how many copies play at once, priority
+# decides who loses a voice when all of them are busy.
+MIXER_VOICES = 8
+SOUND_RATE_LIMIT = 0.03  # Seconds; the same effect started again within this is dropped
+SOUND_EFFECTS = {
+    'collect': {'path': COLLECT_SOUND_PATH, 'max_voices': 3, 'priority': 1, 'volume': 1.0},
+    'die': {'path': DIE_SOUND_PATH, 'max_voices': 1, 'priority': 2, 'volume': 1.0},
+}
+
+
+class Voice:
+    """One reusable pyglet player and the effect it is playing"""
+
+    def __init__(self):
+        self.player = None
+        self.effect = None
+        self.priority = 0
+        self.started = 0.0
+        self.ends = 0.0
+
+    def busy(self, now):
+        return now < self.ends
+
+    def start(self, name, sound, effect, now):
+        if self.player is None:
+            self.player = media.Player()
+        player = self.player
+        if self.effect == name and player.source is not None:
+            player.seek(0.0)  # Same effect still queued: just rewind
+        else:
+            if player.source is not None:
+                player.next_source()  # Drop whatever was playing
+            player.queue(sound.source)
+        player.volume = effect['volume']
+        player.play()
+        self.effect = name
+        self.priority = effect['priority']
+        self.started = now
+        self.ends = now + sound.get_length()
+
+    def stop(self):
+        if self.player is not None:
+            self.player.pause()
+        self.ends = 0.0
+
+
+class AudioMixer:
+    """Plays the SOUND_EFFECTS on a fixed pool of voices.
+
+    Sounds are decoded once and stay pinned in the asset cache. play()
+    looks at every voice once, so its cost does not depend on how often
+    it is called: an effect started again within SOUND_RATE_LIMIT is
+    dropped, an effect at its max_voices restarts its oldest voice, and
+    when every voice is busy the oldest voice of the lowest priority not
+    above the new effect's is stolen (otherwise the new effect is dropped).
+    """
+
+    def __init__(self, voices=MIXER_VOICES, effects=SOUND_EFFECTS):
+        self.effects = effects
+        self.voices = [Voice() for i in range(voices)]
+        self.sounds = {}      # name -> arcade.Sound (None if it failed to load)
+        self.last_start = {}  # name -> time it was last started
+
+        # Stats
+        self.played = 0
+        self.limited = 0
+        self.stolen = 0
+        self.dropped = 0
+
+    def load(self):
+        """Decode every effect once (later calls are free)"""
+        for name, effect in self.effects.items():
+            if name in self.sounds:
+                continue
+            try:
+                self.sounds[name] = assets.acquire(effect['path'])
+            except:
+                self.sounds[name] = None  # Missing or undecodable: the effect stays silent
+
+    def play(self, name, now=None):
+        """Start an effect if the limits allow it; returns the voice or None"""
+        if name not in self.sounds:
+            self.load()
+        sound = self.sounds.get(name)
+        if sound is None:
+            return None
+        effect = self.effects[name]
+        now = time.perf_counter() if now is None else now
+        if now - self.last_start.get(name, float('-inf')) < SOUND_RATE_LIMIT:
+            self.limited += 1
+            return None
+
+        same = []
+        free = None
+        victim = None
+        for voice in self.voices:
+            if not voice.busy(now):
+                # Prefer a free voice that already has this sound queued
+                if free is None or (voice.effect == name and free.effect != name):
+                    free = voice
+            elif voice.effect == name:
+                same.append(voice)
+            elif voice.priority <= effect['priority'] and (
+                    victim is None or (voice.priority, voice.started) < (victim.priority, victim.started)):
+                victim = voice
+
+        if len(same) >= effect['max_voices']:
+            voice = min(same, key=lambda v: v.started)
+            self.stolen += 1
+        elif free is not None:
+            voice = free
+        elif victim is not None:
+            voice = victim
+            self.stolen += 1
+        else:
+            self.dropped += 1
+            return None
 
+        voice.start(name, sound, effect, now)
+        self.last_start[name] = now
+        self.played += 1
+        return voice
 
-class StartView(arcade.View):
+    def stop_all(self):
+        for voice in self.voices:
+            voice.stop()
+
+    def stats(self):
+        """Snapshot of the mixer counters"""
+        return {
+            'played': self.played,
+            'limited': self.limited,
+            'stolen': self.stolen,
+            'dropped': self.dropped,
+            'busy': sum(1 for voice in self.voices if voice.busy(time.perf_counter())),
+        }
+
+
+audio_mixer = AudioMixer()
+
+
+class StartView(ScreenView):
     """Start screen with titlescreen image"""
     
     def __init__(self):
@@ -190,30 +2832,70 @@ class StartView(arcade.View):
         
         # Create sprite list for titlescreen
         self.titlescreen_list = arcade.SpriteList()
-        
-        # Load the titlescreen image
+        self.titlescreen_sprite = None
+
+        # Decode everything the game needs while this screen is up
+        asset_preloader.start()
+        self.titlescreen_pending = True
+
+        # Shared player profile (already in memory, no file I/O)
+        self.profile = get_profile()
+
+        # Known in memory (saved or queued this session, or found at startup)
+        self.has_replay = LAST_REPLAY_FILE in get_saved_replays()
+
+        # Nothing on the start screen animates, so it is rendered once
+        self.static_layer = StaticLayer(self.window, self.background_color)
+        self.load_titlescreen()
+
+    def load_titlescreen(self):
+        """Show the titlescreen once the preloader has decoded it"""
+        if TITLESCREEN_PATH not in assets.entries and not asset_preloader.done:
+            return
+        self.titlescreen_pending = False
         try:
-            self.titlescreen_sprite = arcade.Sprite("assets/images/titlescreen/titlescreen.png")
+            self.titlescreen_sprite = arcade.Sprite(assets.texture(TITLESCREEN_PATH))
             self.titlescreen_list.append(self.titlescreen_sprite)
         except:
-            # If loading fails, create empty list
+            # If loading fails, keep the empty list
             self.titlescreen_sprite = None
-            
-        # Load highscore
-        self.highscore = load_highscore()
-        
-        # Load shop data
-        self.shop_data = load_shop_data()
-        
+        self.static_layer.invalidate()
 
-    
-    def on_draw(self):
+    def on_resize(self, width, height):
+        """Re-render the cached screen at the new size"""
+        self.static_layer.invalidate()
+
+    def draw(self):
         """Draw the start screen"""
         self.clear()
-        
+        text_cache.begin_frame()
+        self.static_layer.draw(self.draw_static)
+        if not asset_preloader.done:
+            self.draw_loading_bar()
+
+    def draw_loading_bar(self):
+        """Progress of the background preloader along the bottom edge"""
+        width = 300
+        left = self.width // 2 - width // 2
+        bottom = 30
+        arcade.draw_lrbt_rectangle_filled(left, left + width * asset_preloader.progress,
+                                          bottom, bottom + 8, arcade.color.LIGHT_BLUE)
+        arcade.draw_lrbt_rectangle_outline(left, left + width, bottom, bottom + 8, arcade.color.WHITE, 1)
+        draw_label(
+            "Loading...",
+            self.width // 2,
+            bottom + 16,
+            arcade.color.LIGHT_GRAY,
+            font_size=12,
+            anchor_x="center",
+            font_name="Arial"
+        )
+
+    def draw_static(self):
+        """Draw the titlescreen, stats and shop button"""
         # Get dynamic screen center (works with fullscreen and different window sizes)
-        center_x = self.window.width // 2
-        center_y = self.window.height // 2
+        center_x = self.width // 2
+        center_y = self.height // 2
         
         # Update titlescreen position and scale dynamically
         if self.titlescreen_sprite:
@@ -221,8 +2903,8 @@ class StartView(arcade.View):
             self.titlescreen_sprite.center_y = center_y
             
             # Scale to fit current window size while maintaining aspect ratio
-            scale_x = self.window.width / self.titlescreen_sprite.texture.width
-            scale_y = self.window.height / self.titlescreen_sprite.texture.height
+            scale_x = self.width / self.titlescreen_sprite.texture.width
+            scale_y = self.height / self.titlescreen_sprite.texture.height
             self.titlescreen_sprite.scale = min(scale_x, scale_y)
             
             # Draw the titlescreen
@@ -232,11 +2914,11 @@ class StartView(arcade.View):
             pass
             
         # Draw highscore in top-left corner
-        if self.highscore > 0:
-            arcade.draw_text(
-                f"High Score: {self.highscore}",
+        if self.profile.highscore > 0:
+            draw_label(
+                f"High Score: {self.profile.highscore}",
                 20,
-                self.window.height - 40,
+                self.height - 40,
                 arcade.color.YELLOW,
                 font_size=24,
                 anchor_x="left",
@@ -245,10 +2927,10 @@ class StartView(arcade.View):
             )
         
         # Draw coins below highscore
-        arcade.draw_text(
-            f"Coins: {self.shop_data['coins']}",
+        draw_label(
+            f"Coins: {self.profile.coins}",
             20,
-            self.window.height - 70,
+            self.height - 70,
             arcade.color.GOLD,
             font_size=20,
             anchor_x="left",
@@ -259,8 +2941,8 @@ class StartView(arcade.View):
         # Draw Item Shop button in top-right corner
         shop_button_width = 150
         shop_button_height = 40
-        shop_button_x = self.window.width - shop_button_width - 20
-        shop_button_y = self.window.height - shop_button_height - 20
+        shop_button_x = self.width - shop_button_width - 20
+        shop_button_y = self.height - shop_button_height - 20
         
         # Button background
         arcade.draw_lrbt_rectangle_filled(
@@ -282,7 +2964,7 @@ class StartView(arcade.View):
         )
         
         # Button text
-        arcade.draw_text(
+        draw_label(
             "ITEM SHOP",
             shop_button_x + shop_button_width // 2,
             shop_button_y + shop_button_height // 2 - 8,
@@ -293,10 +2975,23 @@ class StartView(arcade.View):
             bold=True
         )
 
+        # Replay hint in the bottom-left corner
+        if self.has_replay:
+            draw_label(
+                "R: watch your last run",
+                20,
+                20,
+                arcade.color.LIGHT_GRAY,
+                font_size=14,
+                font_name="Arial"
+            )
+
     
     def on_update(self, delta_time):
-        """Update start screen"""
-        pass
+        """Feed the preloader its per-frame budget"""
+        asset_preloader.update()
+        if self.titlescreen_pending:
+            self.load_titlescreen()
     
     def on_key_press(self, key, modifiers):
         """Handle key presses on start screen"""
@@ -305,6 +3000,9 @@ class StartView(arcade.View):
             game_view = GameView()
             game_view.setup()
             self.window.show_view(game_view)
+        elif key == arcade.key.R:
+            # Watch the last run again
+            self.start_replay(LAST_REPLAY_FILE)
         elif key == arcade.key.F11:
             # Toggle fullscreen
             self.window.set_fullscreen(not self.window.fullscreen)
@@ -312,11 +3010,23 @@ class StartView(arcade.View):
             # Quit the game
 
             self.window.close()
+
+    def start_replay(self, path):
+        """Play back a recorded run, if there is one"""
+        save_writer.flush()  # Make sure the last run is on disk
+        try:
+            recording = RunRecording.load(path)
+        except (OSError, ValueError, KeyError):
+            return
+        game_view = GameView(replay=recording)
+        game_view.setup()
+        self.window.show_view(game_view)
     
     def on_mouse_press(self, x, y, button, modifiers):
         """Handle mouse clicks on start screen"""
+        x, y = self.screen.to_virtual(x, y)
         # Simple check: if click is in the right half of the top part of screen, go to item shop
-        if x > self.window.width * 0.5 and y > self.window.height * 0.7:
+        if x > self.width * 0.5 and y > self.height * 0.7:
             # Open item shop
             item_shop_view = ItemShopView()
             self.window.show_view(item_shop_view)
@@ -327,22 +3037,17 @@ class StartView(arcade.View):
             self.window.show_view(game_view)
 
 
-class GameOverView(arcade.View):
+class GameOverView(ScreenView):
     """Game Over screen with button navigation"""
     
-    def __init__(self, final_score):
+    def __init__(self, final_score, is_new_highscore=False):
         super().__init__()
         self.final_score = final_score
         self.background_color = arcade.color.BLACK
         
-        # Load current highscore and check if we have a new one
-        self.highscore = load_highscore()
-        self.is_new_highscore = final_score > self.highscore
-        
-        # Update highscore if needed
-        if self.is_new_highscore:
-            self.highscore = final_score
-            save_highscore(final_score)
+        # The run was already recorded in the profile by GameView
+        self.highscore = get_profile().highscore
+        self.is_new_highscore = is_new_highscore
         
         # Button system
         self.selected_button = 0  # 0 = Restart, 1 = Start Screen, 2 = Quit
@@ -354,11 +3059,103 @@ class GameOverView(arcade.View):
         
         # Animation timer for button glow effect
         self.animation_timer = 0.0
+
+        # Everything but the selected button and the highscore pulse is static
+        self.static_layer = StaticLayer(self.window, self.background_color)
+
+    def on_resize(self, width, height):
+        """Re-render the cached screen at the new size"""
+        self.static_layer.invalidate()
     
-    def on_draw(self):
+    def draw(self):
         """Draw the game over screen"""
         self.clear()
-        
+        text_cache.begin_frame()
+        self.static_layer.draw(self.draw_static)
+        self.draw_animated()
+
+    def button_layout(self):
+        """Center, first button y, size and spacing of the button column"""
+        center_x = self.width // 2
+        button_start_y = self.height // 2 - 60
+        return center_x, button_start_y, 280, 50, 65
+
+    def draw_button(self, i, selected):
+        """Draw one menu button, glowing if it is selected"""
+        center_x, button_start_y, button_width, button_height, button_spacing = self.button_layout()
+        button_y = button_start_y - (i * button_spacing)
+
+        # Determine button colors based on selection
+        if selected:
+            # Selected button - bright colors with animation
+            glow_intensity = math.sin(self.animation_timer * 6) * 0.3 + 0.7
+            button_color = (
+                int(255 * glow_intensity),
+                int(165 * glow_intensity),
+                0
+            )
+            text_color = arcade.color.BLACK
+            border_color = arcade.color.YELLOW
+            border_width = int(4 + math.sin(self.animation_timer * 8) * 2)
+        else:
+            # Unselected button - darker colors
+            button_color = arcade.color.DARK_GRAY
+            text_color = arcade.color.WHITE
+            border_color = arcade.color.GRAY
+            border_width = 2
+
+        # Draw button background
+        arcade.draw_lrbt_rectangle_filled(
+            center_x - button_width // 2,
+            center_x + button_width // 2,
+            button_y - button_height // 2,
+            button_y + button_height // 2,
+            button_color
+        )
+
+        # Draw button border
+        arcade.draw_lrbt_rectangle_outline(
+            center_x - button_width // 2,
+            center_x + button_width // 2,
+            button_y - button_height // 2,
+            button_y + button_height // 2,
+            border_color, border_width
+        )
+
+        # Draw button text
+        draw_label(
+            self.buttons[i]["text"],
+            center_x,
+            button_y - 10,
+            text_color,
+            font_size=22,
+            anchor_x="center",
+            font_name="Arial",
+            bold=True
+        )
+
+    def draw_animated(self):
+        """Draw the pulsing highscore banner and the selected button"""
+        if self.is_new_highscore:
+            # Animated glow effect with pulsing text
+            pulse_scale = 1.0 + 0.1 * math.sin(self.animation_timer * 8)
+            
+            draw_label(
+                "🏆 NEW HIGH SCORE! 🏆",
+                self.width // 2,
+                self.height // 2 + 5,
+                arcade.color.GOLD,
+                font_size=int(26 * pulse_scale),
+                anchor_x="center",
+                font_name="Arial",
+                bold=True
+            )
+
+        # The selected button is drawn over its unselected copy in the cache
+        self.draw_button(self.selected_button, selected=True)
+
+    def draw_static(self):
+        """Draw background, texts and unselected buttons"""
         # Draw gradient background
         for i in range(8):
             t = i / 7
@@ -367,19 +3164,19 @@ class GameOverView(arcade.View):
             b = int(40 * (1 - t) + 80 * t)
             
             arcade.draw_lrbt_rectangle_filled(
-                0, self.window.width,
-                (self.window.height / 8) * i,
-                (self.window.height / 8) * (i + 1),
+                0, self.width,
+                (self.height / 8) * i,
+                (self.height / 8) * (i + 1),
                 (r, g, b)
             )
         
         # Use actual window dimensions for proper centering in fullscreen
-        center_x = self.window.width // 2
-        center_y = self.window.height // 2
+        center_x = self.width // 2
+        center_y = self.height // 2
         
         # Draw "GAME OVER" text with shadow effect
         # Shadow
-        arcade.draw_text(
+        draw_label(
             "GAME OVER",
             center_x + 3,
             center_y + 147,
@@ -390,7 +3187,7 @@ class GameOverView(arcade.View):
             bold=True
         )
         # Main text
-        arcade.draw_text(
+        draw_label(
             "GAME OVER",
             center_x,
             center_y + 150,
@@ -403,7 +3200,7 @@ class GameOverView(arcade.View):
         
         # Draw final score with better spacing
         score_color = arcade.color.YELLOW if self.is_new_highscore else arcade.color.WHITE
-        arcade.draw_text(
+        draw_label(
             f"Final Score: {self.final_score}",
             center_x,
             center_y + 80,
@@ -417,7 +3214,7 @@ class GameOverView(arcade.View):
         # Draw coins earned with better positioning
         coins_earned = self.final_score // 5
         if coins_earned > 0:
-            arcade.draw_text(
+            draw_label(
                 f"Coins Earned: +{coins_earned}",
                 center_x,
                 center_y + 40,
@@ -428,24 +3225,9 @@ class GameOverView(arcade.View):
                 bold=True
             )
         
-        # Draw NEW HIGHSCORE message or current highscore with better positioning
-        if self.is_new_highscore:
-            # Animated glow effect with pulsing text
-            pulse_scale = 1.0 + 0.1 * math.sin(self.animation_timer * 8)
-            
-            arcade.draw_text(
-                "🏆 NEW HIGH SCORE! 🏆",
-                center_x,
-                center_y + 5,
-                arcade.color.GOLD,
-                font_size=int(26 * pulse_scale),
-                anchor_x="center",
-                font_name="Arial",
-                bold=True
-            )
-        else:
-            # Show current highscore
-            arcade.draw_text(
+        # Draw current highscore (a new highscore pulses in draw_animated)
+        if not self.is_new_highscore:
+            draw_label(
                 f"High Score: {self.highscore}",
                 center_x,
                 center_y + 5,
@@ -454,68 +3236,11 @@ class GameOverView(arcade.View):
                 anchor_x="center",
                 font_name="Arial"
             )
-        
-       
+
         # Draw buttons with better spacing
-        button_start_y = center_y - 60
-        button_height = 50
-        button_width = 280
-        button_spacing = 65
-        
-        for i, button in enumerate(self.buttons):
-            button_y = button_start_y - (i * button_spacing)
-            
-            # Determine button colors based on selection
-            if i == self.selected_button:
-                # Selected button - bright colors with animation
-                glow_intensity = math.sin(self.animation_timer * 6) * 0.3 + 0.7
-                button_color = (
-                    int(255 * glow_intensity),
-                    int(165 * glow_intensity),
-                    0
-                )
-                text_color = arcade.color.BLACK
-                border_color = arcade.color.YELLOW
-                border_width = int(4 + math.sin(self.animation_timer * 8) * 2)
-            else:
-                # Unselected button - darker colors
-                button_color = arcade.color.DARK_GRAY
-                text_color = arcade.color.WHITE
-                border_color = arcade.color.GRAY
-                border_width = 2
-            
-            # Draw button background
-            arcade.draw_lrbt_rectangle_filled(
-                center_x - button_width // 2,
-                center_x + button_width // 2,
-                button_y - button_height // 2,
-                button_y + button_height // 2,
-                button_color
-            )
-            
-            # Draw button border
-            arcade.draw_lrbt_rectangle_outline(
-                center_x - button_width // 2,
-                center_x + button_width // 2,
-                button_y - button_height // 2,
-                button_y + button_height // 2,
-                border_color, border_width
-            )
-            
-            # Draw button text
-            arcade.draw_text(
-                button["text"],
-                center_x,
-                button_y - 10,
-                text_color,
-                font_size=22,
-                anchor_x="center",
-                font_name="Arial",
-                bold=True
-            )
-            
+        for i in range(len(self.buttons)):
+            self.draw_button(i, selected=False)
 
-    
     def on_key_press(self, key, modifiers):
         """Handle key presses on game over screen"""
         # Navigation with arrow keys only
@@ -550,7 +3275,7 @@ class GameOverView(arcade.View):
         self.animation_timer += delta_time
 
 
-class ItemShopView(arcade.View):
+class ItemShopView(ScreenView):
     """Item Shop screen"""
     
     def __init__(self):
@@ -560,21 +3285,15 @@ class ItemShopView(arcade.View):
         # Shop items data
         self.shop_items = [
             {
-                "id": "normal_wario",
-                "name": "Normal Wario",
-                "price": 0,
-                "description": "Classic Wario appearance",
-                "sprite_path": "assets/images/sprites/wario/normal/SSWario.png",
-                "always_owned": True
-            },
-            {
-                "id": "shiny_wario", 
-                "name": "Shiny Wario Skin",
-                "price": 40,
-                "description": "Unlock the shiny appearance!",
-                "sprite_path": "assets/images/sprites/wario/shiny/SSWarioShiny.png",
-                "always_owned": False
+                "id": skin['shop_id'],
+                "skin": name,
+                "name": skin['shop_name'],
+                "price": skin['price'],
+                "description": skin['description'],
+                "sprite_path": skin['idle'],
+                "always_owned": skin['always_owned']
             }
+            for name, skin in SKINS.items()
         ]
         
         # Create sprite lists for shop items
@@ -584,7 +3303,7 @@ class ItemShopView(arcade.View):
         # Load sprites for each shop item
         for item in self.shop_items:
             try:
-                sprite = arcade.Sprite(item["sprite_path"], scale=1.5)
+                sprite = arcade.Sprite(assets.texture(item["sprite_path"]), scale=1.5)
                 sprite_list = arcade.SpriteList()
                 sprite_list.append(sprite)
                 self.item_sprites[item["id"]] = sprite
@@ -594,18 +3313,33 @@ class ItemShopView(arcade.View):
                 self.item_sprites[item["id"]] = None
                 self.sprite_lists[item["id"]] = arcade.SpriteList()
         
-        # Load shop data from file
-        self.shop_data = load_shop_data()
-        self.item_purchased = "shiny_wario" in self.shop_data['purchased_items']
-        self.player_coins = self.shop_data['coins']
+        # Shared player profile (coins, purchases, equipped skin)
+        self.profile = get_profile()
         
         # Animation variables
         self.animation_timer = 0.0
+
+        # Cards, texts and buttons only change on purchase/equip
+        self.static_layer = StaticLayer(self.window, self.background_color)
+
+    def on_resize(self, width, height):
+        """Re-render the cached screen at the new size"""
+        self.static_layer.invalidate()
+
+    def item_layout(self, i):
+        """Bottom-left corner and size of the i-th item card"""
+        item_width = 300
+        item_height = 350
+        spacing = 50
+        count = len(self.shop_items)
+        start_x = self.width // 2 - (count * item_width + (count - 1) * spacing) // 2
+        item_x = start_x + i * (item_width + spacing)
+        item_y = self.height // 2 - item_height // 2
+        return item_x, item_y, item_width, item_height
     
     def draw_action_button(self, item, button_x, button_y, button_width, button_height, is_equipped):
         """Draw action button for an item (Buy/Equip/Equipped)"""
-        equipped_skin = self.shop_data.get('equipped_skin', 'normal')
-        is_owned = item['always_owned'] or item['id'] in self.shop_data['purchased_items']
+        is_owned = item['always_owned'] or self.profile.owns(item['id'])
         
         if is_equipped:
             button_color = arcade.color.GRAY
@@ -617,7 +3351,7 @@ class ItemShopView(arcade.View):
             border_color = arcade.color.DARK_BLUE
             button_text = "EQUIP"
             text_color = arcade.color.WHITE
-        elif self.player_coins >= item["price"]:
+        elif self.profile.coins >= item["price"]:
             button_color = arcade.color.GREEN
             border_color = arcade.color.DARK_GREEN
             button_text = "BUY"
@@ -643,7 +3377,7 @@ class ItemShopView(arcade.View):
         )
         
         # Button text
-        arcade.draw_text(
+        draw_label(
             button_text,
             button_x + button_width // 2,
             button_y + button_height // 2 - 6,
@@ -653,40 +3387,66 @@ class ItemShopView(arcade.View):
             bold=True
         )
         
-    def on_draw(self):
+    def draw(self):
         """Draw the item shop screen"""
         self.clear()
-        
+        text_cache.begin_frame()
+        self.static_layer.draw(self.draw_static)
+        self.draw_animated()
+
+    def draw_animated(self):
+        """Draw the floating skin previews on top of the cached cards"""
+        for i, item in enumerate(self.shop_items):
+            sprite = self.item_sprites.get(item['id'])
+            if not sprite:
+                continue
+            item_x, item_y, item_width, item_height = self.item_layout(i)
+
+            # Floating animation
+            float_offset = math.sin(self.animation_timer * 2 + i) * 10
+            
+            # Scale animation
+            scale_base = 1.5
+            scale_variation = math.sin(self.animation_timer * 3 + i) * 0.1
+            sprite.scale = scale_base + scale_variation
+            
+            # Position sprite
+            sprite.center_x = item_x + item_width // 2
+            sprite.center_y = item_y + item_height - 100 + float_offset
+            
+            self.sprite_lists[item['id']].draw()
+
+    def draw_static(self):
+        """Draw title, coins, item cards and buttons"""
         # Get dynamic screen center
-        center_x = self.window.width // 2
-        center_y = self.window.height // 2
+        center_x = self.width // 2
         
         # Draw title
-        arcade.draw_text(
+        draw_label(
             "SKIN SHOP",
             center_x,
-            self.window.height - 60,
+            self.height - 60,
             arcade.color.GOLD,
             font_size=50,
             anchor_x="center"
         )
         
         # Draw player coins
-        arcade.draw_text(
-            f"Coins: {self.player_coins}",
+        draw_label(
+            f"Coins: {self.profile.coins}",
             50,
-            self.window.height - 50,
+            self.height - 50,
             arcade.color.YELLOW,
             font_size=20,
             bold=True
         )
         
         # Draw current equipped skin
-        equipped_skin = self.shop_data.get('equipped_skin', 'normal')
-        arcade.draw_text(
-            f"Current: {'Shiny Wario' if equipped_skin == 'shiny' else 'Normal Wario'}",
-            self.window.width - 50,
-            self.window.height - 50,
+        equipped_skin = self.profile.equipped_skin
+        draw_label(
+            f"Current: {SKINS.get(equipped_skin, SKINS[DEFAULT_SKIN])['name']}",
+            self.width - 50,
+            self.height - 50,
             arcade.color.CYAN,
             font_size=20,
             anchor_x="right",
@@ -694,17 +3454,11 @@ class ItemShopView(arcade.View):
         )
         
         # Draw both shop items side by side
-        item_width = 300
-        item_height = 350
-        spacing = 50
-        start_x = center_x - (2 * item_width + spacing) // 2
-        
         for i, item in enumerate(self.shop_items):
-            item_x = start_x + i * (item_width + spacing)
-            item_y = center_y - item_height // 2
+            item_x, item_y, item_width, item_height = self.item_layout(i)
             
             # Item background - highlight if equipped
-            is_equipped = (equipped_skin == 'normal' and item['id'] == 'normal_wario') or (equipped_skin == 'shiny' and item['id'] == 'shiny_wario')
+            is_equipped = item['skin'] == equipped_skin
             bg_color = arcade.color.DARK_GREEN if is_equipped else arcade.color.DARK_BLUE
             border_color = arcade.color.GREEN if is_equipped else arcade.color.GOLD
             
@@ -720,25 +3474,8 @@ class ItemShopView(arcade.View):
                 border_color, 3 if is_equipped else 2
             )
             
-            # Position and animate sprite
-            sprite = self.item_sprites.get(item['id'])
-            if sprite:
-                # Floating animation
-                float_offset = math.sin(self.animation_timer * 2 + i) * 10
-                
-                # Scale animation
-                scale_base = 1.5
-                scale_variation = math.sin(self.animation_timer * 3 + i) * 0.1
-                sprite.scale = scale_base + scale_variation
-                
-                # Position sprite
-                sprite.center_x = item_x + item_width // 2
-                sprite.center_y = item_y + item_height - 100 + float_offset
-                
-                self.sprite_lists[item['id']].draw()
-            
             # Item name
-            arcade.draw_text(
+            draw_label(
                 item["name"],
                 item_x + item_width // 2,
                 item_y + 120,
@@ -749,7 +3486,7 @@ class ItemShopView(arcade.View):
             )
             
             # Item description
-            arcade.draw_text(
+            draw_label(
                 item["description"],
                 item_x + item_width // 2,
                 item_y + 90,
@@ -759,9 +3496,9 @@ class ItemShopView(arcade.View):
             )
             
             # Price (only show if not owned and not free)
-            is_owned = item['always_owned'] or item['id'] in self.shop_data['purchased_items']
+            is_owned = item['always_owned'] or self.profile.owns(item['id'])
             if item["price"] > 0 and not is_owned:
-                arcade.draw_text(
+                draw_label(
                     f"Price: {item['price']} coins",
                     item_x + item_width // 2,
                     item_y + 60,
@@ -781,7 +3518,7 @@ class ItemShopView(arcade.View):
 
         
         # Back instruction
-        arcade.draw_text(
+        draw_label(
             "Press ESC to go back",
             center_x,
             50,
@@ -796,18 +3533,10 @@ class ItemShopView(arcade.View):
         
     def on_mouse_press(self, x, y, button, modifiers):
         """Handle mouse clicks on item shop"""
-        center_x = self.window.width // 2
-        center_y = self.window.height // 2
-        
+        x, y = self.screen.to_virtual(x, y)
         # Check clicks on item buttons
-        item_width = 300
-        item_height = 350
-        spacing = 50
-        start_x = center_x - (2 * item_width + spacing) // 2
-        
         for i, item in enumerate(self.shop_items):
-            item_x = start_x + i * (item_width + spacing)
-            item_y = center_y - item_height // 2
+            item_x, item_y, item_width, item_height = self.item_layout(i)
             
             # Button coordinates
             button_width = 120
@@ -819,30 +3548,22 @@ class ItemShopView(arcade.View):
             if (button_x <= x <= button_x + button_width and
                 button_y <= y <= button_y + button_height):
                 
-                equipped_skin = self.shop_data.get('equipped_skin', 'normal')
-                is_owned = item['always_owned'] or item['id'] in self.shop_data['purchased_items']
-                is_equipped = (equipped_skin == 'normal' and item['id'] == 'normal_wario') or (equipped_skin == 'shiny' and item['id'] == 'shiny_wario')
+                equipped_skin = self.profile.equipped_skin
+                is_owned = item['always_owned'] or self.profile.owns(item['id'])
+                is_equipped = item['skin'] == equipped_skin
                 
                 if is_equipped:
                     print(f"{item['name']} is already equipped!")
                 elif is_owned:
                     # Equip the skin
-                    new_skin = 'shiny' if item['id'] == 'shiny_wario' else 'normal'
-                    self.shop_data['equipped_skin'] = new_skin
-                    save_shop_data(self.shop_data)
+                    self.profile.equip(item['skin'])
+                    self.static_layer.invalidate()
                     print(f"{item['name']} equipped!")
-                elif self.player_coins >= item["price"]:
-                    # Purchase and equip
-                    self.player_coins -= item["price"]
-                    self.shop_data['coins'] = self.player_coins
-                    self.shop_data['purchased_items'].append(item['id'])
-                    
+                elif self.profile.purchase(item['id'], item["price"]):
                     # Auto-equip the new skin
-                    new_skin = 'shiny' if item['id'] == 'shiny_wario' else 'normal'
-                    self.shop_data['equipped_skin'] = new_skin
-                    
-                    save_shop_data(self.shop_data)
-                    print(f"{item['name']} purchased and equipped! Remaining coins: {self.player_coins}")
+                    self.profile.equip(item['skin'])
+                    self.static_layer.invalidate()
+                    print(f"{item['name']} purchased and equipped! Remaining coins: {self.profile.coins}")
                 else:
                     print("Not enough coins!")
                 return
@@ -862,113 +3583,1098 @@ class ItemShopView(arcade.View):
             self.window.set_fullscreen(not self.window.fullscreen)
 
 
-class GameView(arcade.View):
+# Fixed field size used when there is no window (headless runs)
+HEADLESS_WIDTH = WINDOW_WIDTH
+HEADLESS_HEIGHT = WINDOW_HEIGHT
+
+player_hitbox_texture = None
+
+
+def get_player_hitbox_texture():
+    """Texture that defines the player's hit box, independent of skin and animation"""
+    global player_hitbox_texture
+    if player_hitbox_texture is None:
+        player_hitbox_texture = assets.texture(PLAYER_HITBOX_SHEET_PATH).crop(0, 0, 32, 32)
+    return player_hitbox_texture
+
+
+# Recorded runs
+LAST_REPLAY_FILE = "data/replays/last.json"
+BEST_REPLAY_FILE = "data/replays/best.json"
+REPLAY_VERSION = 8  # Bumped whenever the simulation changes
+REPLAY_SPEEDS = (1, 2, 4, 8, 16)
+MOVEMENT_KEYS = ('up', 'down', 'left', 'right')
+
+# Replay files on disk or queued on the save writer, so menus never check the disk
+saved_replays = None
+
+
+def get_saved_replays():
+    """Set of replay paths that exist; the disk is only looked at once, at startup"""
+    global saved_replays
+    if saved_replays is None:
+        saved_replays = {path for path in (LAST_REPLAY_FILE, BEST_REPLAY_FILE) if os.path.exists(path)}
+    return saved_replays
+
+
+class RunRecording:
+    """A run as its seed, field size and input events.
+
+    Events are [tick, name, value...] lists stamped with the number of
+    simulation steps completed when they happened: [tick, 'left', 1] for a
+    key going down, [tick, 'left', 0] for it going up and
+    [tick, 'size', width, height] for a field resize. Replaying the events
+    into a GameSimulation with the same seed reproduces the run exactly.
+    """
+
+    def __init__(self, seed, width, height, events=None):
+        self.seed = seed
+        self.width = width
+        self.height = height
+        self.events = events if events is not None else []
+        self.ticks = 0
+        self.score = 0
+        self.digest = None  # GameSimulation.state_digest() at the end of the run
+
+    def record(self, tick, name, *values):
+        self.events.append([tick, name, *values])
+
+    def to_dict(self):
+        return {
+            'version': REPLAY_VERSION,
+            'seed': self.seed,
+            'width': self.width,
+            'height': self.height,
+            'step': SIMULATION_STEP,
+            'ticks': self.ticks,
+            'score': self.score,
+            'digest': self.digest,
+            'events': self.events,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get('version') != REPLAY_VERSION:
+            raise ValueError(f"Unsupported replay version {data.get('version')}")
+        recording = cls(data['seed'], data['width'], data['height'], data['events'])
+        recording.ticks = data.get('ticks', 0)
+        recording.score = data.get('score', 0)
+        recording.digest = data.get('digest')
+        return recording
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r') as f:
+            return cls.from_dict(json.load(f))
+
+    def save(self, path):
+        """Queue the recording on the save writer"""
+        save_writer.submit(path, self.to_dict())
+        get_saved_replays().add(path)
+
+
+class ReplayInput:
+    """Input policy that feeds a recording's events back into a simulation"""
+
+    def __init__(self, recording):
+        self.recording = recording
+        self.index = 0
+
+    def __call__(self, sim):
+        events = self.recording.events
+        while self.index < len(events) and events[self.index][0] <= sim.ticks:
+            event = events[self.index]
+            self.index += 1
+            if event[1] == 'size':
+                sim.resize(event[2], event[3])
+            else:
+                sim.set_key(event[1], bool(event[2]))
+
+
+# Spawn placement
+SPAWN_MARGIN = 50              # Keep spawns this far inside the field edges
+BURGER_SPACING = 40            # Burger slots are at least this far apart (Poisson disk)
+PLACEMENT_TRIES = 12           # Slots checked per burger before doubling up on one
+BURGER_PLAYER_DISTANCE = 100   # Burgers never appear closer to the player than this
+PRINTER_SPACING = 120          # Minimum x distance between printers of one wave
+PRINTER_PLAYER_DISTANCE = 150  # No printer starts closer than this (in x) above the player
+
+
+def poisson_disk_points(left, bottom, right, top, radius, rng, tries=20):
+    """Random points in a rectangle, no two closer than radius (Bridson's algorithm)"""
+    if right <= left or top <= bottom:
+        return [((left + right) / 2, (bottom + top) / 2)]
+    cell = radius / 2 ** 0.5  # At most one point per background cell
+    columns = int((right - left) // cell) + 1
+    rows = int((top - bottom) // cell) + 1
+    grid = [None] * (columns * rows)
+
+    def add(point):
+        grid[int((point[1] - bottom) // cell) * columns + int((point[0] - left) // cell)] = point
+        points.append(point)
+        active.append(point)
+
+    points = []
+    active = []
+    add((rng.uniform(left, right), rng.uniform(bottom, top)))
+    while active:
+        index = rng.randrange(len(active))
+        x, y = active[index]
+        for i in range(tries):
+            angle = rng.uniform(0, 2 * math.pi)
+            distance = rng.uniform(radius, 2 * radius)
+            px = x + math.cos(angle) * distance
+            py = y + math.sin(angle) * distance
+            if not (left <= px < right and bottom <= py < top):
+                continue
+            column = int((px - left) // cell)
+            row = int((py - bottom) // cell)
+            clear = True
+            for r in range(max(row - 2, 0), min(row + 3, rows)):
+                for c in range(max(column - 2, 0), min(column + 3, columns)):
+                    other = grid[r * columns + c]
+                    if other is not None and (other[0] - px) ** 2 + (other[1] - py) ** 2 < radius * radius:
+                        clear = False
+                        break
+                if not clear:
+                    break
+            if clear:
+                add((px, py))
+                break
+        else:
+            # No room around this point any more
+            active[index] = active[-1]
+            active.pop()
+    return points
+
+
+burger_slot_cache = {}
+
+
+def get_burger_slots(width, height):
+    """Poisson-disk burger slots for a field size, laid out once per size.
+
+    The layout depends on nothing but the size, so it can be built before
+    a run starts; each run shuffles its own copy.
+    """
+    slots = burger_slot_cache.get((width, height))
+    if slots is None:
+        slots = poisson_disk_points(SPAWN_MARGIN, SPAWN_MARGIN, width - SPAWN_MARGIN, height - SPAWN_MARGIN,
+                                    BURGER_SPACING, random.Random(f"slots:{width}x{height}"))
+        burger_slot_cache[(width, height)] = slots
+    return slots
+
+
+def free_spans(low, high, blocked):
+    """Parts of [low, high] not covered by any of the (start, end) ranges"""
+    spans = []
+    start = low
+    for block_start, block_end in sorted(blocked):
+        if block_start > start:
+            spans.append((start, min(block_start, high)))
+        start = max(start, block_end)
+        if start >= high:
+            break
+    if start < high:
+        spans.append((start, high))
+    return [(a, b) for a, b in spans if b > a]
+
+
+class SpawnPlacer:
+    """Picks spawn positions for burgers and printers in bounded time.
+
+    Burgers go into precomputed slots: a Poisson-disk set of points
+    BURGER_SPACING apart, built once per field size and walked in shuffled
+    order by a rotating cursor. The slot list doubles as the spatial index
+    of placed burgers (slot -> occupant), so checking a slot is O(1) and a
+    spawn looks at no more than PLACEMENT_TRIES slots however full the
+    field is. Printers: the free stretches of the top edge are worked out
+    from the player and the printers already placed in the wave, so a spot
+    is found whenever one exists. All randomness comes from the
+    simulation's spawn stream.
+    """
+
+    def __init__(self, sim):
+        self.sim = sim
+        self.size = None
+        self.slots = []
+        self.occupants = []
+        self.cursor = 0
+
+    def build_slots(self):
+        """Lay out and shuffle the burger slots for the current field size"""
+        width, height = int(self.sim.width), int(self.sim.height)
+        self.slots = list(get_burger_slots(width, height))
+        self.sim.spawn_rng.shuffle(self.slots)
+        self.occupants = [None] * len(self.slots)
+        self.size = (width, height)
+        self.cursor = 0
+
+    def slot_free(self, index):
+        burger = self.occupants[index]
+        # Collected burgers leave the grid, recycled ones get a new slot
+        return burger is None or burger.grid is None or burger.slot != index
+
+    def place_burger(self, burger):
+        """Move a burger to a free slot away from the player.
+
+        Returns False (and leaves the burger alone) when none of the slots
+        checked is far enough from the player; the spawn is skipped then.
+        """
+        if self.size != (int(self.sim.width), int(self.sim.height)):
+            self.build_slots()
+        player = self.sim.player_sprite
+        count = len(self.slots)
+        fallback = None
+        for i in range(min(PLACEMENT_TRIES, count)):
+            index = self.cursor
+            self.cursor = (self.cursor + 1) % count
+            x, y = self.slots[index]
+            if (x - player.center_x) ** 2 + (y - player.center_y) ** 2 <= BURGER_PLAYER_DISTANCE ** 2:
+                continue
+            if self.slot_free(index):
+                break
+            if fallback is None:
+                fallback = index
+        else:
+            # Full field: share the first slot seen that is away from the player
+            if fallback is None:
+                return False
+            index = fallback
+        burger.center_x, burger.center_y = self.slots[index]
+        burger.slot = index
+        self.occupants[index] = burger
+        return True
+
+    def printer_positions(self, count):
+        """Up to `count` x positions on the top edge, spaced apart and away from the player"""
+        rng = self.sim.spawn_rng
+        player_x = self.sim.player_sprite.center_x
+        blocked = [(player_x - PRINTER_PLAYER_DISTANCE, player_x + PRINTER_PLAYER_DISTANCE)]
+        positions = []
+        for i in range(count):
+            spans = free_spans(SPAWN_MARGIN, self.sim.width - SPAWN_MARGIN, blocked)
+            total = sum(end - start for start, end in spans)
+            if total <= 0:
+                break  # No room left for another printer in this wave
+            offset = rng.uniform(0, total)
+            for start, end in spans:
+                if offset <= end - start:
+                    x = start + offset
+                    break
+                offset -= end - start
+            positions.append(x)
+            blocked.append((x - PRINTER_SPACING, x + PRINTER_SPACING))
+        return positions
+
+
+# Spawn waves. Each wave repeats every max(base_interval - per_point * score,
+# min_interval) seconds once the score reaches start_score; with
+# spawn_on_start it also spawns the moment it starts.
+SPAWN_WAVES = {
+    'coins': {
+        'spawner': 'spawn_coins', 'args': (3,),  # 3 new burgers every 5 seconds
+        'base_interval': 5.0, 'per_point': 0.0, 'min_interval': 5.0,
+        'start_score': 0, 'spawn_on_start': False,
+    },
+    'printers': {
+        'spawner': 'spawn_printers', 'args': (),  # From score 5, 0.1 s faster per point
+        'base_interval': 6.0, 'per_point': 0.1, 'min_interval': 3.0,
+        'start_score': 5, 'spawn_on_start': True,
+    },
+    'enemies': {
+        'spawner': 'spawn_enemies', 'args': (),  # From the start, 0.08 s faster per point
+        'base_interval': 3.0, 'per_point': 0.08, 'min_interval': 1.5,
+        'start_score': 0, 'spawn_on_start': False,
+    },
+}
+
+
+class SpawnScheduler:
+    """Priority queue of upcoming wave spawns on its own clock.
+
+    Every active wave has one live entry in a heap of (due time, order,
+    version, name). A score change re-times the waves whose interval
+    depends on it by pushing a new entry and bumping the wave's version;
+    stale entries are skipped when they reach the top. advance() is O(1)
+    when nothing is due. spawn(name, wave) is called for every due spawn.
+    """
+
+    def __init__(self, waves, spawn, score=0):
+        self.waves = waves
+        self.spawn = spawn
+        self.time = 0.0
+        self.score = score
+        self.paused = False
+        self.queue = []
+        self.order = 0  # Tie-breaker: equal times fire in the order they were scheduled
+        self.version = dict.fromkeys(waves, 0)
+        self.last_spawn = {}  # name -> clock time of its previous spawn (or start)
+        self.disabled = set()
+        self.starting = set()  # Waves whose first spawn is due on the next advance()
+        self.spawned = dict.fromkeys(waves, 0)
+        for name in waves:
+            self.try_start(name)
+
+    def interval(self, name, score=None):
+        wave = self.waves[name]
+        score = self.score if score is None else score
+        return max(wave['base_interval'] - wave['per_point'] * score, wave['min_interval'])
+
+    def active(self, name):
+        return name in self.last_spawn and name not in self.disabled
+
+    def try_start(self, name):
+        """Start a wave once the score allows it"""
+        wave = self.waves[name]
+        if name in self.last_spawn or self.score < wave['start_score']:
+            return
+        self.last_spawn[name] = self.time
+        if wave['spawn_on_start']:
+            # Spawn on the next step rather than in the middle of the one that scored
+            self.starting.add(name)
+            self.push(name, self.time)
+        else:
+            self.schedule(name)
+
+    def push(self, name, due):
+        self.version[name] += 1
+        if not self.active(name):
+            return
+        self.order += 1
+        heapq.heappush(self.queue, (due, self.order, self.version[name], name))
+
+    def schedule(self, name):
+        """(Re)queue a wave's next spawn from its last spawn and the current interval"""
+        self.push(name, self.last_spawn[name] + self.interval(name))
+
+    def fire(self, name):
+        self.starting.discard(name)
+        self.last_spawn[name] = self.time
+        self.spawned[name] += 1
+        self.spawn(name, self.waves[name])
+        self.schedule(name)
+
+    def set_score(self, score):
+        """Re-time score-dependent waves and start the ones that unlock"""
+        if score == self.score:
+            return
+        self.score = score
+        for name, wave in self.waves.items():
+            if name not in self.last_spawn:
+                self.try_start(name)
+            elif name not in self.starting and wave['per_point'] and wave['min_interval'] < wave['base_interval']:
+                self.schedule(name)
+
+    def advance(self, delta_time):
+        """Move the clock forward and fire everything that became due"""
+        if self.paused:
+            return
+        self.time += delta_time
+        queue = self.queue
+        while queue and queue[0][0] <= self.time:
+            due, order, version, name = heapq.heappop(queue)
+            if version == self.version[name]:
+                self.fire(name)
+
+    def pause(self):
+        """Stop the clock; nothing spawns until resume()"""
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
+
+    def disable(self, name):
+        """Stop one wave (its queued spawn is dropped)"""
+        self.disabled.add(name)
+        self.version[name] += 1
+
+    def enable(self, name):
+        """Restart a disabled wave, a full interval from now"""
+        if name not in self.disabled:
+            return
+        self.disabled.discard(name)
+        self.starting.discard(name)
+        if name in self.last_spawn:
+            self.last_spawn[name] = self.time
+            self.schedule(name)
+        else:
+            self.try_start(name)
+
+    def peek(self, count=5):
+        """The next `count` scheduled spawns as (seconds from now, wave name)"""
+        live = [entry for entry in self.queue if entry[2] == self.version[entry[3]]]
+        return [(due - self.time, name) for due, order, version, name in heapq.nsmallest(count, live)]
+
+    def lookahead(self, horizon):
+        """Every spawn expected within `horizon` seconds at the current score"""
+        upcoming = []
+        for name in self.waves:
+            if not self.active(name):
+                continue
+            due = self.time if name in self.starting else self.last_spawn[name] + self.interval(name)
+            while due - self.time <= horizon:
+                upcoming.append((max(0.0, due - self.time), name))
+                due += self.interval(name)
+        return sorted(upcoming)
+
+
+class GameSimulation:
+    """Spawning, movement, collisions and scoring for one run.
+
+    Needs no window, GL context or sound: GameView drives it once per frame
+    and renders its sprites, run_headless() drives it on its own. Spawners
+    and sprite resets draw from separate streams derived from the seed, so
+    a seed plus the recorded input reproduces a run bit for bit.
+    """
+
+    def __init__(self, width=HEADLESS_WIDTH, height=HEADLESS_HEIGHT, seed=None):
+        self.width = width
+        self.height = height
+        if seed is None:
+            seed = random.randrange(2 ** 32)  # Every run gets a seed so it can be replayed
+        self.seed = seed
+        self.spawn_rng = random.Random(f"{seed}:spawn")    # Counts and positions
+        self.entity_rng = random.Random(f"{seed}:entity")  # Per-sprite looks and speeds
+        self.input_rng = random.Random(f"{seed}:input")    # Simulated input policies
+
+        # Records the key and size changes of the run when set
+        self.recording = None
+
+        # Sprite lists
+        self.player_list = None
+        self.coin_list = None
+        self.printer_list = None
+        self.enemy_list = None
+
+        # Burgers, printers and enemies spawn from a schedule (see SPAWN_WAVES)
+        self.spawner = SpawnScheduler(SPAWN_WAVES, self.spawn_wave)
+
+        # Set up the player
+        self.score = 0
+        self.player_sprite = None
+
+        # Player movement
+        self.up_pressed = False
+        self.down_pressed = False
+        self.left_pressed = False
+        self.right_pressed = False
+
+        # Called with (sprite, kind) for every spawn, e.g. to add it to a renderer
+        self.on_spawn = None
+
+        # FrameProfiler to time the update phases with, None when not profiling
+        self.profiler = None
+
+        # Results of the last update
+        self.collected = []  # (x, y, scale) of the burgers collected this update
+        self.is_over = False
+        self.run_time = 0.0
+        self.ticks = 0
+
+    def setup(self):
+        """ Set up the run and initialize the variables. """
+
+        # Sprite lists (logic only, never drawn so they stay lazy)
+        self.player_list = arcade.SpriteList(lazy=True)
+        self.coin_list = arcade.SpriteList(lazy=True)
+        self.printer_list = arcade.SpriteList(lazy=True)
+        self.enemy_list = arcade.SpriteList(lazy=True)
+        self.entity_lists = {
+            'burger': self.coin_list,
+            'printer': self.printer_list,
+            'enemy': self.enemy_list,
+        }
+
+        # Broad-phase for the player against burgers
+        self.collision_grid = SpatialHash()
+
+        # Printers and enemies follow fixed paths and are only placed when near the player
+        self.printer_columns = PrinterColumns()
+        self.enemy_bands = EnemyBands()
+
+        # Bulk movement for bouncing burgers (optional)
+        self.kinematics = KinematicsEngine() if USE_NUMPY_KINEMATICS and np is not None else None
+
+        # Fresh schedule for the run
+        self.spawner = SpawnScheduler(SPAWN_WAVES, self.spawn_wave)
+        self.placer = SpawnPlacer(self)
+
+        # Set up the player
+        self.score = 0
+        self.player_sprite = arcade.Sprite(get_player_hitbox_texture(), scale=2.0)
+        self.player_sprite.center_x = self.width // 2
+        self.player_sprite.center_y = self.height // 2
+        self.player_list.append(self.player_sprite)
+
+        # Allocate pooled entities now rather than during the first waves
+        for pool in ENTITY_POOLS.values():
+            pool.prefill()
+
+        # Start with only 5 burgers
+        for i in range(5):
+            # Create the burger instance
+            burger = collectable_pool.acquire(scale=SPRITE_SCALING, rng=self.entity_rng)
+
+            # Position the burger (skipped when every slot tried is next to the player)
+            if not self.placer.place_burger(burger):
+                burger.despawn()
+                continue
+            burger.original_y = burger.center_y  # Store original position for bouncing
+
+            # Add the burger to the lists
+            self.add_entity(burger, 'burger')
+
+    @property
+    def score(self):
+        return self.spawner.score
+
+    @score.setter
+    def score(self, value):
+        # The scheduler owns the score so interval changes take effect immediately
+        self.spawner.set_score(value)
+
+    def spawn_wave(self, name, wave):
+        """SpawnScheduler callback: run the wave's spawn method"""
+        getattr(self, wave['spawner'])(*wave['args'])
+
+    def start_recording(self):
+        """Record this run's input from now on and return the recording"""
+        self.recording = RunRecording(self.seed, self.width, self.height)
+        return self.recording
+
+    def set_key(self, name, pressed):
+        """Press or release 'up', 'down', 'left' or 'right', recording the change"""
+        attribute = name + '_pressed'
+        if getattr(self, attribute) == pressed:
+            return
+        setattr(self, attribute, pressed)
+        if self.recording is not None:
+            self.recording.record(self.ticks, name, int(pressed))
+
+    def finish_recording(self):
+        """Stamp the recording with how the run ended"""
+        self.recording.ticks = self.ticks
+        self.recording.score = self.score
+        self.recording.digest = self.state_digest()
+        return self.recording
+
+    def state_digest(self):
+        """Hash of the exact simulation state, to check replays bit for bit"""
+        # Burgers, printers and enemies are only placed when needed, so put them all in place first
+        if self.kinematics is not None:
+            self.kinematics.sync()
+        for printer in self.printer_list:
+            printer.place(self.run_time)
+        for enemy in self.enemy_list:
+            enemy.place(self.run_time)
+        # Floats throughout, so 0 and 0.0 hash the same
+        state = [self.ticks, self.score, tuple(map(float, self.player_sprite.position))]
+        for sprite_list in (self.coin_list, self.printer_list, self.enemy_list):
+            state.append([(float(sprite.center_x), float(sprite.center_y), float(sprite.angle))
+                          for sprite in sprite_list])
+        return hashlib.sha1(repr(state).encode()).hexdigest()
+
+    def resize(self, width, height):
+        """Change the field size, recording the change"""
+        if (width, height) == (self.width, self.height):
+            return
+        self.width = width
+        self.height = height
+        if self.recording is not None:
+            self.recording.record(self.ticks, 'size', width, height)
+
+    def add_entity(self, sprite, kind):
+        """Put a freshly spawned burger, printer or enemy into play"""
+        self.entity_lists[kind].append(sprite)
+        if kind == 'enemy':
+            self.enemy_bands.add(sprite, self.run_time)
+        elif kind == 'printer':
+            self.printer_columns.add(sprite, self.run_time)
+        else:
+            self.collision_grid.add(sprite, kind, margin=BURGER_BOUNCE_HEIGHT)
+            if self.kinematics is not None:
+                self.kinematics.add(sprite, kind)
+        if self.on_spawn is not None:
+            self.on_spawn(sprite, kind)
+
+    def release_entities(self):
+        """Hand every burger, printer and enemy back to its pool"""
+        for sprite_list in (self.coin_list, self.printer_list, self.enemy_list):
+            if sprite_list is None:
+                continue
+            for sprite in list(sprite_list):
+                sprite.despawn()
+
+    def spawn_coins(self, num_coins=3):
+        """Spawn new burgers at random locations"""
+        for i in range(num_coins):
+            # Create the burger instance
+            burger = collectable_pool.acquire(scale=SPRITE_SCALING, rng=self.entity_rng)
+
+            # Position the burger in a free slot away from the player
+            if not self.placer.place_burger(burger):
+                burger.despawn()  # No slot far enough away this time
+                continue
+
+            # Store original position for bouncing animation
+            burger.original_y = burger.center_y
+
+            # Add the burger to the lists
+            self.add_entity(burger, 'burger')
+
+    def spawn_printers(self):
+        """Spawn up to 5 printers from the top of the screen"""
+        # Spawn between 3 and 5 printers randomly, spaced apart and not above the player
+        num_printers = self.spawn_rng.randint(3, 5)
+
+        for printer_x in self.placer.printer_positions(num_printers):
+            # Create a printer sprite scaled down to 32x32 pixels first
+            printer = printer_pool.acquire(rng=self.entity_rng)
+            
+            # Step 1: Calculate base scale to make it 64x64 pixels (larger base size)
+            target_size = 64  # Increased from 32 to 64 pixels
+            if printer.texture.width > 0:  # Avoid division by zero
+                base_scale_factor = target_size / max(printer.texture.width, printer.texture.height)
+            else:
+                base_scale_factor = 0.2  # Fallback scale (increased from 0.1)
+            
+            # Step 2: Apply random upscaling on top of the base scale (ensure minimum size)
+            random_upscale = self.spawn_rng.uniform(1.0, 3.0)  # Changed from 0.8-3.0 to 1.0-3.0 (no scaling down)
+            final_scale = base_scale_factor * random_upscale
+            
+            printer.scale = final_scale
+            
+            # Position the printer at the top of the screen
+            printer.center_x = printer_x
+            # Use actual window height for proper positioning in fullscreen
+            actual_height = self.height
+            printer.center_y = actual_height + 100  # Start further above the screen for more reaction time
+            
+            # Calculate falling speed based on score (faster with more coins), pixels per second
+            base_speed = 90  # 1.5 px per 60 Hz frame
+            speed_increase = self.score * 3  # 0.05 px per frame per coin
+            max_speed = 360  # 6 px per frame
+            printer.change_y = -min(base_speed + speed_increase, max_speed)
+            
+            # Add to the printer list
+            self.add_entity(printer, 'printer')
+
+    def spawn_enemies(self):
+        """Spawn enemies from left and right sides of screen"""
+        # Calculate number of enemies based on score (original difficulty from start)
+        base_enemies = 2  # Start with minimum 2 enemies (original setting)
+        score_bonus = self.score // 5  # +1 enemy for every 5 points
+        max_enemies = 8  # Cap at 8 enemies per spawn (original setting)
+        
+        min_enemies = min(base_enemies + score_bonus, max_enemies)
+        max_enemies_spawn = min(base_enemies + score_bonus + 2, max_enemies)
+        
+        num_enemies = self.spawn_rng.randint(min_enemies, max_enemies_spawn)
+        
+        # Use original speed settings (no gradual increase)
+        speed_multiplier = 1.0  # Original speed from the start
+        
+        for i in range(num_enemies):
+            # Random scale for enemy size variety (original settings)
+            enemy_scale = self.spawn_rng.uniform(1.0, 2.0)
+            
+            # Randomly choose to spawn from left or right
+            spawn_from_left = self.spawn_rng.choice([True, False])
+            
+            if spawn_from_left:
+                # Spawn from left side, moving right
+                enemy = enemy_pool.acquire(scale=enemy_scale, direction=1, window_width=self.width, speed_multiplier=speed_multiplier, rng=self.entity_rng)
+                enemy.center_x = -30  # Start off left edge
+            else:
+                # Spawn from right side, moving left
+                enemy = enemy_pool.acquire(scale=enemy_scale, direction=-1, window_width=self.width, speed_multiplier=speed_multiplier, rng=self.entity_rng)
+                enemy.center_x = self.width + 30  # Start off right edge
+            
+            # Random Y position (middle area of screen to avoid printers)
+            enemy.center_y = self.spawn_rng.randrange(100, self.height - 100)
+            
+            # Add to enemy list
+            self.add_entity(enemy, 'enemy')
+
+    def update(self, delta_time):
+        """ Movement and game logic for one frame """
+        self.collected = []
+        if self.is_over:
+            return
+        self.run_time += delta_time
+        self.ticks += 1
+
+        profiler = self.profiler
+        if profiler is None:
+            self.update_player()
+            self.update_spawners(delta_time)
+            self.update_movement(delta_time)
+            self.update_collisions()
+            return
+
+        # Same steps, timed phase by phase
+        profiler.begin()
+        self.update_player()
+        profiler.mark('player')
+        self.update_spawners(delta_time)
+        profiler.mark('spawn')
+        self.update_movement(delta_time)
+        profiler.mark('movement')
+        self.update_collisions()
+        profiler.mark('collision')
+
+    def update_player(self):
+        """Apply the pressed keys to the player and keep it on the field"""
+        # Calculate speed based on the keys pressed
+        self.player_sprite.change_x = 0
+        self.player_sprite.change_y = 0
+
+        if self.up_pressed and not self.down_pressed:
+            self.player_sprite.change_y = PLAYER_MOVEMENT_SPEED
+        elif self.down_pressed and not self.up_pressed:
+            self.player_sprite.change_y = -PLAYER_MOVEMENT_SPEED
+        if self.left_pressed and not self.right_pressed:
+            self.player_sprite.change_x = -PLAYER_MOVEMENT_SPEED
+        elif self.right_pressed and not self.left_pressed:
+            self.player_sprite.change_x = PLAYER_MOVEMENT_SPEED
+
+        # Keep player on the field
+        if self.player_sprite.left < 0:
+            self.player_sprite.left = 0
+        elif self.player_sprite.right > self.width - 1:
+            self.player_sprite.right = self.width - 1
+
+        if self.player_sprite.bottom < 0:
+            self.player_sprite.bottom = 0
+        elif self.player_sprite.top > self.height - 1:
+            self.player_sprite.top = self.height - 1
+
+    def update_spawners(self, delta_time):
+        """Spawn whatever the schedule says is due"""
+        self.spawner.advance(delta_time)
+
+    def update_movement(self, delta_time):
+        """Move every sprite and drop the ones that left the field"""
+        # Move the player (speeds are per second)
+        self.player_sprite.center_x += self.player_sprite.change_x * delta_time
+        self.player_sprite.center_y += self.player_sprite.change_y * delta_time
+
+        # Printers and enemies are not moved, they just leave once their path is off the field
+        for printer in self.printer_columns.expire(self.run_time):
+            printer.despawn()
+        for enemy in self.enemy_bands.expire(self.run_time):
+            enemy.despawn()
+
+        # Bounce the burgers
+        if self.kinematics is not None:
+            self.kinematics.step(delta_time)
+        else:
+            self.coin_list.update(delta_time)
+
+    def update_collisions(self):
+        """Collect touched burgers and end the run on a printer or enemy hit"""
+        # Burgers never leave their cells (they are inserted with their bounce range)
+        candidates = self.collision_grid.query(self.player_sprite, 'burger')
+        if self.kinematics is not None:
+            # Bounced burgers are only drawn where they are, so place the ones close enough first
+            candidates = self.kinematics.place(candidates, 'burger', near=self.player_sprite)
+
+        # Generate a list of all sprites that collided with the player.
+        hit_list = [coin for coin in candidates if arcade.check_for_collision(self.player_sprite, coin)]
+
+        # Loop through each colliding sprite, collect it, and add to the score.
+        for coin in hit_list:
+            # The view plays the collection effect from where the burger was,
+            # so it goes straight back to its pool
+            self.collected.append((coin.center_x, coin.center_y, coin.base_scale))
+            coin.despawn()
+            self.score += 1
+
+            # Make Wario fatter with each burger collected
+            current_scale = self.player_sprite.scale
+            if isinstance(current_scale, tuple):
+                # If scale is a tuple, increase both x and y scale
+                self.player_sprite.scale = (current_scale[0] + 0.1, current_scale[1] + 0.1)
+            else:
+                # If scale is a float, just add to it
+                self.player_sprite.scale = current_scale + 0.1
+
+        # Touching a printer or an enemy ends the run
+        if (self.printer_columns.check_for_collision(self.player_sprite, self.run_time) or
+                self.enemy_bands.check_for_collision(self.player_sprite, self.run_time)):
+            self.is_over = True
+
+    def interpolate(self, alpha):
+        """Put the sprites alpha (0..1) of the way between the last two steps for drawing.
+
+        Only the vectorized engine keeps the previous step; without it the
+        sprites are drawn where the last step left them.
+        """
+        if self.kinematics is not None:
+            self.kinematics.interpolate(alpha)
+
+
+def run_headless(ticks, seed=None, width=HEADLESS_WIDTH, height=HEADLESS_HEIGHT,
+                 delta_time=SIMULATION_STEP, policy=None, record_path=None):
+    """Run a simulation for up to `ticks` updates without a window.
+
+    policy(sim) is called before every update and may press keys with
+    sim.set_key(); without one the player stands still. With record_path
+    the run's input is saved there as a replay. Returns a summary dict.
+    """
+    sim = GameSimulation(width, height, seed)
+    recording = sim.start_recording() if record_path else None
+    sim.setup()
+    start = time.perf_counter()
+    try:
+        while sim.ticks < ticks and not sim.is_over:
+            if policy is not None:
+                policy(sim)
+            sim.update(delta_time)
+        digest = sim.state_digest()
+        if recording is not None:
+            sim.finish_recording().save(record_path)
+    finally:
+        sim.release_entities()
+    elapsed = time.perf_counter() - start
+    return {
+        'seed': sim.seed,
+        'ticks': sim.ticks,
+        'score': sim.score,
+        'digest': digest,
+        'game_over': sim.is_over,
+        'survival_time': sim.run_time,
+        'wall_time': elapsed,
+        'speedup': sim.run_time / elapsed if elapsed > 0 else float('inf'),
+    }
+
+
+def replay_headless(recording):
+    """Re-run a recording at full speed and check it ends the same way"""
+    result = run_headless(recording.ticks, seed=recording.seed, width=recording.width,
+                          height=recording.height, policy=ReplayInput(recording))
+    result['matches_recording'] = (result['ticks'] == recording.ticks and
+                                   result['score'] == recording.score and
+                                   recording.digest in (None, result['digest']))
+    return result
+
+
+def random_walk_policy(sim, hold_ticks=SIMULATION_RATE // 2):
+    """Input policy that picks a new random arrow-key combination every hold_ticks"""
+    if sim.ticks % hold_ticks == 0:
+        for name in MOVEMENT_KEYS:
+            sim.set_key(name, sim.input_rng.random() < 0.3)
+
+
+# Input policies by name; anything else is looked up as "module:function"
+INPUT_POLICIES = {
+    'idle': None,
+    'random': random_walk_policy,
+}
+
+# Histogram bin widths for batch runs
+SCORE_BIN = 1
+SURVIVAL_BIN = 5.0  # Seconds
+
+
+def resolve_policy(name):
+    """Turn a policy name or "module:function" into a callable (or None for idle)"""
+    if name in INPUT_POLICIES:
+        return INPUT_POLICIES[name]
+    module_name, _, attribute = name.partition(':')
+    if not attribute:
+        raise ValueError(f"Unknown policy {name!r} (use one of {sorted(INPUT_POLICIES)} or module:function)")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def run_batch_game(job):
+    """Worker entry point: one headless game for (seed, ticks, policy name)"""
+    seed, ticks, policy_name = job
+    try:
+        return run_headless(ticks, seed=seed, policy=resolve_policy(policy_name))
+    except Exception as error:
+        # One broken game should not take the whole batch down
+        return {'seed': seed, 'error': repr(error)}
+
+
+def histogram(values, bin_width):
+    """Counts per bin, keyed by the bin's lower edge"""
+    counts = {}
+    for value in values:
+        edge = math.floor(value / bin_width) * bin_width
+        counts[edge] = counts.get(edge, 0) + 1
+    return dict(sorted(counts.items()))
+
+
+def print_histogram(title, counts, out=sys.stderr, width=50):
+    print(title, file=out)
+    if not counts:
+        print("  no games", file=out)
+        return
+    peak = max(counts.values(), default=1)
+    for edge, count in counts.items():
+        print(f"  {edge:>8g} | {'#' * max(1, round(count * width / peak)):<{width}} {count}", file=out)
+
+
+def distribution(values):
+    """Summary statistics, or None when there are no values (no finished games)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return {
+        'mean': statistics.fmean(ordered),
+        'median': statistics.median(ordered),
+        'p10': ordered[int(0.10 * (len(ordered) - 1))],
+        'p90': ordered[int(0.90 * (len(ordered) - 1))],
+        'max': ordered[-1],
+    }
+
+
+def run_batch(games, ticks, policy_name='random', base_seed=None, workers=None, out=None):
+    """Play `games` headless games over a process pool and aggregate the results.
+
+    Game i uses seed base_seed + i. Each finished game is written to `out`
+    as one JSON line as soon as it comes back; the return value is the
+    summary with score and survival-time histograms.
+    """
+    resolve_policy(policy_name)  # Fail here, not in every worker
+    if base_seed is None:
+        base_seed = random.randrange(2 ** 31)
+    workers = workers or os.cpu_count() or 1
+    jobs = [(base_seed + i, ticks, policy_name) for i in range(games)]
+    # Small chunks keep the workers busy without holding results back
+    chunksize = max(1, min(16, games // (workers * 8)))
+
+    scores = []
+    survival_times = []
+    failed = 0
+    sim_time = 0.0
+    start = time.perf_counter()
+    with multiprocessing.Pool(workers) as pool:
+        for result in pool.imap_unordered(run_batch_game, jobs, chunksize):
+            if 'error' in result:
+                failed += 1
+                print(f"game {result['seed']} failed: {result['error']}", file=sys.stderr)
+            else:
+                scores.append(result['score'])
+                survival_times.append(result['survival_time'])
+                sim_time += result['survival_time']
+            if out is not None:
+                out.write(json.dumps(result) + "\n")
+                out.flush()
+            done = len(scores) + failed
+            if done % max(1, games // 20) == 0 or done == games:
+                elapsed = time.perf_counter() - start
+                print(f"{done}/{games} games, {done / elapsed:.1f} games/s", file=sys.stderr)
+    elapsed = time.perf_counter() - start
+    if not scores:
+        print("no games finished", file=sys.stderr)
+
+    return {
+        'games': games,
+        'failed': failed,
+        'base_seed': base_seed,
+        'policy': policy_name,
+        'ticks': ticks,
+        'workers': workers,
+        'wall_time': elapsed,
+        'games_per_second': games / elapsed if elapsed > 0 else float('inf'),
+        'speedup': sim_time / elapsed if elapsed > 0 else float('inf'),
+        'score': distribution(scores),
+        'survival_time': distribution(survival_times),
+        'score_histogram': histogram(scores, SCORE_BIN),
+        'survival_histogram': histogram(survival_times, SURVIVAL_BIN),
+    }
+
+
+class GameView(ScreenView):
     """
     Main application class.a
     """
 
-    def __init__(self):
+    def __init__(self, replay=None, replay_speed=1):
         super().__init__()
 
-        # Sprite lists
-        self.player_list = None
-        self.coin_list = None
-        self.printer_list = None
-        self.enemy_list = None
+        # Gameplay lives in a GameSimulation, created in setup()
+        self.sim = None
+        self.recording = None
 
-        # Set up the player
-        self.score = 0
+        # Watching a RunRecording instead of playing
+        self.replay = replay
+        self.replay_input = None
+        self.replay_speed = replay_speed
         self.player_sprite = None
-        self.bumper_texture = arcade.load_texture(":resources:images/pinball/bumper.png")
-        
-        # Printer system
-        self.printers_spawned = False
-        self.printer_spawn_timer = 0.0
-        self.printer_spawn_interval = 6.0  # 6 seconds
-        
-        # Player movement
-        self.up_pressed = False
-        self.down_pressed = False
-        self.left_pressed = False
-        self.right_pressed = False
-        
-        # Coin spawning system
-        self.coin_spawn_timer = 0.0
-        self.coin_spawn_interval = 5.0  # 5 seconds
-        
-        # Enemy spawning system
-        self.enemy_spawn_timer = 0.0
-        self.enemy_spawn_interval = 3.0  # 3 seconds (reduced from 4)
+        self.bumper_texture = assets.texture(BUMPER_TEXTURE_PATH)
+        self.held_assets = {}
         
-        # Performance optimization: Pre-create Text objects
-        self.score_text = arcade.Text(
-            "Score: 0",
-            20, 0,  # y will be set dynamically
-            arcade.color.WHITE,
-            font_size=20,
-            font_name="Arial",
-            bold=True
-        )
+        # Draw-call counters for the render stats line
+        self.show_render_stats = False
+        self.draw_calls = 0
+        self.background_draw_calls = 0
+        self.hud_draw_calls = 0
+
+        # Phase timings, recorded only while the F3 overlay is shown
+        self.profiler = frame_profiler
+        self.profiler_overlay = ProfilerOverlay(frame_profiler)
         
-        # Load highscore for display
-        self.highscore = load_highscore()
-        self.highscore_text = arcade.Text(
-            f"High Score: {self.highscore}",
-            20, 0,  # y will be set dynamically
-            arcade.color.YELLOW,
-            font_size=16,
-            font_name="Arial"
-        )
+        # Highscore for display, from the shared profile
+        self.profile = get_profile()
+        self.highscore = self.profile.highscore
 
-    def setup(self):
+    @property
+    def score(self):
+        return self.sim.score
+
+    def setup(self, seed=None):
         """ Set up the game and initialize the variables. """
 
-        # Sprite lists
-        self.player_list = arcade.SpriteList()
-        self.coin_list = arcade.SpriteList()
-        self.printer_list = arcade.SpriteList()
-        self.enemy_list = arcade.SpriteList()
+        # Whatever the start screen did not get to is loaded now
+        asset_preloader.finish()
 
-        # Set up the player
-        self.score = 0
-        
-        # Create animated Wario sprite using the spritesheet
+        # Everything on the field is drawn in one batch from the gameplay atlas,
+        # except enemies, which are instanced from the same atlas when the GPU allows
+        self.field_renderer = FieldRenderer(get_gameplay_atlas())
+        self.enemy_renderer = get_enemy_renderer(self.window.ctx, get_gameplay_atlas())
+        if self.enemy_renderer is not None:
+            self.enemy_renderer.clear()
+
+        # The simulation spawns, the renderer just gets told about it
+        if self.replay is not None:
+            # Same seed and field as the recorded run, input comes from the recording
+            self.sim = GameSimulation(self.replay.width, self.replay.height, self.replay.seed)
+            self.replay_input = ReplayInput(self.replay)
+        else:
+            self.sim = GameSimulation(self.width, self.height, seed)
+            self.recording = self.sim.start_recording()
+        self.sim.on_spawn = self.on_entity_spawned
+
+        # Pin every gameplay asset for this run so spawns never touch the disk
+        self.acquire_gameplay_assets()
+        self.sim.setup()
+
+        # Fixed-step clock: real time not yet simulated, and where the player was one step ago
+        self.accumulator = 0.0
+        self.alpha = 1.0
+        self.player_previous_position = self.sim.player_sprite.position
+
+        # Create animated Wario sprite using the spritesheet; it follows the
+        # simulation's player, which carries the fixed hit box
         self.player_sprite = arcade.Sprite(scale=2.0)
         
         # Load animation frames from the spritesheet
         # Assuming the spritesheet has frames arranged horizontally
         self.setup_player_animations()
-        
-        self.player_sprite.center_x = WINDOW_WIDTH // 2
-        self.player_sprite.center_y = WINDOW_HEIGHT // 2
-        self.player_list.append(self.player_sprite)
-
-        # Start with only 5 burgers
-        for i in range(5):
-            # Create the burger instance
-            burger = Collectable(scale=SPRITE_SCALING)
-
-            # Position the burger
-            burger.center_x = random.randrange(WINDOW_WIDTH)
-            burger.center_y = random.randrange(WINDOW_HEIGHT)
-            burger.original_y = burger.center_y  # Store original position for bouncing
+        self.sync_player_sprite()
+        self.field_renderer.add(self.player_sprite, LAYER_PLAYER)
 
-            # Add the burger to the lists
-            self.coin_list.append(burger)
+        # Sound effects are decoded once per process and played through the mixer
+        audio_mixer.load()
 
-        # Load collection sound
-        try:
-            self.collect_sound = arcade.load_sound("assets/sounds/eating.mp3")
-        except:
-            # Fallback if sound doesn't exist
-            self.collect_sound = None
-            
-        # Load die sound
-        try:
-            self.die_sound = arcade.load_sound("assets/sounds/die.mp3")
-        except:
-            # Fallback if sound doesn't exist
-            self.die_sound = None
+        # Collection bursts (None without shader support: no effect then)
+        self.particles = get_particle_emitter(self.window.ctx)
+        if self.particles is not None:
+            self.particles.clear()
 
         # Set the background color (we'll draw a custom background instead)
         self.background_color = arcade.color.DARK_GREEN
@@ -976,131 +4682,199 @@ class GameView(arcade.View):
         # Background animation timer
         self.background_timer = 0.0
 
-    def setup_player_animations(self):
-        # Load shop data to check equipped skin
-        shop_data = load_shop_data()
-        equipped_skin = shop_data.get('equipped_skin', 'normal')
-        
-        # Choose sprite paths based on equipped skin
-        if equipped_skin == 'shiny':
-            idle_sprite_path = "assets/images/sprites/wario/shiny/SSWarioShiny.png"
-            spritesheet_right_path = "assets/images/sprites/wario/shiny/WarioSpritesAllShiny.png"
-            spritesheet_left_path = "assets/images/sprites/wario/shiny/WarioSpritesAllShinyBackwards.png"
+    def on_entity_spawned(self, sprite, kind):
+        """Add a sprite spawned by the simulation to its render layer"""
+        if kind == 'enemy' and self.enemy_renderer is not None:
+            self.enemy_renderer.add(sprite)
         else:
-            idle_sprite_path = "assets/images/sprites/wario/normal/SSWario.png"
-            spritesheet_right_path = "assets/images/sprites/wario/normal/WarioSpritesAll.png"
-            spritesheet_left_path = "assets/images/sprites/wario/normal/WarioSpritesAllBackwards.png"
-        
-        # Load idle PNG for no key pressed
-        self.idle_texture_still = arcade.load_texture(idle_sprite_path)
-        """Setup Wario animations from spritesheet"""
-        # Load both spritesheets
-        self.spritesheet_right = arcade.load_texture(spritesheet_right_path)
-        self.spritesheet_left = arcade.load_texture(spritesheet_left_path)
-
-        # Idle animations
-        self.idle_texture_list_right = []
-        self.idle_texture_list_left = []
-        idle_frame_right = self.spritesheet_right.crop(0, 0, 32, 32)
-        idle_frame_left = self.spritesheet_left.crop(0, 0, 32, 32)
-        self.idle_texture_list_right.append(idle_frame_right)
-        self.idle_texture_list_left.append(idle_frame_left)
-
-        # Walking animations
-        self.walking_texture_list_right = []
-        self.walking_texture_list_left = []
-        for i in range(4):
-            frame_right = self.spritesheet_right.crop(i * 32, 0, 32, 32)
-            frame_left = self.spritesheet_left.crop(i * 32, 0, 32, 32)
-            self.walking_texture_list_right.append(frame_right)
-            self.walking_texture_list_left.append(frame_left)
-
-        # Set up initial animations (default to right)
-        self.player_sprite.idle_texture_pair = self.idle_texture_list_right
-        self.player_sprite.walk_textures = self.walking_texture_list_right
-        self.player_sprite.texture = self.idle_texture_list_right[0]
+            self.field_renderer.add(sprite, ENTITY_LAYERS[kind])
 
-        # Animation variables
-        self.player_sprite.cur_texture = 0
-        self.animation_timer = 0.0
-        self.animation_speed = 0.2  # Change frame every 0.2 seconds
+    def place_sprites(self, alpha):
+        """Put the sprites alpha (0..1) of the way between the last two steps.
+
+        This is the only place sprite positions are written for drawing;
+        the simulation steps keep them in its own arrays and paths.
+        """
+        self.alpha = alpha
+        self.sim.interpolate(alpha)
+        # Printers are drawn as plain sprites: put them on their paths
+        render_time = self.render_time()
+        for printer in self.sim.printer_list:
+            printer.place(render_time)
+        if self.enemy_renderer is None:
+            # So are enemies without the instanced renderer
+            for enemy in self.sim.enemy_list:
+                enemy.place(render_time)
+
+    def render_time(self):
+        """Simulation run time the current frame shows (between the last two steps)"""
+        return self.sim.run_time - (1.0 - self.alpha) * SIMULATION_STEP
+
+    def sync_player_sprite(self, alpha=1.0):
+        """Move the animated player sprite onto the simulated player.
+
+        alpha interpolates between the previous and the current step.
+        """
+        x0, y0 = self.player_previous_position
+        x1, y1 = self.sim.player_sprite.position
+        self.player_sprite.position = (x0 + (x1 - x0) * alpha, y0 + (y1 - y0) * alpha)
+        self.player_sprite.scale = self.sim.player_sprite.scale
+
+    def acquire_gameplay_assets(self):
+        """Load and pin all textures and sounds used during a run"""
+        self.held_assets = {}
+        for path in GAMEPLAY_ASSET_PATHS:
+            try:
+                self.held_assets[path] = assets.acquire(path)
+            except:
+                # Missing files fall back at the point of use
+                self.held_assets[path] = None
+
+    def release_gameplay_assets(self):
+        """Unpin the assets acquired in setup()"""
+        for path, asset in self.held_assets.items():
+            if asset is not None:
+                assets.release(path)
+        self.held_assets = {}
+
+    def on_hide_view(self):
+        """Recycle entities and release pinned assets when leaving the game"""
+        if self.sim is not None:
+            self.sim.release_entities()
+        self.release_gameplay_assets()
+
+    def setup_player_animations(self):
+        """Attach the equipped skin's animations to the player sprite"""
+        # Built once per skin and process, so restarts reuse the same textures
+        self.animations = get_animation_set(self.profile.equipped_skin)
+
+        # Put the frames into the atlas up front (no-op once they are in)
+        for texture in self.animations.textures():
+            self.field_renderer.add_texture(texture)
+
+        self.player_animator = PlayerAnimator(self.player_sprite, self.animations)
 
     def update_player_animation(self, delta_time):
         """Update Wario animation based on movement"""
-        self.animation_timer += delta_time
-        
-        # Check if player is moving
-        is_moving = (self.player_sprite.change_x != 0 or self.player_sprite.change_y != 0)
-
-        # Determine direction (left or right)
-        if self.player_sprite.change_x < 0:
-            # Moving left
-            self.player_sprite.idle_texture_pair = self.idle_texture_list_left
-            self.player_sprite.walk_textures = self.walking_texture_list_left
-        else:
-            # Moving right or idle
-            self.player_sprite.idle_texture_pair = self.idle_texture_list_right
-            self.player_sprite.walk_textures = self.walking_texture_list_right
-
-        # Check if no arrow key is pressed
-        no_key_pressed = not (self.up_pressed or self.down_pressed or self.left_pressed or self.right_pressed)
-
-        if no_key_pressed:
-            # Use still idle PNG
-            self.player_sprite.texture = self.idle_texture_still
-            self.player_sprite.cur_texture = 0
-        elif is_moving:
-            # Use walking animation
-            if self.animation_timer >= self.animation_speed:
-                self.player_sprite.cur_texture += 1
-                if self.player_sprite.cur_texture >= len(self.player_sprite.walk_textures):
-                    self.player_sprite.cur_texture = 0
-                self.player_sprite.texture = self.player_sprite.walk_textures[self.player_sprite.cur_texture]
-                self.animation_timer = 0.0
-        else:
-            # Use idle animation
-            self.player_sprite.texture = self.player_sprite.idle_texture_pair[0]
-            self.player_sprite.cur_texture = 0
-            self.player_sprite.cur_texture = 0
+        sim_player = self.sim.player_sprite
+        keys_held = self.sim.up_pressed or self.sim.down_pressed or self.sim.left_pressed or self.sim.right_pressed
+        is_moving = sim_player.change_x != 0 or sim_player.change_y != 0
+        facing = 'left' if sim_player.change_x < 0 else 'right'
+        self.player_animator.update(delta_time, keys_held, is_moving, facing)
 
-    def on_draw(self):
+    def draw(self):
         """
         Render the screen.
         """
 
+        profiling = self.profiler.enabled
+        if profiling:
+            self.profiler.begin()
+
         # This command has to happen before we start drawing
         self.clear()
+        text_cache.begin_frame()
 
         # Draw custom background
         self.draw_background()
+        if profiling:
+            self.profiler.mark('background')
 
-        # Draw all the sprites.
-        self.coin_list.draw()
-        self.player_list.draw()
-        self.printer_list.draw()
-        self.enemy_list.draw()
+        # Draw all the sprites in one batch (burgers, player, printers), enemies on top
+        self.field_renderer.draw()
+        enemy_draw_calls = 0
+        if self.enemy_renderer is not None:
+            self.enemy_renderer.draw(self.render_time())
+            enemy_draw_calls = self.enemy_renderer.draw_calls
+        particle_draw_calls = 0
+        if self.particles is not None:
+            self.particles.draw()
+            particle_draw_calls = self.particles.draw_calls
+        if profiling:
+            self.profiler.mark('field')
 
         # Draw score box in top-left corner
         self.draw_score_box()
+        if profiling:
+            self.profiler.mark('hud')
+
+        # Draw-call report (toggle with F3)
+        self.draw_calls = (self.background_draw_calls + self.field_renderer.draw_calls +
+                           enemy_draw_calls + particle_draw_calls + self.hud_draw_calls)
+        if self.show_render_stats:
+            pool_stats = " ".join(
+                f"{name} {pool.in_use}/{pool.high_water}/{pool.allocated}"
+                for name, pool in ENTITY_POOLS.items()
+            )
+            draw_label(
+                f"Draw calls: {self.draw_calls} "
+                f"(field {self.field_renderer.draw_calls}, background {self.background_draw_calls})  "
+                f"Text layouts: {text_cache.rebuilds_last_frame}  "
+                f"Pools in use/peak/allocated: {pool_stats}",
+                20,
+                self.height - 95,
+                arcade.color.LIGHT_GREEN,
+                font_size=12,
+                font_name="Arial"
+            )
+            # Frame-time graphs and phase percentiles (dump with F4)
+            self.profiler_overlay.update()
+            self.profiler_overlay.draw(20, self.height - 110)
 
     def draw_score_box(self):
         """Draw score text in the top-left corner - optimized"""
-        # Update text content and position only when needed
-        self.score_text.text = f"Score: {self.score}"
-        self.score_text.y = self.window.height - 40
-        self.score_text.draw()
+        # Labels come from the text cache, so they are only laid out when the score changes
+        draw_label(
+            f"Score: {self.score}",
+            20,
+            self.height - 40,
+            arcade.color.WHITE,
+            font_size=20,
+            font_name="Arial",
+            bold=True
+        )
+        self.hud_draw_calls = 1
         
         # Draw highscore below current score
         if self.highscore > 0:
-            self.highscore_text.text = f"High Score: {self.highscore}"
-            self.highscore_text.y = self.window.height - 65
-            self.highscore_text.draw()
+            draw_label(
+                f"High Score: {self.highscore}",
+                20,
+                self.height - 65,
+                arcade.color.YELLOW,
+                font_size=16,
+                font_name="Arial"
+            )
+            self.hud_draw_calls += 1
+
+        # Replay speed in the top-right corner
+        if self.replay is not None:
+            draw_label(
+                f"REPLAY x{self.replay_speed}   +/- speed   Esc stop",
+                self.width - 20,
+                self.height - 40,
+                arcade.color.LIGHT_GREEN,
+                font_size=16,
+                anchor_x="right",
+                font_name="Arial",
+                bold=True
+            )
+            self.hud_draw_calls += 1
 
     def draw_background(self):
-        """Draw an optimized animated background"""
+        """Draw the animated background, on the GPU when possible"""
+        shader = get_background_shader(self.window.ctx)
+        if shader is None:
+            self.draw_background_immediate()
+            return
+        shader.draw(self.background_timer, self.width, self.height)
+        self.background_draw_calls = 1
+
+    def draw_background_immediate(self):
+        """Draw an optimized animated background (CPU fallback)"""
         # Simpler, stable Wario-themed background (purple -> magenta gradient)
-        width = int(self.window.width)
-        height = int(self.window.height)
+        width = int(self.width)
+        height = int(self.height)
 
         steps = 8
         for i in range(steps):
@@ -1153,326 +4927,251 @@ class GameView(arcade.View):
             alpha = int(80 + 60 * (math.sin(self.background_timer * 3 + i) * 0.5 + 0.5))
             arcade.draw_circle_filled(sx, sy, 2, (255, 255, 200, alpha))
 
-    def spawn_coins(self, num_coins=3):
-        """Spawn new burgers at random locations"""
-        for i in range(num_coins):
-            # Create the burger instance
-            burger = Collectable(scale=SPRITE_SCALING)
-
-            # Position the burger randomly, but not too close to the player
-            attempts = 0
-            while attempts < 50:  # Prevent infinite loop
-                burger.center_x = random.randrange(50, int(self.window.width) - 50)
-                burger.center_y = random.randrange(50, int(self.window.height) - 50)
-                
-                # Check if burger is far enough from player
-                distance = ((burger.center_x - self.player_sprite.center_x) ** 2 + 
-                           (burger.center_y - self.player_sprite.center_y) ** 2) ** 0.5
-                
-                if distance > 100:  # At least 100 pixels away from player
-                    break
-                attempts += 1
-
-            # Store original position for bouncing animation
-            burger.original_y = burger.center_y
-
-            # Add the burger to the lists
-            self.coin_list.append(burger)
-
-    def spawn_printers(self):
-        """Spawn up to 5 printers from the top of the screen"""
-        used_positions = []  # Keep track of used x positions
-        
-        # Spawn between 3 and 5 printers randomly
-        num_printers = random.randint(3, 5)
-        
-        for i in range(num_printers):
-            # Create a printer sprite scaled down to 32x32 pixels first
-            printer = arcade.Sprite("assets/images/sprites/objects/printer.png")
-            
-            # Step 1: Calculate base scale to make it 64x64 pixels (larger base size)
-            target_size = 64  # Increased from 32 to 64 pixels
-            if printer.texture.width > 0:  # Avoid division by zero
-                base_scale_factor = target_size / max(printer.texture.width, printer.texture.height)
-            else:
-                base_scale_factor = 0.2  # Fallback scale (increased from 0.1)
-            
-            # Step 2: Apply random upscaling on top of the base scale (ensure minimum size)
-            random_upscale = random.uniform(1.0, 3.0)  # Changed from 0.8-3.0 to 1.0-3.0 (no scaling down)
-            final_scale = base_scale_factor * random_upscale
-            
-            printer.scale = final_scale
-            
-            # Find a random x position that doesn't overlap with existing printers
-            # Use actual window width for proper positioning in fullscreen
-            actual_width = self.window.width
-            attempts = 0
-            while attempts < 50:  # Prevent infinite loop
-                random_x = random.randrange(50, actual_width - 50)
-                
-                # Check if this position is too close to any existing position
-                too_close = False
-                for used_x in used_positions:
-                    if abs(random_x - used_x) < 120:  # Minimum 120 pixels apart (increased for larger printers)
-                        too_close = True
-                        break
-                
-                # Also check if too close to player (avoid spawning directly above player)
-                player_distance = abs(random_x - self.player_sprite.center_x)
-                if player_distance < 150:  # Minimum 150 pixels away from player
-                    too_close = True
-                
-                if not too_close:
-                    used_positions.append(random_x)
-                    break
-                    
-                attempts += 1
-            
-            # If we couldn't find a good position after 50 attempts, use a fallback
-            if attempts >= 50:
-                # Fallback to evenly spaced across actual window width
-                actual_width = self.window.width
-                spacing = (actual_width - 200) // num_printers  # Distribute evenly
-                random_x = 100 + (i * spacing)
-                used_positions.append(random_x)
-            
-            # Position the printer at the top of the screen
-            printer.center_x = random_x
-            # Use actual window height for proper positioning in fullscreen
-            actual_height = self.window.height
-            printer.center_y = actual_height + 100  # Start further above the screen for more reaction time
-            
-            # Calculate falling speed based on score (faster with more coins)
-            base_speed = 1.5  # Reduced from 2 to 1.5 for gentler start
-            speed_increase = self.score * 0.05  # Reduced from 0.1 to 0.05 for slower acceleration
-            max_speed = 6  # Reduced maximum speed from 8 to 6
-            printer.change_y = -min(base_speed + speed_increase, max_speed)
-            
-            # Add to the printer list
-            self.printer_list.append(printer)
-
-    def spawn_enemies(self):
-        """Spawn enemies from left and right sides of screen"""
-        # Calculate number of enemies based on score (original difficulty from start)
-        base_enemies = 2  # Start with minimum 2 enemies (original setting)
-        score_bonus = self.score // 5  # +1 enemy for every 5 points
-        max_enemies = 8  # Cap at 8 enemies per spawn (original setting)
-        
-        min_enemies = min(base_enemies + score_bonus, max_enemies)
-        max_enemies_spawn = min(base_enemies + score_bonus + 2, max_enemies)
-        
-        num_enemies = random.randint(min_enemies, max_enemies_spawn)
-        
-        # Use original speed settings (no gradual increase)
-        speed_multiplier = 1.0  # Original speed from the start
-        
-        for i in range(num_enemies):
-            # Random scale for enemy size variety (original settings)
-            enemy_scale = random.uniform(1.0, 2.0)
-            
-            # Randomly choose to spawn from left or right
-            spawn_from_left = random.choice([True, False])
-            
-            if spawn_from_left:
-                # Spawn from left side, moving right
-                enemy = Enemy(scale=enemy_scale, direction=1, window_width=self.window.width, speed_multiplier=speed_multiplier)
-                enemy.center_x = -30  # Start off left edge
-            else:
-                # Spawn from right side, moving left
-                enemy = Enemy(scale=enemy_scale, direction=-1, window_width=self.window.width, speed_multiplier=speed_multiplier)
-                enemy.center_x = self.window.width + 30  # Start off right edge
-            
-            # Random Y position (middle area of screen to avoid printers)
-            enemy.center_y = random.randrange(100, self.window.height - 100)
-            
-            # Add to enemy list
-            self.enemy_list.append(enemy)
+        # Every shape above is its own immediate-mode draw
+        self.background_draw_calls = steps + 1 + accent_count + coin_count * 2 + 10
 
     def on_key_press(self, key, modifiers):
         """Called whenever a key is pressed."""
+        if self.replay is not None and self.on_replay_key_press(key):
+            return
         if key == arcade.key.UP:
-            self.up_pressed = True
+            self.sim.set_key('up', True)
         elif key == arcade.key.DOWN:
-            self.down_pressed = True
+            self.sim.set_key('down', True)
         elif key == arcade.key.LEFT:
-            self.left_pressed = True
+            self.sim.set_key('left', True)
         elif key == arcade.key.RIGHT:
-            self.right_pressed = True
+            self.sim.set_key('right', True)
         elif key == arcade.key.F11:
             # Toggle fullscreen with F11
             self.window.set_fullscreen(not self.window.fullscreen)
+        elif key == arcade.key.F3:
+            # Toggle the draw-call report and the frame profiler with it
+            self.show_render_stats = not self.show_render_stats
+            self.profiler.enabled = self.show_render_stats
+            self.profiler.clear()
+        elif key == arcade.key.F4:
+            # Dump the recorded frame timings
+            self.dump_profile()
+
+    def on_replay_key_press(self, key):
+        """Replay controls; arrow keys do nothing while watching"""
+        if key in (arcade.key.UP, arcade.key.DOWN, arcade.key.LEFT, arcade.key.RIGHT):
+            return True
+        if key in (arcade.key.PLUS, arcade.key.EQUAL, arcade.key.NUM_ADD):
+            index = REPLAY_SPEEDS.index(self.replay_speed)
+            self.replay_speed = REPLAY_SPEEDS[min(index + 1, len(REPLAY_SPEEDS) - 1)]
+            return True
+        if key in (arcade.key.MINUS, arcade.key.NUM_SUBTRACT):
+            index = REPLAY_SPEEDS.index(self.replay_speed)
+            self.replay_speed = REPLAY_SPEEDS[max(index - 1, 0)]
+            return True
+        if key == arcade.key.ESCAPE:
+            self.window.show_view(StartView())
+            return True
+        return False
 
     def on_key_release(self, key, modifiers):
         """Called when the user releases a key."""
+        if self.replay is not None:
+            return
         if key == arcade.key.UP:
-            self.up_pressed = False
+            self.sim.set_key('up', False)
         elif key == arcade.key.DOWN:
-            self.down_pressed = False
+            self.sim.set_key('down', False)
         elif key == arcade.key.LEFT:
-            self.left_pressed = False
+            self.sim.set_key('left', False)
         elif key == arcade.key.RIGHT:
-            self.right_pressed = False
+            self.sim.set_key('right', False)
+
+    def dump_profile(self):
+        """Write the frame profiler buffer to data/profiles"""
+        if self.profiler.count == 0:
+            self.profiler_overlay.dump_message = "Nothing recorded yet (F3 starts recording)"
+            return
+        try:
+            path = self.profiler.dump()
+            self.profiler_overlay.dump_message = f"Saved {path} (+ .json)"
+        except OSError as e:
+            self.profiler_overlay.dump_message = f"Could not save profile: {e}"
+        print(self.profiler_overlay.dump_message)
 
     def on_update(self, delta_time):
         """ Movement and game logic """
+        profiling = self.profiler.enabled
+        if profiling:
+            self.profiler.next_frame(delta_time)
+        self.sim.profiler = self.profiler if profiling else None
 
         # Update background animation timer
         self.background_timer += delta_time
+        if self.particles is not None:
+            self.particles.update(delta_time)
 
-        # Calculate speed based on the keys pressed
-        self.player_sprite.change_x = 0
-        self.player_sprite.change_y = 0
+        # The field follows the window size (a replay keeps the recorded size)
+        if self.replay is None:
+            self.sim.resize(self.width, self.height)
 
-        if self.up_pressed and not self.down_pressed:
-            self.player_sprite.change_y = PLAYER_MOVEMENT_SPEED
-        elif self.down_pressed and not self.up_pressed:
-            self.player_sprite.change_y = -PLAYER_MOVEMENT_SPEED
-        if self.left_pressed and not self.right_pressed:
-            self.player_sprite.change_x = -PLAYER_MOVEMENT_SPEED
-        elif self.right_pressed and not self.left_pressed:
-            self.player_sprite.change_x = PLAYER_MOVEMENT_SPEED
+        # Run as many fixed steps as the elapsed time covers, whatever the frame rate
+        self.accumulator += delta_time * self.replay_speed
+        max_steps = MAX_STEPS_PER_FRAME * self.replay_speed
+        steps = 0
+        while self.accumulator >= SIMULATION_STEP and steps < max_steps:
+            self.accumulator -= SIMULATION_STEP
+            steps += 1
+            if self.replay_input is not None:
+                if self.sim.ticks >= self.replay.ticks:
+                    self.window.show_view(StartView())
+                    return
+                self.replay_input(self.sim)
+            self.player_previous_position = self.sim.player_sprite.position
+            self.sim.update(SIMULATION_STEP)
+            if profiling:
+                self.profiler.begin()
+            self.collect_rewards()
+            if profiling:
+                self.profiler.mark('rewards')
+
+            if self.sim.is_over:
+                # Player hit a printer or an enemy - game over!
+                self.game_over()
+                return
+        if steps == max_steps:
+            # Too far behind (breakpoint, window drag): drop the backlog
+            self.accumulator = min(self.accumulator, SIMULATION_STEP)
+
+        # Draw everything between the last two steps
+        alpha = self.accumulator / SIMULATION_STEP
+        self.place_sprites(alpha)
 
         # Update player animation
         self.update_player_animation(delta_time)
+        self.sync_player_sprite(alpha)
 
-        # Keep player on screen using actual window size
-        if self.player_sprite.left < 0:
-            self.player_sprite.left = 0
-        elif self.player_sprite.right > self.window.width - 1:
-            self.player_sprite.right = self.window.width - 1
+        if profiling:
+            self.profiler.set('burgers', len(self.sim.coin_list))
+            self.profiler.set('printers', len(self.sim.printer_list))
+            self.profiler.set('enemies', len(self.sim.enemy_list))
 
-        if self.player_sprite.bottom < 0:
-            self.player_sprite.bottom = 0
-        elif self.player_sprite.top > self.window.height - 1:
-            self.player_sprite.top = self.window.height - 1
+    def collect_rewards(self):
+        """Coins, sounds and bursts for the burgers collected in the last step"""
+        first_score = self.sim.score - len(self.sim.collected)
+        for i, (x, y, scale) in enumerate(self.sim.collected):
+            if self.particles is not None:
+                self.particles.burst(x, y, scale)
 
-        # Update coin spawn timer
-        self.coin_spawn_timer += delta_time
-        
-        # Spawn new coins every 5 seconds
-        if self.coin_spawn_timer >= self.coin_spawn_interval:
-            self.spawn_coins(3)  # Spawn 3 new coins
-            self.coin_spawn_timer = 0.0  # Reset timer
-
-        # Spawn printers when score reaches 5 (first time only)
-        if self.score >= 5 and not self.printers_spawned:
-            self.spawn_printers()
-            self.printers_spawned = True
-            self.printer_spawn_timer = 0.0  # Reset timer for recurring spawns
-        
-        # After first spawn, spawn new printers with decreasing intervals
-        if self.printers_spawned:
-            # Calculate dynamic spawn interval based on score (faster with more coins)
-            base_interval = 6.0  # Base 6 seconds
-            interval_decrease = self.score * 0.1  # 0.1 seconds less per coin
-            min_interval = 3.0  # Minimum 3 seconds between spawns
-            current_interval = max(base_interval - interval_decrease, min_interval)
-            
-            self.printer_spawn_timer += delta_time
-            if self.printer_spawn_timer >= current_interval:
-                self.spawn_printers()
-                self.printer_spawn_timer = 0.0  # Reset timer
+            # Award coins for collecting burgers (1 coin per 5 burgers), not for replays
+            if (first_score + i + 1) % 5 == 0 and self.replay is None:
+                self.profile.add_coins(1)
 
-        # Enemy spawning system - start from the beginning with original difficulty
-        self.enemy_spawn_timer += delta_time
-        
-        # Calculate dynamic spawn interval (faster with higher score) - original settings
-        base_interval = 3.0  # Base 3 seconds (original difficulty)
-        interval_decrease = self.score * 0.08  # 0.08 seconds less per point
-        min_interval = 1.5  # Minimum 1.5 seconds between spawns
-        current_interval = max(base_interval - interval_decrease, min_interval)
-        
-        if self.enemy_spawn_timer >= current_interval:
-            self.spawn_enemies()
-            self.enemy_spawn_timer = 0.0  # Reset timer
-
-        # Call update on all sprites (The sprites don't do much in this
-        # example though.)
-        self.player_list.update()
-        self.coin_list.update()
-        self.printer_list.update()
-        self.enemy_list.update()
-
-        # Remove printers that have fallen off the screen
-        for printer in self.printer_list:
-            if printer.bottom < -50:
-                printer.remove_from_sprite_lists()
+            # Play collection sound (the mixer merges bursts)
+            if self.replay_speed == 1:
+                audio_mixer.play('collect')
 
-        # Generate a list of all sprites that collided with the player.
-        hit_list = arcade.check_for_collision_with_list(self.player_sprite, self.coin_list)
+    def game_over(self):
+        """Record the run and switch to the game over screen"""
+        # Play die sound
+        audio_mixer.play('die')
 
-        # Loop through each colliding sprite, change it, and add to the score.
-        for coin in hit_list:
-            # Have we collected this?
-            if not coin.changed:
-                # Mark as collected and start collection animation
-                coin.changed = True
-                coin.collection_timer = 0.0  # Initialize collection timer
-                self.score += 1
-                
-                # Award coins for collecting burgers (1 coin per 5 burgers)
-                if self.score % 5 == 0:
-                    shop_data = load_shop_data()
-                    shop_data['coins'] += 1
-                    save_shop_data(shop_data)
-                
-                # Make Wario fatter with each burger collected
-                current_scale = self.player_sprite.scale
-                if isinstance(current_scale, tuple):
-                    # If scale is a tuple, increase both x and y scale
-                    self.player_sprite.scale = (current_scale[0] + 0.1, current_scale[1] + 0.1)
-                else:
-                    # If scale is a float, just add to it
-                    self.player_sprite.scale = current_scale + 0.1
-                
-                # Play collection sound
-                if self.collect_sound:
-                    arcade.play_sound(self.collect_sound)
-                
-                # Remove burger after collection animation completes
-                # This will be handled by a timer or by checking if it's completely shrunk
-                
-        # Remove burgers that have completed their collection animation
-        for coin in self.coin_list:
-            if coin.changed and hasattr(coin, 'collection_timer') and coin.collection_timer > 1.0:
-                coin.remove_from_sprite_lists()
-
-        # Check for collision with printers (game over)
-        printer_hit_list = arcade.check_for_collision_with_list(self.player_sprite, self.printer_list)
-        if printer_hit_list:
-            # Play die sound
-            if self.die_sound:
-                arcade.play_sound(self.die_sound)
-            
-            # Player hit a printer - game over!
-            game_over_view = GameOverView(self.score)
-            self.window.show_view(game_over_view)
-            
-        # Check for collision with enemies (game over)
-        enemy_hit_list = arcade.check_for_collision_with_list(self.player_sprite, self.enemy_list)
-        if enemy_hit_list:
-            # Play die sound
-            if self.die_sound:
-                arcade.play_sound(self.die_sound)
-            
-            # Player hit an enemy - game over!
-            game_over_view = GameOverView(self.score)
-            self.window.show_view(game_over_view)
+        if self.replay is not None:
+            # Watching a recording changes nothing in the profile
+            self.window.show_view(GameOverView(self.sim.score))
+            return
+
+        is_new_highscore = self.profile.record_run(self.sim.score, self.sim.run_time)
+
+        # Keep the input of this run (and of the best one) for replays
+        self.sim.finish_recording()
+        self.recording.save(LAST_REPLAY_FILE)
+        if is_new_highscore:
+            self.recording.save(BEST_REPLAY_FILE)
+
+        game_over_view = GameOverView(self.sim.score, is_new_highscore)
+        self.window.show_view(game_over_view)
+
+
+def parse_args(argv=None):
+    """Command line options"""
+    parser = argparse.ArgumentParser(description="Wario Burger Rush")
+    parser.add_argument("--headless", action="store_true",
+                        help="run the game logic without a window and print the result")
+    parser.add_argument("--ticks", type=int, default=SIMULATION_RATE * 60 * 5,
+                        help="maximum number of simulation steps in headless mode (default: 5 minutes)")
+    parser.add_argument("--seed", type=int, default=None, help="random seed for headless mode")
+    parser.add_argument("--policy", default="random",
+                        help="simulated input in headless mode: idle, random or module:function")
+    parser.add_argument("--games", type=int, default=1,
+                        help="headless: play this many games (seeds --seed, --seed+1, ...) over a process pool")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="processes for --games (default: one per core)")
+    parser.add_argument("--output", metavar="PATH",
+                        help="with --games: stream one JSON line per game to this file")
+    parser.add_argument("--record", metavar="PATH", help="save the headless run as a replay")
+    parser.add_argument("--replay", metavar="PATH",
+                        help="play back a recorded run (headless: verify it at full speed)")
+    parser.add_argument("--speed", type=int, choices=REPLAY_SPEEDS, default=1,
+                        help="replay speed in the window")
+    parser.add_argument("--resolution", type=parse_resolution, default=INTERNAL_RESOLUTION,
+                        help="internal render size: WIDTHxHEIGHT, or a fraction of the display such as 0.5 "
+                             f"(default: {INTERNAL_RESOLUTION[0]}x{INTERNAL_RESOLUTION[1]})")
+    parser.add_argument("--bake", nargs="?", const=ASSET_BUNDLE_PATH, metavar="PATH",
+                        help=f"decode every game asset into a bundle file (default: {ASSET_BUNDLE_PATH}) and exit")
+    return parser.parse_args(argv)
 
 
 def main():
     """ Main function """
+    args = parse_args()
+    if args.bake:
+        start = time.perf_counter()
+        index = AssetBundle.bake(BUNDLE_PATHS, args.bake)
+        print(f"baked {len(index)} of {len(BUNDLE_PATHS)} assets into {args.bake} "
+              f"({os.path.getsize(args.bake) / 1024 / 1024:.1f} MB, {time.perf_counter() - start:.1f}s)")
+        return
+    recording = RunRecording.load(args.replay) if args.replay else None
+    if args.headless:
+        if recording is not None:
+            result = replay_headless(recording)
+        elif args.games != 1:
+            out = open(args.output, 'w') if args.output else None
+            try:
+                result = run_batch(args.games, args.ticks, args.policy, args.seed, args.workers, out)
+            finally:
+                if out is not None:
+                    out.close()
+            print_histogram("score", result['score_histogram'])
+            print_histogram("survival time (s)", result['survival_histogram'])
+        else:
+            result = run_headless(args.ticks, seed=args.seed, policy=resolve_policy(args.policy),
+                                  record_path=args.record)
+        save_writer.close()
+        print(json.dumps(result, indent=2))
+        return
+
     # Create a window class. This is what actually shows up on screen
     window = arcade.Window(WINDOW_WIDTH, WINDOW_HEIGHT, WINDOW_TITLE, fullscreen=True, resizable=True)
     # Enable fullscreen toggle with F11
     window.set_fullscreen(True)
+    # Everything is drawn at the internal resolution and scaled to the display
+    get_virtual_screen(window).resolution = args.resolution
+    # Which replays exist is checked once here, not on every menu visit
+    get_saved_replays()
 
-    # Show the start screen first
-    start_view = StartView()
-    window.show_view(start_view)
+    if recording is not None:
+        # Go straight into the replay
+        replay_view = GameView(replay=recording, replay_speed=args.speed)
+        replay_view.setup()
+        window.show_view(replay_view)
+    else:
+        # Show the start screen first
+        start_view = StartView()
+        window.show_view(start_view)
 
     # Start the arcade game loop
     arcade.run()
 
+    # Make sure the last coins and highscore reach the disk
+    save_writer.close()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
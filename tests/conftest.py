@@ -0,0 +1,6 @@
+import os
+import sys
+
+# No display here: arcade and pyglet have to be imported headless
+os.environ.setdefault("ARCADE_HEADLESS", "1")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
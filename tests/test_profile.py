@@ -0,0 +1,45 @@
+import json
+
+import main
+
+
+def test_migrate_profile_v1_combines_the_legacy_files():
+    data = {
+        'version': 1,
+        'highscore': {'highscore': 42},
+        'shop': {'coins': 120, 'purchased_items': ['shiny_wario'], 'equipped_skin': 'shiny'},
+    }
+    assert main.migrate_profile(data) == {
+        'version': main.PROFILE_VERSION,
+        'highscore': 42,
+        'coins': 120,
+        'purchased_items': ['shiny_wario'],
+        'equipped_skin': 'shiny',
+        'stats': {},
+    }
+
+
+def test_migrate_profile_v1_defaults_for_missing_files():
+    migrated = main.migrate_profile_v1({'version': 1, 'highscore': {}, 'shop': {}})
+    assert migrated['highscore'] == 0
+    assert migrated['coins'] == main.DEFAULT_COINS
+    assert migrated['purchased_items'] == []
+    assert migrated['equipped_skin'] == 'normal'
+
+
+def test_load_migrates_and_writes_the_profile(tmp_path, monkeypatch):
+    highscore_file = tmp_path / "highscore.json"
+    shop_file = tmp_path / "shop_data.json"
+    highscore_file.write_text(json.dumps({'highscore': 7}))
+    shop_file.write_text(json.dumps({'coins': 80, 'purchased_items': [], 'equipped_skin': 'normal'}))
+    monkeypatch.setattr(main, 'HIGHSCORE_FILE', str(highscore_file))
+    monkeypatch.setattr(main, 'SHOP_DATA_FILE', str(shop_file))
+
+    path = tmp_path / "profile.json"
+    profile = main.PlayerProfile.load(str(path))
+    main.save_writer.flush()
+
+    assert (profile.highscore, profile.coins) == (7, 80)
+    saved = json.loads(path.read_text())
+    assert saved['version'] == main.PROFILE_VERSION
+    assert (saved['highscore'], saved['coins']) == (7, 80)
@@ -0,0 +1,23 @@
+import main
+
+
+def test_recorded_run_replays_to_the_same_digest(tmp_path):
+    path = str(tmp_path / "run.json")
+    result = main.run_headless(1800, seed=1234, policy=main.random_walk_policy, record_path=path)
+    main.save_writer.flush()
+
+    recording = main.RunRecording.load(path)
+    assert recording.events  # The random walk pressed keys
+    assert recording.digest == result['digest']
+
+    replayed = main.replay_headless(recording)
+    assert replayed['matches_recording']
+    assert replayed['digest'] == result['digest']
+    assert replayed['ticks'] == result['ticks']
+    assert replayed['score'] == result['score']
+
+
+def test_same_seed_same_run():
+    first = main.run_headless(600, seed=99, policy=main.random_walk_policy)
+    second = main.run_headless(600, seed=99, policy=main.random_walk_policy)
+    assert first['digest'] == second['digest']
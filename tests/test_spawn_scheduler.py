@@ -0,0 +1,46 @@
+import main
+
+
+def wave(base, per_point=0.0, minimum=None, start_score=0, on_start=False):
+    return {'spawner': None, 'args': (), 'base_interval': base, 'per_point': per_point,
+            'min_interval': base if minimum is None else minimum,
+            'start_score': start_score, 'spawn_on_start': on_start}
+
+
+def make(waves):
+    fired = []
+    scheduler = main.SpawnScheduler(waves, lambda name, w: fired.append((round(scheduler.time, 6), name)))
+    return scheduler, fired
+
+
+def run(scheduler, seconds, step=0.25):
+    for i in range(int(seconds / step)):
+        scheduler.advance(step)
+
+
+def test_waves_fire_in_due_order_and_ties_in_scheduling_order():
+    scheduler, fired = make({'a': wave(1.0), 'b': wave(0.5), 'c': wave(1.0)})
+    run(scheduler, 2.0)
+    # a and c were queued at the start (definition order), b's 1.0 spawn at 0.5
+    assert fired == [(0.5, 'b'), (1.0, 'a'), (1.0, 'c'), (1.0, 'b'),
+                     (1.5, 'b'), (2.0, 'a'), (2.0, 'c'), (2.0, 'b')]
+
+
+def test_score_change_retimes_and_unlocks_waves():
+    scheduler, fired = make({'fast': wave(4.0, per_point=1.0, minimum=1.0),
+                             'late': wave(10.0, start_score=3, on_start=True)})
+    scheduler.set_score(3)  # 'fast' is now due 1 s after the start, 'late' starts
+    run(scheduler, 1.0)
+    assert fired == [(0.25, 'late'), (1.0, 'fast')]
+
+
+def test_pause_stops_the_clock_and_lookahead_matches_what_fires():
+    scheduler, fired = make({'a': wave(1.0), 'b': wave(1.5)})
+    scheduler.pause()
+    run(scheduler, 5.0)
+    assert fired == []
+    scheduler.resume()
+    assert scheduler.peek(2) == [(1.0, 'a'), (1.5, 'b')]
+    expected = scheduler.lookahead(3.0)
+    run(scheduler, 3.0)
+    assert sorted(fired) == expected